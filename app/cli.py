@@ -0,0 +1,154 @@
+"""Command line maintenance tasks.
+
+Run with: python -m app.cli <command> [options]
+"""
+
+import argparse
+from datetime import date
+from typing import List, Optional
+
+from app.database.base import SessionLocal, engine
+from app.database.migrations import get_status, migrate, rebuild_search_index
+from app.database.partitions import SPENDINGS_PARTITIONS_AHEAD, detach_partitions, ensure_partitions
+from app.storage.changes import SYNC_TOMBSTONE_RETENTION_DAYS, ChangeStorage
+from app.storage.rollups import RollupStorage
+
+
+def rebuild_rollups(args: argparse.Namespace) -> None:
+    """Recompute the daily and monthly rollups from the spendings table."""
+    db = SessionLocal()
+    try:
+        written = RollupStorage(db).rebuild(start=args.since, end=args.until)
+    finally:
+        db.close()
+    print(f"Rebuilt {written} daily and monthly rollup rows")
+
+
+def run_migrations(args: argparse.Namespace) -> None:
+    """Apply pending SQL migrations."""
+    applied = migrate(baseline=args.baseline)
+    for migration in applied:
+        print(f"Applied {migration.path.name}")
+    print(f"Schema is at version {get_status().current_version}")
+
+
+def migration_status(args: argparse.Namespace) -> None:
+    """Show the schema version and pending or edited migrations."""
+    status = get_status()
+    print(f"Schema is at version {status.current_version}")
+    for migration in status.pending:
+        print(f"Pending: {migration.path.name}")
+    for migration in status.changed:
+        print(f"Modified after being applied: {migration.path.name}")
+
+
+def create_partitions(args: argparse.Namespace) -> None:
+    """Create missing monthly spendings partitions (PostgreSQL, partitioned spendings only)."""
+    created = ensure_partitions(ahead=args.ahead)
+    for name in created:
+        print(f"Created {name}")
+    print(f"Created {len(created)} partitions")
+
+
+def detach_old_partitions(args: argparse.Namespace) -> None:
+    """Detach monthly spendings partitions older than a date and drop their rollups."""
+    detached = detach_partitions(args.before, archive_schema=args.archive_schema, drop=args.drop)
+    for partition in detached:
+        print(f"Detached {partition.name}")
+    if detached:
+        # The detached months are no longer spendings the API can see
+        db = SessionLocal()
+        try:
+            RollupStorage(db).rebuild(start=detached[0].start, end=detached[-1].end)
+        finally:
+            db.close()
+    print(f"Detached {len(detached)} partitions")
+
+
+def reindex_search(args: argparse.Namespace) -> None:
+    """Rebuild the SQLite full-text index of descriptions (PostgreSQL maintains its GIN index)."""
+    if engine.dialect.name != "sqlite":
+        print("Nothing to do: the search index is maintained by PostgreSQL")
+        return
+    with engine.begin() as connection:
+        rebuild_search_index(connection)
+    print("Rebuilt the search index")
+
+
+def purge_tombstones(args: argparse.Namespace) -> None:
+    """Delete tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS."""
+    db = SessionLocal()
+    try:
+        removed = ChangeStorage(db).purge_tombstones()
+    finally:
+        db.close()
+    print(f"Removed {removed} tombstones older than {SYNC_TOMBSTONE_RETENTION_DAYS} days")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parse arguments and run the selected command."""
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser(
+        "rebuild-rollups", help="Recompute the daily and monthly rollups (e.g. after a backfill)"
+    )
+    rebuild.add_argument(
+        "--since", type=date.fromisoformat, help="First day to rebuild (YYYY-MM-DD, inclusive)"
+    )
+    rebuild.add_argument(
+        "--until", type=date.fromisoformat, help="Day to stop at (YYYY-MM-DD, exclusive)"
+    )
+    rebuild.set_defaults(handler=rebuild_rollups)
+
+    migrate_parser = commands.add_parser(
+        "migrate", help="Apply pending SQL migrations from migrations/sql (run before deploying)"
+    )
+    migrate_parser.add_argument(
+        "--baseline", type=int,
+        help="Record migrations up to this version as applied without running them "
+             "(for databases whose schema was created by hand)"
+    )
+    migrate_parser.set_defaults(handler=run_migrations)
+
+    partitions = commands.add_parser(
+        "create-partitions", help="Create missing monthly partitions of a partitioned spendings table"
+    )
+    partitions.add_argument(
+        "--ahead", type=int, default=SPENDINGS_PARTITIONS_AHEAD,
+        help="Months after the current one to create (default: SPENDINGS_PARTITIONS_AHEAD)"
+    )
+    partitions.set_defaults(handler=create_partitions)
+
+    detach = commands.add_parser(
+        "detach-partitions", help="Detach monthly spendings partitions that end before a date"
+    )
+    detach.add_argument(
+        "--before", type=date.fromisoformat, required=True,
+        help="Detach partitions holding only dates before this day (YYYY-MM-DD)"
+    )
+    target = detach.add_mutually_exclusive_group()
+    target.add_argument("--archive-schema", help="Move detached partitions to this schema")
+    target.add_argument("--drop", action="store_true", help="Drop detached partitions and their rows")
+    detach.set_defaults(handler=detach_old_partitions)
+
+    reindex = commands.add_parser(
+        "rebuild-search-index", help="Rebuild the SQLite full-text index of descriptions (e.g. after VACUUM)"
+    )
+    reindex.set_defaults(handler=reindex_search)
+
+    purge = commands.add_parser(
+        "purge-tombstones",
+        help="Delete tombstones of deleted spendings older than SYNC_TOMBSTONE_RETENTION_DAYS"
+    )
+    purge.set_defaults(handler=purge_tombstones)
+
+    status = commands.add_parser("migration-status", help="Show applied and pending migrations")
+    status.set_defaults(handler=migration_status)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
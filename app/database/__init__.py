@@ -1,6 +1,25 @@
 """Database configuration and session management."""
 
-from app.database.base import Base, engine, get_db, init_db
+from app.database.base import (
+    Base,
+    async_engine,
+    engine,
+    get_async_db,
+    get_db,
+    get_session,
+)
+from app.database.migrations import init_db
+from app.database.replicas import get_read_session, read_session_scope
 
-__all__ = ["Base", "engine", "get_db", "init_db"]
+__all__ = [
+    "Base",
+    "engine",
+    "async_engine",
+    "get_db",
+    "get_async_db",
+    "get_session",
+    "get_read_session",
+    "read_session_scope",
+    "init_db",
+]
 
@@ -1,11 +1,16 @@
 """Database base configuration."""
 
 import os
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.metrics.database import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool, instrument_engine
 
 # Load environment variables from .env file
 load_dotenv()
@@ -28,20 +33,57 @@ def get_database_url() -> str:
     return f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
 
 
+def get_async_database_url(database_url: str) -> str:
+    """Map a sync database URL to the matching async driver URL."""
+    if database_url.startswith(("postgresql://", "postgresql+psycopg2://")):
+        return "postgresql+asyncpg://" + database_url.split("://", 1)[1]
+    if database_url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + database_url.split("://", 1)[1]
+    return database_url
+
+
 # Get database URL from environment
 SQLALCHEMY_DATABASE_URL = get_database_url()
 
+# Connection pool sizing (shared by the sync and async engines)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+
+# Use the async engine (AsyncSession) for request handling instead of the sync one
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+
 # Create engine
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     pool_pre_ping=True,  # Verify connections before using them
-    pool_size=10,
-    max_overflow=20
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    poolclass=InstrumentedQueuePool,
+    pool_logging_name="primary"
 )
+instrument_engine(engine, "primary")
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and session factory, only created when enabled so the async
+# driver (asyncpg/aiosqlite) is not required for the sync path
+async_engine = None
+AsyncSessionLocal = None
+if DB_ASYNC:
+    async_engine = create_async_engine(
+        get_async_database_url(SQLALCHEMY_DATABASE_URL),
+        pool_pre_ping=True,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_logging_name="primary_async"
+    )
+    instrument_engine(async_engine.sync_engine, "primary_async")
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
 # Base class for models
 Base = declarative_base()
 
@@ -55,7 +97,33 @@ def get_db():
         db.close()
 
 
-def init_db():
-    """Initialize database tables."""
-    Base.metadata.create_all(bind=engine)
+async def get_async_db():
+    """Dependency for getting an async database session."""
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+@asynccontextmanager
+async def session_scope():
+    """
+    Open the session used by request handlers for the duration of a block.
+
+    Yields an AsyncSession when DB_ASYNC is enabled, otherwise a sync Session
+    whose work is run in the threadpool by the async service layer.
+    """
+    if DB_ASYNC:
+        async with AsyncSessionLocal() as session:
+            yield session
+        return
+
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        await run_in_threadpool(db.close)
+
 
+async def get_session():
+    """Dependency for getting the session used by request handlers."""
+    async with session_scope() as session:
+        yield session
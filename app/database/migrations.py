@@ -0,0 +1,344 @@
+"""Versioned SQL migration runner."""
+
+import hashlib
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app import models  # noqa: F401 - Import to register models for create_all
+from app.database.base import Base, engine
+from app.models.category import Category
+from app.models.rollup import SpendingDailyRollup, SpendingMonthlyRollup
+from app.models.spending import SQLITE_FTS_TABLE, SQLITE_SEARCH_DDL, Spending
+from app.models.types import from_cents, to_cents
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations" / "sql"
+
+# What the app does with the schema at startup: check (fail if migrations are
+# pending or were edited), apply (migrate under the advisory lock) or off
+MIGRATIONS_ON_STARTUP = os.getenv("MIGRATIONS_ON_STARTUP", "check").lower()
+
+# pg_advisory_lock key held while migrating, so only one process migrates at a time
+MIGRATION_LOCK_KEY = 7_317_017
+
+# Files containing this line are run by hand only (rollbacks, sample data)
+MANUAL_MARKER = "-- Apply: manual"
+
+_FILE_PATTERN = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("checksum", String(64), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    """One numbered SQL file under migrations/sql."""
+
+    version: int
+    name: str
+    path: Path
+    checksum: str
+
+
+class MigrationError(RuntimeError):
+    """Raised when the database schema does not match the migration files."""
+
+
+class MigrationStatus(NamedTuple):
+    """Applied, pending and edited migrations of a database."""
+
+    current_version: int
+    pending: List[Migration]
+    changed: List[Migration]
+
+
+def discover_migrations(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """List the migrations the runner applies, in version order (manual files excluded)."""
+    migrations = []
+    for path in sorted(directory.glob("*.sql")):
+        match = _FILE_PATTERN.match(path.name)
+        if not match:
+            continue
+        content = path.read_bytes()
+        if MANUAL_MARKER.encode() in content:
+            continue
+        migrations.append(Migration(
+            version=int(match.group(1)),
+            name=match.group(2),
+            path=path,
+            checksum=hashlib.sha256(content).hexdigest()
+        ))
+    return sorted(migrations, key=lambda migration: migration.version)
+
+
+def _applied(connection: Connection) -> Dict[int, str]:
+    """Get applied versions and their checksums (empty if nothing was ever applied)."""
+    if not connection.dialect.has_table(connection, schema_migrations.name):
+        return {}
+    rows = connection.execute(select(schema_migrations.c.version, schema_migrations.c.checksum))
+    return {version: checksum for version, checksum in rows}
+
+
+def _status(applied: Dict[int, str], migrations: List[Migration]) -> MigrationStatus:
+    return MigrationStatus(
+        current_version=max(applied, default=0),
+        pending=[m for m in migrations if m.version not in applied],
+        changed=[m for m in migrations if m.version in applied and applied[m.version] != m.checksum],
+    )
+
+
+def get_status(bind: Engine = engine) -> MigrationStatus:
+    """Compare the database with the migration files (one read query, no DDL)."""
+    with bind.connect() as connection:
+        return _status(_applied(connection), discover_migrations())
+
+
+def check_schema(bind: Engine = engine) -> int:
+    """
+    Verify the database is fully migrated; used at startup instead of running DDL.
+
+    Returns:
+        The current schema version.
+
+    Raises:
+        MigrationError: If migrations are pending or an applied file was edited.
+    """
+    status = get_status(bind)
+    if status.changed:
+        raise MigrationError(
+            "Applied migrations were modified: " + ", ".join(m.path.name for m in status.changed)
+        )
+    if status.pending:
+        raise MigrationError(
+            "Database schema is behind (pending: "
+            + ", ".join(m.path.name for m in status.pending)
+            + "); run `python -m app.cli migrate`"
+        )
+    return status.current_version
+
+
+def _record(connection: Connection, migration: Migration) -> None:
+    connection.execute(schema_migrations.insert().values(
+        version=migration.version,
+        name=migration.name,
+        checksum=migration.checksum,
+        applied_at=datetime.now()
+    ))
+
+
+def _rebuild_table(
+    connection: Connection,
+    table: Table,
+    convert: Callable[[dict], dict],
+    batch_size: int = 1000,
+    old_columns: Sequence[Column] = ()
+) -> None:
+    """
+    Recreate a table from its model and copy the old rows through convert.
+
+    old_columns override reflected columns whose declared type SQLite can't map back.
+    """
+    old_name = f"{table.name}_old"
+    for index in inspect(connection).get_indexes(table.name):
+        connection.execute(text(f'DROP INDEX "{index["name"]}"'))
+    connection.execute(text(f'ALTER TABLE "{table.name}" RENAME TO "{old_name}"'))
+    table.create(connection)
+    old = Table(old_name, MetaData(), *old_columns, autoload_with=connection, resolve_fks=False)
+    rows = connection.execute(select(old)).mappings()
+    for batch in iter(lambda: rows.fetchmany(batch_size), []):
+        connection.execute(table.insert(), [convert(dict(row)) for row in batch])
+    connection.execute(text(f'DROP TABLE "{old_name}"'))
+
+
+def _create_categories(connection: Connection) -> None:
+    """Version 6: move spendings.category into the categories table (what 006_*.sql does on PostgreSQL)."""
+    if Spending.__tablename__ not in inspect(connection).get_table_names():
+        return
+    columns = {column["name"] for column in inspect(connection).get_columns(Spending.__tablename__)}
+    if "category" not in columns:
+        return
+    Category.__table__.create(connection, checkfirst=True)
+    names = set(connection.execute(text(f"SELECT DISTINCT category FROM {Spending.__tablename__}")).scalars())
+    names -= set(connection.execute(select(Category.name)).scalars())
+    if names:
+        connection.execute(Category.__table__.insert(), [{"name": name} for name in sorted(names)])
+    category_ids = dict(connection.execute(select(Category.name, Category.id)).tuples().all())
+
+    def convert(row: dict) -> dict:
+        # The table is recreated from the current model, so the later layout
+        # changes happen here too: binary ids (version 7) and rounded cents
+        row["category_id"] = category_ids[row.pop("category")]
+        row["id"] = UUID(row["id"])
+        return row
+
+    _rebuild_table(connection, Spending.__table__, convert)
+
+
+def _store_amounts_as_cents(connection: Connection) -> None:
+    """Version 7: binary ids and integer cents (what 007_*.sql does on PostgreSQL)."""
+    tables = inspect(connection).get_table_names()
+    if Spending.__tablename__ in tables:
+        columns = {column["name"] for column in inspect(connection).get_columns(Spending.__tablename__)}
+        if "amount" in columns:
+            # Old ids are 36-character strings; the float amounts are rounded by the Cents type
+            _rebuild_table(connection, Spending.__table__, lambda row: {**row, "id": UUID(row["id"])})
+    if SpendingDailyRollup.__tablename__ in tables:
+        columns = {column["name"] for column in inspect(connection).get_columns(SpendingDailyRollup.__tablename__)}
+        if "total_amount" in columns:
+            _rebuild_table(connection, SpendingDailyRollup.__table__, lambda row: row)
+
+
+def _create_monthly_rollups(connection: Connection) -> None:
+    """Version 8: create and backfill the monthly rollups from the daily ones."""
+    tables = inspect(connection).get_table_names()
+    if SpendingMonthlyRollup.__tablename__ in tables or SpendingDailyRollup.__tablename__ not in tables:
+        return
+    SpendingMonthlyRollup.__table__.create(connection)
+    daily = SpendingDailyRollup.__table__
+    totals: Dict[tuple, list] = {}
+    for day, category, total_amount, spending_count in connection.execute(
+        select(daily.c.day, daily.c.category, daily.c.total_amount, daily.c.spending_count)
+    ):
+        bucket = totals.setdefault((day.replace(day=1), category), [0, 0])
+        bucket[0] += to_cents(total_amount)
+        bucket[1] += spending_count
+    if totals:
+        connection.execute(SpendingMonthlyRollup.__table__.insert(), [
+            {"month": month, "category": category, "total_amount": from_cents(cents), "spending_count": count}
+            for (month, category), (cents, count) in totals.items()
+        ])
+
+
+def _add_spending_updated_at(connection: Connection) -> None:
+    """Version 11: the updated_at column (SQLite can't add it with a clock default)."""
+    if Spending.__tablename__ not in inspect(connection).get_table_names():
+        return
+    columns = {column["name"] for column in inspect(connection).get_columns(Spending.__tablename__)}
+    if "updated_at" in columns:
+        return
+
+    def convert(row: dict) -> dict:
+        # Raw columns come back as stored: 16-byte ids and integer cents; updated_at
+        # is left to its server default, as PostgreSQL does for existing rows
+        row["id"] = UUID(bytes=row["id"])
+        row["amount"] = from_cents(row.pop("amount_cents"))
+        return row
+
+    # BINARY(16) has no SQLite affinity of its own and would be read back as NUMERIC
+    _rebuild_table(connection, Spending.__table__, convert, old_columns=[Column("id", LargeBinary, primary_key=True)])
+
+
+def rebuild_search_index(connection: Connection) -> None:
+    """
+    Create the SQLite full-text index of descriptions if missing and reindex every row.
+
+    The FTS5 table points at spendings rowids, which VACUUM may renumber;
+    run this (`python -m app.cli rebuild-search-index`) after vacuuming.
+    """
+    if connection.dialect.name != "sqlite" or Spending.__tablename__ not in inspect(connection).get_table_names():
+        return
+    for statement in SQLITE_SEARCH_DDL:
+        connection.execute(text(statement))
+    connection.execute(text(f"INSERT INTO {SQLITE_FTS_TABLE} ({SQLITE_FTS_TABLE}) VALUES ('rebuild')"))
+
+
+# Data migrations for databases other than PostgreSQL (SQLite for development),
+# keyed by the version of the SQL file they stand in for. Each checks the
+# existing layout first, so it is a no-op on tables created from the models.
+PORTABLE_MIGRATIONS: Dict[int, Callable[[Connection], None]] = {
+    6: _create_categories,
+    7: _store_amounts_as_cents,
+    8: _create_monthly_rollups,
+    11: _add_spending_updated_at,
+    12: rebuild_search_index,
+}
+
+
+def migrate(bind: Engine = engine, baseline: Optional[int] = None) -> List[Migration]:
+    """
+    Apply pending migrations in version order, each in its own transaction.
+
+    On PostgreSQL the SQL files are run under a session-level advisory lock,
+    so concurrent callers wait and then find nothing left to do. Other
+    databases (SQLite for development) cannot run the PostgreSQL SQL; they
+    run the PORTABLE_MIGRATIONS that rewrite existing data, then missing
+    tables are created from the models and every migration is recorded.
+
+    Args:
+        bind: Engine of the database to migrate.
+        baseline: Record migrations up to this version as applied without
+            running them (for databases created before the runner existed).
+
+    Returns:
+        The migrations applied (or recorded) by this call.
+
+    Raises:
+        MigrationError: If an applied migration file was edited.
+    """
+    migrations = discover_migrations()
+    with bind.connect() as connection:
+        is_postgresql = connection.dialect.name == "postgresql"
+        if is_postgresql:
+            connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            connection.commit()
+        try:
+            schema_migrations.create(connection, checkfirst=True)
+            connection.commit()
+            status = _status(_applied(connection), migrations)
+            connection.commit()
+            if status.changed:
+                raise MigrationError(
+                    "Applied migrations were modified: " + ", ".join(m.path.name for m in status.changed)
+                )
+
+            if not is_postgresql and status.pending and baseline is None:
+                for migration in status.pending:
+                    if migration.version in PORTABLE_MIGRATIONS:
+                        with connection.begin():
+                            logger.info("Applying data migration for %s", migration.path.name)
+                            PORTABLE_MIGRATIONS[migration.version](connection)
+                Base.metadata.create_all(bind=connection)
+                connection.commit()
+
+            for migration in status.pending:
+                with connection.begin():
+                    if is_postgresql and (baseline is None or migration.version > baseline):
+                        logger.info("Applying migration %s", migration.path.name)
+                        # Run the file as-is through the driver (multiple statements, DO blocks)
+                        connection.connection.cursor().execute(migration.path.read_text())
+                    _record(connection, migration)
+            return status.pending
+        finally:
+            if is_postgresql:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+                connection.commit()
+
+
+def init_db() -> None:
+    """Bring the database schema up to date (same as `python -m app.cli migrate`)."""
+    migrate()
+
+
+def prepare_schema() -> None:
+    """Apply or check migrations at startup, as configured by MIGRATIONS_ON_STARTUP."""
+    if MIGRATIONS_ON_STARTUP == "apply":
+        migrate()
+    elif MIGRATIONS_ON_STARTUP == "check":
+        version = check_schema()
+        logger.info("Database schema is at version %d", version)
+    elif MIGRATIONS_ON_STARTUP != "off":
+        raise ValueError(f"Unknown MIGRATIONS_ON_STARTUP: {MIGRATIONS_ON_STARTUP}")
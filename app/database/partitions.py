@@ -0,0 +1,231 @@
+"""Monthly range partitions of the spendings table (PostgreSQL only).
+
+Partitioning is optional: it is switched on by running
+migrations/sql/009_partition_spendings_by_month.sql by hand. Once spendings
+is partitioned, the app keeps partitions for the coming months in place and
+old months can be detached (and archived or dropped) from the CLI. On other
+databases, or while spendings is a plain table, everything here is a no-op.
+"""
+
+import asyncio
+import logging
+import os
+import re
+from datetime import date
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from starlette.concurrency import run_in_threadpool
+
+from app.database.base import engine
+from app.models.spending import Spending
+
+logger = logging.getLogger(__name__)
+
+# Months after the current one that must already have a partition
+SPENDINGS_PARTITIONS_AHEAD = int(os.getenv("SPENDINGS_PARTITIONS_AHEAD", "3"))
+
+# Seconds between checks for missing upcoming partitions (0 disables the background check)
+SPENDINGS_PARTITION_CHECK_INTERVAL = float(os.getenv("SPENDINGS_PARTITION_CHECK_INTERVAL", "3600"))
+
+# pg_advisory_xact_lock key held while partitions are created or detached
+PARTITION_LOCK_KEY = 7_317_021
+
+# Catches rows outside every monthly partition so inserts never fail
+DEFAULT_PARTITION = "spendings_default"
+
+_NAME_PATTERN = re.compile(r"^spendings_y(\d{4})m(\d{2})$")
+
+
+class Partition(NamedTuple):
+    """One monthly partition of spendings, holding dates in [start, end)."""
+
+    name: str
+    start: date
+    end: date
+
+
+def partition_name(month: date) -> str:
+    """Get the name of the partition holding a month (spendings_yYYYYmMM)."""
+    return f"spendings_y{month.year:04d}m{month.month:02d}"
+
+
+def next_month(month: date) -> date:
+    """Get the first day of the month after the given one."""
+    if month.month == 12:
+        return date(month.year + 1, 1, 1)
+    return date(month.year, month.month + 1, 1)
+
+
+def is_partitioned(connection: Connection) -> bool:
+    """Whether spendings is a partitioned table (always False outside PostgreSQL)."""
+    if connection.dialect.name != "postgresql":
+        return False
+    return connection.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('spendings'))"
+    )).scalar()
+
+
+def list_partitions(connection: Connection) -> List[Partition]:
+    """List the monthly partitions attached to spendings, oldest first (default partition excluded)."""
+    names = connection.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass('spendings')"
+    )).scalars()
+    partitions = []
+    for name in names:
+        match = _NAME_PATTERN.match(name)
+        if match:
+            start = date(int(match.group(1)), int(match.group(2)), 1)
+            partitions.append(Partition(name, start, next_month(start)))
+    return sorted(partitions, key=lambda partition: partition.start)
+
+
+def _create_partition(connection: Connection, month: date) -> None:
+    """
+    Create the partition of a month.
+
+    Rows of that month that already landed in the default partition are
+    moved into the new table before it is attached, since PostgreSQL refuses
+    to add a partition whose range overlaps rows of the default one.
+    """
+    name, start, end = partition_name(month), month.isoformat(), next_month(month).isoformat()
+    bounds = f"FOR VALUES FROM ('{start}') TO ('{end}')"
+    stranded = connection.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": DEFAULT_PARTITION}).scalar()
+    if stranded:
+        stranded = connection.execute(
+            text(f'SELECT EXISTS (SELECT 1 FROM "{DEFAULT_PARTITION}" WHERE date >= :start AND date < :end)'),
+            {"start": start, "end": end}
+        ).scalar()
+    if not stranded:
+        connection.execute(text(f'CREATE TABLE "{name}" PARTITION OF spendings {bounds}'))
+        return
+
+    columns = ", ".join(f'"{column.name}"' for column in Spending.__table__.columns)
+    connection.execute(text(f'CREATE TABLE "{name}" (LIKE spendings INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+    connection.execute(
+        text(
+            f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" WHERE date >= :start AND date < :end '
+            f'RETURNING {columns}) INSERT INTO "{name}" ({columns}) SELECT {columns} FROM moved'
+        ),
+        {"start": start, "end": end}
+    )
+    connection.execute(text(f'ALTER TABLE spendings ATTACH PARTITION "{name}" {bounds}'))
+    logger.info("Moved rows of %s out of %s", month.strftime("%Y-%m"), DEFAULT_PARTITION)
+
+
+def ensure_partitions(
+    bind: Engine = engine,
+    ahead: int = SPENDINGS_PARTITIONS_AHEAD,
+    today: Optional[date] = None
+) -> List[str]:
+    """
+    Create missing partitions for the current month and the next `ahead` months.
+
+    Safe to run from several processes at once: each month is created under
+    a transaction-level advisory lock and only if it still does not exist.
+
+    Returns:
+        Names of the partitions created by this call.
+    """
+    created = []
+    with bind.connect() as connection:
+        if not is_partitioned(connection):
+            return created
+        connection.commit()
+        month = (today or date.today()).replace(day=1)
+        for _ in range(ahead + 1):
+            name = partition_name(month)
+            with connection.begin():
+                connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITION_LOCK_KEY})
+                if connection.execute(text("SELECT to_regclass(:name) IS NULL"), {"name": name}).scalar():
+                    _create_partition(connection, month)
+                    created.append(name)
+            month = next_month(month)
+    for name in created:
+        logger.info("Created partition %s", name)
+    return created
+
+
+def detach_partitions(
+    before: date,
+    bind: Engine = engine,
+    archive_schema: Optional[str] = None,
+    drop: bool = False
+) -> List[Partition]:
+    """
+    Detach the monthly partitions that end on or before a date.
+
+    A detached partition keeps its rows as a plain table that no query of the
+    app reads any more. It is left in place, moved to archive_schema, or dropped.
+
+    Args:
+        before: Partitions holding only dates before this day are detached.
+        bind: Engine of the database.
+        archive_schema: Schema to move detached partitions to (created if missing).
+        drop: Drop detached partitions instead of keeping them.
+
+    Returns:
+        The detached partitions, oldest first.
+    """
+    detached = []
+    with bind.connect() as connection:
+        if not is_partitioned(connection):
+            return detached
+        connection.commit()
+        for partition in list_partitions(connection):
+            if partition.end > before:
+                break
+            with connection.begin():
+                connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITION_LOCK_KEY})
+                connection.execute(text(f'ALTER TABLE spendings DETACH PARTITION "{partition.name}"'))
+                if drop:
+                    connection.execute(text(f'DROP TABLE "{partition.name}"'))
+                elif archive_schema:
+                    connection.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"'))
+                    connection.execute(text(f'ALTER TABLE "{partition.name}" SET SCHEMA "{archive_schema}"'))
+            detached.append(partition)
+    return detached
+
+
+class PartitionMaintainer:
+    """Creates upcoming spendings partitions at startup and then periodically."""
+
+    def __init__(self, bind: Engine = engine, interval: float = SPENDINGS_PARTITION_CHECK_INTERVAL):
+        self.bind = bind
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Create missing partitions now and start the periodic check."""
+        if self.bind.dialect.name != "postgresql":
+            return
+        await run_in_threadpool(self.check)
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic check."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def check(self) -> None:
+        """Create missing partitions, logging (not raising) database errors."""
+        try:
+            ensure_partitions(self.bind)
+        except Exception:
+            logger.exception("Could not create upcoming spendings partitions")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await run_in_threadpool(self.check)
+
+
+partition_maintainer = PartitionMaintainer()
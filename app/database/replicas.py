@@ -0,0 +1,203 @@
+"""Read-replica routing for read-only request handlers."""
+
+import asyncio
+import itertools
+import logging
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.database.base import (
+    DB_ASYNC,
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    get_async_database_url,
+    session_scope,
+)
+from app.metrics.database import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool, instrument_engine
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated URLs of read replicas; empty means every query uses the primary
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+
+# Seconds between replica health checks
+REPLICA_HEALTH_CHECK_INTERVAL = float(os.getenv("REPLICA_HEALTH_CHECK_INTERVAL", "5"))
+
+# After a write, the client's reads go to the primary for this many seconds
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+
+# Cookie set by write routes, holding the time until which reads use the primary
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+
+class Replica:
+    """One read replica with its own connection pools and health state."""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.healthy = True
+        self.engine = create_engine(
+            url,
+            pool_pre_ping=True,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            poolclass=InstrumentedQueuePool,
+            pool_logging_name=name
+        )
+        instrument_engine(self.engine, name)
+        event.listen(self.engine, "handle_error", self._on_error)
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+
+        self.async_engine = None
+        self.async_session_factory = None
+        if DB_ASYNC:
+            self.async_engine = create_async_engine(
+                get_async_database_url(url),
+                pool_pre_ping=True,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                poolclass=InstrumentedAsyncAdaptedQueuePool,
+                pool_logging_name=f"{name}_async"
+            )
+            instrument_engine(self.async_engine.sync_engine, f"{name}_async")
+            event.listen(self.async_engine.sync_engine, "handle_error", self._on_error)
+            self.async_session_factory = async_sessionmaker(
+                self.async_engine, autoflush=False, expire_on_commit=False
+            )
+
+    def _on_error(self, context) -> None:
+        """Take the replica out of rotation as soon as a query sees it disconnect."""
+        if context.is_disconnect:
+            self._set_healthy(False)
+
+    def _set_healthy(self, healthy: bool) -> None:
+        if healthy != self.healthy:
+            if healthy:
+                logger.info("Read replica %s is healthy again, back in rotation", self.name)
+            else:
+                logger.warning("Read replica %s failed, removed from rotation", self.name)
+        self.healthy = healthy
+
+    def check(self) -> bool:
+        """Run SELECT 1 against the replica and update its health."""
+        try:
+            with self.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except SQLAlchemyError:
+            self._set_healthy(False)
+        else:
+            self._set_healthy(True)
+        return self.healthy
+
+
+class ReplicaSet:
+    """Round-robin choice among healthy replicas, checked in the background."""
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(f"replica_{number}", url) for number, url in enumerate(urls, start=1)]
+        self._turn = itertools.count()
+        self._health_checks: Optional[asyncio.Task] = None
+
+    def choose(self) -> Optional[Replica]:
+        """Get the next healthy replica, or None if reads should use the primary."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)]
+
+    async def start(self) -> None:
+        """Start the periodic health checks."""
+        if self.replicas:
+            self._health_checks = asyncio.create_task(self._run_health_checks())
+
+    async def stop(self) -> None:
+        """Stop the health checks and release the replica pools."""
+        if self._health_checks is not None:
+            self._health_checks.cancel()
+            try:
+                await self._health_checks
+            except asyncio.CancelledError:
+                pass
+            self._health_checks = None
+        for replica in self.replicas:
+            await run_in_threadpool(replica.engine.dispose)
+            if replica.async_engine is not None:
+                await replica.async_engine.dispose()
+
+    async def _run_health_checks(self) -> None:
+        while True:
+            await asyncio.sleep(REPLICA_HEALTH_CHECK_INTERVAL)
+            for replica in self.replicas:
+                await run_in_threadpool(replica.check)
+
+
+replicas = ReplicaSet(DATABASE_REPLICA_URLS)
+
+
+def prefers_primary(request: Request) -> bool:
+    """Whether the client wrote recently (or asks for the primary via X-Read-Primary)."""
+    if request.headers.get("x-read-primary", "").lower() in ("1", "true", "yes"):
+        return True
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+@asynccontextmanager
+async def read_session_scope(use_primary: bool = False):
+    """
+    Open a session for read-only work on a healthy replica.
+
+    Falls back to the primary when no replicas are configured, none is
+    healthy, or use_primary is set (read-after-write).
+    """
+    replica = None if use_primary else replicas.choose()
+    if replica is None:
+        async with session_scope() as session:
+            yield session
+        return
+
+    if DB_ASYNC:
+        async with replica.async_session_factory() as session:
+            yield session
+        return
+
+    db = replica.session_factory()
+    try:
+        yield db
+    finally:
+        await run_in_threadpool(db.close)
+
+
+async def get_read_session(request: Request):
+    """Dependency for getting a session for read-only request handlers."""
+    async with read_session_scope(use_primary=prefers_primary(request)) as session:
+        yield session
+
+
+def stick_to_primary(response: Response) -> None:
+    """
+    Dependency for write routes: send the client's reads to the primary for a while.
+
+    Sets a short-lived cookie so a client reads its own writes even while the
+    replicas lag behind. No-op without replicas.
+    """
+    if replicas.replicas and REPLICA_STICKY_SECONDS > 0:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            f"{time.time() + REPLICA_STICKY_SECONDS:.3f}",
+            max_age=math.ceil(REPLICA_STICKY_SECONDS),
+            httponly=True,
+            samesite="lax"
+        )
@@ -1,10 +1,26 @@
 """Main FastAPI application."""
 
+from anyio import to_thread
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 
-from app.database import init_db
-from app.models import Spending  # noqa: F401 - Import to register models
-from app.routers import health, spendings
+from app.database.base import DB_MAX_OVERFLOW, DB_POOL_SIZE, async_engine
+from app.database.migrations import prepare_schema
+from app.database.partitions import partition_maintainer
+from app.database.replicas import replicas
+from app.metrics import METRICS_ENABLED, MetricsMiddleware
+from app.models import (  # noqa: F401 - Import to register models
+    Budget,
+    Category,
+    DataVersion,
+    Spending,
+    SpendingDailyRollup,
+    SpendingMonthlyRollup,
+    SpendingTombstone,
+)
+from app.routers import budgets, health, metrics, spendings
+from app.services.live import spending_stream
+from app.services.write_buffer import write_buffer
 
 app = FastAPI(
     title="Budget Tracker API",
@@ -15,11 +31,37 @@ app = FastAPI(
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on application startup."""
-    init_db()
+    """Check the database schema and start background workers on application startup."""
+    # No DDL here: migrations are applied ahead of deploy with `python -m app.cli migrate`
+    await run_in_threadpool(prepare_schema)
+    await partition_maintainer.start()
+    # Sync-mode DB work runs in the threadpool; let it use the whole connection pool
+    limiter = to_thread.current_default_thread_limiter()
+    limiter.total_tokens = max(limiter.total_tokens, DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    if write_buffer is not None:
+        await write_buffer.start()
+    await replicas.start()
+    await spending_stream.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled connections on application shutdown."""
+    await spending_stream.stop()
+    if write_buffer is not None:
+        await write_buffer.stop()
+    await replicas.stop()
+    await partition_maintainer.stop()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 # Include routers
 app.include_router(health.router)
 app.include_router(spendings.router)
+app.include_router(budgets.router)
+
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
 
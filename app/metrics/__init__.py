@@ -0,0 +1,7 @@
+"""Request, SQL and connection pool metrics."""
+
+from app.metrics.database import METRICS_ENABLED, instrument_engine
+from app.metrics.middleware import MetricsMiddleware
+from app.metrics.registry import registry
+
+__all__ = ["METRICS_ENABLED", "MetricsMiddleware", "instrument_engine", "registry"]
@@ -0,0 +1,145 @@
+"""SQL statement timing and connection pool metrics."""
+
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.metrics.registry import Counter, GaugeCallback, Histogram, LabelValues, registry
+
+# Collect request, SQL and pool metrics and serve them at GET /metrics
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Log statements slower than this many milliseconds (0 disables the slow-query log)
+SLOW_QUERY_LOG_MS = float(os.getenv("SLOW_QUERY_LOG_MS", "0"))
+
+slow_query_logger = logging.getLogger("app.slow_query")
+
+STATEMENT_DURATION = registry.register(Histogram(
+    "db_statement_duration_seconds", "Time spent executing SQL statements", ("engine",)
+))
+SLOW_STATEMENTS = registry.register(Counter(
+    "db_slow_statements_total", "SQL statements slower than SLOW_QUERY_LOG_MS", ("engine",)
+))
+POOL_CHECKOUT_WAIT = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", ("engine",)
+))
+
+# Engines whose pools are reported, by label
+_engines: Dict[str, Engine] = {}
+
+
+class RequestDbStats:
+    """SQL statement count and time of the request being handled."""
+
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+
+# Set by MetricsMiddleware; the threadpool and run_sync copy the context, so
+# statements run on behalf of a request are added to its stats
+current_request_stats: ContextVar[Optional[RequestDbStats]] = ContextVar("current_request_stats", default=None)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection."""
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started, self.logging_name or "default")
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long checkouts wait for a connection."""
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started, self.logging_name or "default")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, "_metrics_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    label = conn.engine.pool.logging_name or "default"
+    STATEMENT_DURATION.observe(elapsed, label)
+
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += elapsed
+
+    if SLOW_QUERY_LOG_MS and elapsed * 1000 >= SLOW_QUERY_LOG_MS:
+        SLOW_STATEMENTS.inc(label)
+        slow_query_logger.warning(
+            "Slow query on %s (%.1f ms%s): %s",
+            label,
+            elapsed * 1000,
+            ", executemany" if executemany else "",
+            " ".join(statement.split())[:2000]
+        )
+
+
+def instrument_engine(engine: Engine, label: str) -> None:
+    """
+    Time the statements of an engine and report its pool.
+
+    The engine should be created with pool_logging_name=label and an
+    Instrumented*QueuePool so pool checkouts are timed under the same label.
+    Accepts the sync_engine of an AsyncEngine.
+    """
+    if not METRICS_ENABLED:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    _engines[label] = engine
+
+
+def _pool_values(read) -> Dict[LabelValues, float]:
+    values = {}
+    for label, engine in _engines.items():
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            values[(label,)] = read(pool)
+    return values
+
+
+def _saturation(pool: QueuePool) -> float:
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    return pool.checkedout() / capacity if capacity else 0.0
+
+
+registry.register(GaugeCallback(
+    "db_pool_size", "Configured pool size", ("engine",), lambda: _pool_values(lambda pool: pool.size())
+))
+registry.register(GaugeCallback(
+    "db_pool_checked_out", "Connections currently checked out", ("engine",),
+    lambda: _pool_values(lambda pool: pool.checkedout())
+))
+registry.register(GaugeCallback(
+    "db_pool_overflow", "Connections open beyond the pool size", ("engine",),
+    lambda: _pool_values(lambda pool: max(pool.overflow(), 0))
+))
+registry.register(GaugeCallback(
+    "db_pool_saturation", "Checked-out connections as a fraction of pool size plus max overflow", ("engine",),
+    lambda: _pool_values(_saturation)
+))
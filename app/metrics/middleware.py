@@ -0,0 +1,64 @@
+"""ASGI middleware recording per-route request metrics."""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics.database import RequestDbStats, current_request_stats
+from app.metrics.registry import Counter, Histogram, registry
+
+REQUESTS = registry.register(Counter(
+    "http_requests_total", "HTTP requests handled", ("method", "route", "status")
+))
+REQUEST_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency, including streamed bodies", ("method", "route")
+))
+REQUEST_DB_STATEMENTS = registry.register(Histogram(
+    "http_request_db_statements", "SQL statements executed per HTTP request", ("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100)
+))
+REQUEST_DB_DURATION = registry.register(Histogram(
+    "http_request_db_duration_seconds", "Time spent in SQL statements per HTTP request", ("method", "route")
+))
+
+
+class MetricsMiddleware:
+    """
+    Times every HTTP request and the SQL it runs.
+
+    Written as plain ASGI middleware (not BaseHTTPMiddleware) to keep the
+    per-request overhead to a few dictionary updates. Requests are labelled
+    by route template, e.g. /spendings/{spending_id}, so label cardinality
+    stays bounded; requests that match no route are labelled "unmatched".
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestDbStats()
+        token = current_request_stats.set(stats)
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request_stats.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            REQUESTS.inc(method, route, str(status_code))
+            REQUEST_DURATION.observe(elapsed, method, route)
+            REQUEST_DB_STATEMENTS.observe(stats.statements, method, route)
+            REQUEST_DB_DURATION.observe(stats.seconds, method, route)
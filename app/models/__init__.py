@@ -1,6 +1,18 @@
 """Database models."""
 
+from app.models.budget import Budget
+from app.models.category import Category
+from app.models.data_version import DataVersion
+from app.models.rollup import SpendingDailyRollup, SpendingMonthlyRollup
 from app.models.spending import Spending
+from app.models.tombstone import SpendingTombstone
 
-__all__ = ["Spending"]
-
+__all__ = [
+    "Budget",
+    "Category",
+    "DataVersion",
+    "Spending",
+    "SpendingDailyRollup",
+    "SpendingMonthlyRollup",
+    "SpendingTombstone",
+]
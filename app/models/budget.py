@@ -0,0 +1,23 @@
+"""Budget database model."""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+
+from app.database.base import Base
+from app.models.types import Cents
+
+
+class Budget(Base):
+    """Monthly spending limit of a category."""
+
+    __tablename__ = "budgets"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False, unique=True)
+    monthly_limit = Column("monthly_limit_cents", Cents, key="monthly_limit", nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+    updated_at = Column(DateTime, nullable=False, default=datetime.now, onupdate=datetime.now)
+
+    def __repr__(self):
+        return f"<Budget(id={self.id}, category_id={self.category_id}, monthly_limit={self.monthly_limit})>"
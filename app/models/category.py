@@ -0,0 +1,26 @@
+"""Category database model."""
+
+from sqlalchemy import Column, Index, Integer, String, func
+
+from app.database.base import Base
+
+
+class Category(Base):
+    """Dictionary of spending categories, referenced by a small integer key."""
+
+    __tablename__ = "categories"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String, nullable=False, unique=True)
+
+    __table_args__ = (
+        # Backs case-insensitive prefix search (text_pattern_ops on PostgreSQL)
+        Index(
+            "idx_categories_name_lower_prefix",
+            func.lower(name),
+            postgresql_ops={"lower(name)": "text_pattern_ops"}
+        ),
+    )
+
+    def __repr__(self):
+        return f"<Category(id={self.id}, name={self.name})>"
@@ -0,0 +1,20 @@
+"""Data version database model."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, Date, DateTime
+
+from app.database.base import Base
+
+
+class DataVersion(Base):
+    """Write counter of one month of spendings; read endpoints derive their ETags from it."""
+
+    __tablename__ = "data_versions"
+
+    month = Column(Date, primary_key=True)  # First day of the month
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.now)
+
+    def __repr__(self):
+        return f"<DataVersion(month={self.month}, version={self.version}, updated_at={self.updated_at})>"
@@ -0,0 +1,40 @@
+"""Spending rollup database model."""
+
+from sqlalchemy import Column, Date, Integer, String
+
+from app.database.base import Base
+from app.models.types import Cents
+
+
+class SpendingDailyRollup(Base):
+    """Per-day, per-category spending totals maintained alongside every write."""
+
+    __tablename__ = "spending_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    category = Column(String, primary_key=True)
+    total_amount = Column("total_amount_cents", Cents, key="total_amount", nullable=False, default=0)
+    spending_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<SpendingDailyRollup(day={self.day}, category={self.category}, "
+            f"total_amount={self.total_amount}, spending_count={self.spending_count})>"
+        )
+
+
+class SpendingMonthlyRollup(Base):
+    """Running per-month, per-category totals; budget checks read them instead of re-summing."""
+
+    __tablename__ = "spending_monthly_rollups"
+
+    month = Column(Date, primary_key=True)  # First day of the month
+    category = Column(String, primary_key=True)
+    total_amount = Column("total_amount_cents", Cents, key="total_amount", nullable=False, default=0)
+    spending_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<SpendingMonthlyRollup(month={self.month}, category={self.category}, "
+            f"total_amount={self.total_amount}, spending_count={self.spending_count})>"
+        )
@@ -3,41 +3,37 @@
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import Column, DateTime, Float, String
-from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
-from sqlalchemy.types import TypeDecorator, CHAR
+from sqlalchemy import DDL, Column, DateTime, ForeignKey, Index, Integer, String, event, func, literal_column
+from sqlalchemy.sql.elements import ColumnElement
 
 from app.database.base import Base
+from app.models.types import GUID, Cents, utcnow
 
 
-class GUID(TypeDecorator):
-    """Platform-independent GUID type for SQLAlchemy."""
-    impl = CHAR
-    cache_ok = True
-
-    def load_dialect_impl(self, dialect):
-        if dialect.name == 'postgresql':
-            return dialect.type_descriptor(PostgresUUID())
-        else:
-            return dialect.type_descriptor(CHAR(36))
-
-    def process_bind_param(self, value, dialect):
-        if value is None:
-            return value
-        elif dialect.name == 'postgresql':
-            return str(value)
-        else:
-            if not isinstance(value, str):
-                return str(value)
-            return value
-
-    def process_result_value(self, value, dialect):
-        if value is None:
-            return value
-        else:
-            if not isinstance(value, str):
-                return str(value)
-            return value
+# Text search configuration of the description index; queries must build the
+# same expression (description_document) for PostgreSQL to use the index
+SEARCH_CONFIG = "english"
+
+# External-content FTS5 index of descriptions on SQLite, kept in sync by triggers
+SQLITE_FTS_TABLE = "spendings_fts"
+SQLITE_SEARCH_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5("
+    "description, content='spendings', content_rowid='rowid', tokenize='porter unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_insert AFTER INSERT ON spendings BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE} (rowid, description) VALUES (new.rowid, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_delete AFTER DELETE ON spendings BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE} ({SQLITE_FTS_TABLE}, rowid, description) "
+    "VALUES ('delete', old.rowid, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_update AFTER UPDATE OF description ON spendings BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE} ({SQLITE_FTS_TABLE}, rowid, description) "
+    "VALUES ('delete', old.rowid, old.description); "
+    f"INSERT INTO {SQLITE_FTS_TABLE} (rowid, description) VALUES (new.rowid, new.description); END",
+)
+
+
+def description_document(description: ColumnElement) -> ColumnElement:
+    """The tsvector of a description, as indexed on PostgreSQL (literals inline to match the index)."""
+    return func.to_tsvector(literal_column(f"'{SEARCH_CONFIG}'"), func.coalesce(description, literal_column("''")))
 
 
 class Spending(Base):
@@ -45,13 +41,33 @@ class Spending(Base):
 
     __tablename__ = "spendings"
 
-    id = Column(GUID(), primary_key=True, default=lambda: str(uuid4()), index=True)
-    amount = Column(Float, nullable=False)
-    category = Column(String, nullable=False, index=True)
+    id = Column(GUID(), primary_key=True, default=uuid4, index=True)
+    # Stored as integer cents, read and written as a float amount
+    amount = Column("amount_cents", Cents, key="amount", nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False, index=True)
     description = Column(String, nullable=True)
     date = Column(DateTime, nullable=False, default=datetime.now, index=True)
     created_at = Column(DateTime, nullable=False, default=datetime.now)
+    # Set by the database on every insert and update (UTC); drives GET /spendings/changes
+    updated_at = Column(DateTime, nullable=False, server_default=utcnow(), onupdate=utcnow())
+
+    __table_args__ = (
+        # Backs keyset pagination ordered by (date, id)
+        Index("idx_spendings_date_id", "date", "id"),
+        # Backs the change feed ordered by (updated_at, id)
+        Index("idx_spendings_updated_at_id", "updated_at", "id"),
+        # Full-text search of descriptions (SQLite uses the FTS5 table instead)
+        Index(
+            "idx_spendings_description_search", description_document(description), postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
 
     def __repr__(self):
-        return f"<Spending(id={self.id}, amount={self.amount}, category={self.category})>"
+        return f"<Spending(id={self.id}, amount={self.amount}, category_id={self.category_id})>"
+
 
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(Spending.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    Spending.__table__, "before_drop", DDL(f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}").execute_if(dialect="sqlite")
+)
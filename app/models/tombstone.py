@@ -0,0 +1,23 @@
+"""Spending tombstone database model."""
+
+from sqlalchemy import Column, DateTime, Index
+
+from app.database.base import Base
+from app.models.types import GUID, utcnow
+
+
+class SpendingTombstone(Base):
+    """Marks a deleted spending so clients syncing with GET /spendings/changes drop it too."""
+
+    __tablename__ = "spending_tombstones"
+
+    id = Column(GUID(), primary_key=True)
+    deleted_at = Column(DateTime, nullable=False, server_default=utcnow())  # UTC
+
+    __table_args__ = (
+        # Backs the change feed ordered by (deleted_at, id)
+        Index("idx_spending_tombstones_deleted_at_id", "deleted_at", "id"),
+    )
+
+    def __repr__(self):
+        return f"<SpendingTombstone(id={self.id}, deleted_at={self.deleted_at})>"
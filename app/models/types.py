@@ -0,0 +1,112 @@
+"""Column types shared by the database models."""
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Optional, Union
+from uuid import UUID
+
+from sqlalchemy import BigInteger, DateTime
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import BINARY, TypeDecorator
+
+
+def to_cents(amount: Union[float, int, Decimal]) -> int:
+    """Convert an amount to integer cents, rounding half away from zero."""
+    return int((Decimal(str(amount)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: Union[int, Decimal]) -> float:
+    """Convert integer cents (or an exact SUM of them) back to an amount."""
+    return float(cents) / 100
+
+
+def round_to_cents(amount: Optional[float]) -> Optional[float]:
+    """Round an amount to whole cents, the precision it is stored with (schema validator)."""
+    if amount is None:
+        return None
+    rounded = from_cents(to_cents(amount))
+    if rounded <= 0:
+        raise ValueError("Amount must be at least 0.01")
+    return rounded
+
+
+class GUID(TypeDecorator):
+    """
+    UUID column returning uuid.UUID objects on every backend.
+
+    PostgreSQL uses its native UUID type; other databases store the 16 raw
+    bytes in a BINARY(16) column instead of a 36-character string.
+    """
+    impl = BINARY
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(PostgresUUID(as_uuid=True))
+        return dialect.type_descriptor(BINARY(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        if not isinstance(value, UUID):
+            value = UUID(str(value))
+        if dialect.name == 'postgresql':
+            return value
+        return value.bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, UUID):
+            return value
+        if isinstance(value, bytes):
+            return UUID(bytes=value)
+        return UUID(str(value))
+
+
+class Cents(TypeDecorator):
+    """
+    Money column stored as BIGINT cents and exposed as a float amount.
+
+    Amounts are rounded to whole cents on the way in, so sums computed by
+    the database are exact; results (including SUMs) come back as floats.
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        return to_cents(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return value
+        return from_cents(value)
+
+
+class utcnow(FunctionElement):
+    """
+    Current UTC time from the database clock, as a naive timestamp.
+
+    On PostgreSQL this is the start time of the writing transaction, so
+    every row a transaction writes gets the same value. SQLite keeps
+    microseconds in the same text format SQLAlchemy binds datetimes with,
+    so stored values compare correctly with parameters.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kwargs):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kwargs):
+    return "timezone('utc', now())"
+
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kwargs):
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
@@ -1,6 +1,6 @@
 """API routers."""
 
-from app.routers import health, spendings
+from app.routers import budgets, health, metrics, spendings
 
-__all__ = ["health", "spendings"]
+__all__ = ["budgets", "health", "metrics", "spendings"]
 
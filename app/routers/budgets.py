@@ -0,0 +1,114 @@
+"""Budget management endpoints."""
+
+from datetime import date
+from typing import List, Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database.base import get_session
+from app.database.replicas import get_read_session, stick_to_primary
+from app.schemas.budget import BudgetCreate, BudgetResponse, BudgetStatus, BudgetUpdate
+from app.services.budget_service import AsyncBudgetService, BudgetExists
+
+router = APIRouter(prefix="/budgets", tags=["budgets"])
+
+
+@router.get("", response_model=List[BudgetResponse])
+async def list_budgets(db: Union[AsyncSession, Session] = Depends(get_read_session)) -> List[BudgetResponse]:
+    """Get all budgets, ordered by category."""
+    return await AsyncBudgetService(db).list_budgets()
+
+
+@router.post(
+    "",
+    response_model=BudgetResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(stick_to_primary)]
+)
+async def create_budget(
+    budget: BudgetCreate,
+    db: Union[AsyncSession, Session] = Depends(get_session)
+) -> BudgetResponse:
+    """
+    Set a monthly spending limit for a category.
+    
+    Responds 409 if the category already has a budget (change it with PUT instead).
+    """
+    try:
+        return await AsyncBudgetService(db).create_budget(budget)
+    except BudgetExists as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+
+
+@router.get("/status", response_model=List[BudgetStatus])
+async def get_budget_status(
+    month: Optional[date] = Query(None, description="Any day of the month (YYYY-MM-DD format, defaults to today)"),
+    category: Optional[str] = Query(None, description="Optional exact category filter"),
+    db: Union[AsyncSession, Session] = Depends(get_read_session)
+) -> List[BudgetStatus]:
+    """
+    Get spent and remaining amounts of every budget for a month.
+    
+    - **month**: Any day of the month to report (defaults to the current month).
+    - **category**: Optional exact category filter.
+    
+    Answered from the running monthly totals kept up to date by every write,
+    so the cost does not grow with the number of spendings.
+    """
+    return await AsyncBudgetService(db).get_status(month=month, category=category)
+
+
+@router.get("/{budget_id}", response_model=BudgetResponse)
+async def get_budget(
+    budget_id: int,
+    db: Union[AsyncSession, Session] = Depends(get_read_session)
+) -> BudgetResponse:
+    """Get a specific budget by ID."""
+    budget = await AsyncBudgetService(db).get_budget(budget_id)
+    if not budget:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Budget with id {budget_id} not found"
+        )
+    return budget
+
+
+@router.put(
+    "/{budget_id}",
+    response_model=BudgetResponse,
+    dependencies=[Depends(stick_to_primary)]
+)
+async def update_budget(
+    budget_id: int,
+    budget_update: BudgetUpdate,
+    db: Union[AsyncSession, Session] = Depends(get_session)
+) -> BudgetResponse:
+    """Change the monthly limit of a budget."""
+    budget = await AsyncBudgetService(db).update_budget(budget_id, budget_update)
+    if not budget:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Budget with id {budget_id} not found"
+        )
+    return budget
+
+
+@router.delete(
+    "/{budget_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(stick_to_primary)]
+)
+async def delete_budget(
+    budget_id: int,
+    db: Union[AsyncSession, Session] = Depends(get_session)
+):
+    """Delete a budget."""
+    deleted = await AsyncBudgetService(db).delete_budget(budget_id)
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Budget with id {budget_id} not found"
+        )
+    return None
@@ -1,68 +1,549 @@
 """Spending management endpoints."""
 
+import asyncio
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.database.base import get_db
-from app.schemas.spending import SpendingCreate, SpendingResponse, SpendingUpdate
-from app.schemas.visualization import SpendingVisualization
-from app.services.spending_service import SpendingService
+from app.database.base import get_session
+from app.database.replicas import get_read_session, prefers_primary, read_session_scope, stick_to_primary
+from app.schemas.aggregate import SpendingAggregate
+from app.schemas.analytics import AdvancedSpendingStats
+from app.schemas.export import ExportFormat
+from app.schemas.spending import (
+    CategoryMatch,
+    SpendingBulkCreate,
+    SpendingBulkResponse,
+    SpendingCreate,
+    SpendingImportResponse,
+    SpendingResponse,
+    SpendingSearchResult,
+    SpendingUpdate,
+    SpendingWriteResponse,
+)
+from app.schemas.sync import SpendingChanges
+from app.schemas.visualization import SpendingTimeSeries, SpendingVisualization, TimeBucket
+from app.services.analytics import snapshot_cache
+from app.services.async_spending_service import AsyncSpendingService
+from app.services.conditional import etag_matches, make_etag, validator_headers
+from app.services.export import MEDIA_TYPES
+from app.services.live import STREAM_HEARTBEAT_SECONDS, StreamConnection, StreamLagged, format_sse, spending_stream
+from app.services.spending_service import ChangeTokenExpired, SnapshotUnstable
+from app.services.stats_cache import stats_cache
+from app.services.write_buffer import SpendingRejected, WriteBufferFull, WriteFailed
+from app.storage.database import BULK_INSERT_BATCH_SIZE
+from app.storage.rollups import rollup_day_range
+from app.storage.versions import VersionStamp
 
 router = APIRouter(prefix="/spendings", tags=["spendings"])
 
+NOT_MODIFIED_DESCRIPTION = "Not modified since the ETag sent in If-None-Match"
 
-@router.post("", response_model=SpendingResponse, status_code=status.HTTP_201_CREATED)
+
+def _validate_year_month(year: Optional[int], month: Optional[int]) -> None:
+    """Reject month filters without a year or outside 1-12."""
+    if month is not None and year is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Month filter requires year to be specified"
+        )
+
+    if month is not None and (month < 1 or month > 12):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Month must be between 1 and 12"
+        )
+
+
+def _not_modified(request: Request, stamp: VersionStamp, *extra: object) -> Optional[Response]:
+    """Get a 304 response if If-None-Match matches the current ETag, else None."""
+    etag = make_etag(stamp, *extra)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(stamp, etag))
+    return None
+
+
+@router.post(
+    "",
+    response_model=SpendingWriteResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(stick_to_primary)]
+)
 async def create_spending(
     spending: SpendingCreate,
-    db: Session = Depends(get_db)
-) -> SpendingResponse:
-    """Create a new spending entry."""
-    service = SpendingService(db)
-    return service.create_spending(spending)
+    db: Union[AsyncSession, Session] = Depends(get_session)
+) -> SpendingWriteResponse:
+    """
+    Create a new spending entry.
+    
+    `over_budget` is true when the spending leaves its category over the monthly
+    limit set with `POST /budgets`; `budget` holds the category's status for the month.
+    
+    With group commit enabled, responds 503 with `Retry-After` while the write
+    queue is full or when the batch holding the spending could not be committed,
+    and 422 when the database rejected the spending itself.
+    """
+    service = AsyncSpendingService(db)
+    try:
+        return await service.create_spending(spending)
+    except SpendingRejected as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+    except (WriteBufferFull, WriteFailed) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "1"}
+        )
 
 
-@router.get("", response_model=List[SpendingResponse])
+@router.post(
+    "/bulk",
+    response_model=SpendingBulkResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(stick_to_primary)]
+)
+async def create_spendings_bulk(
+    bulk: SpendingBulkCreate,
+    db: Union[AsyncSession, Session] = Depends(get_session)
+) -> SpendingBulkResponse:
+    """
+    Create many spending entries with batched multi-row INSERTs (COPY on PostgreSQL).
+    
+    - **atomic**: If true (default), nothing is created when any spending is invalid.
+      If false, invalid spendings are reported in `errors` and the rest are created.
+    - **return_rows**: Echo the created spendings (off by default for large imports).
+    - **batch_size**: Rows per INSERT batch.
+    """
+    service = AsyncSpendingService(db)
+    result = await service.create_spendings_bulk(bulk)
+    if bulk.atomic and result.errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[error.model_dump() for error in result.errors]
+        )
+    return result
+
+
+@router.post(
+    "/import",
+    response_model=SpendingImportResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(stick_to_primary)]
+)
+async def import_spendings(
+    file: UploadFile = File(..., description="CSV file with a header row: amount, category, description, date"),
+    batch_size: int = Query(BULK_INSERT_BATCH_SIZE, gt=0, le=10000, description="Rows per INSERT batch"),
+    db: Union[AsyncSession, Session] = Depends(get_session)
+) -> SpendingImportResponse:
+    """
+    Import spendings from a CSV upload.
+    
+    The file is parsed row by row and inserted in batches, so uploads of any size
+    are processed in bounded memory. Each row is validated like `POST /spendings`;
+    invalid rows are skipped and reported by line number (the header is line 1).
+    Extra columns, such as `id` and `created_at` from an export, are ignored.
+    """
+    service = AsyncSpendingService(db)
+    try:
+        return await service.import_spendings_csv(file.file, batch_size=batch_size)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    finally:
+        await file.close()
+
+
+@router.get(
+    "",
+    response_model=List[SpendingResponse],
+    responses={304: {"description": NOT_MODIFIED_DESCRIPTION}}
+)
 async def get_spendings(
+    request: Request,
     category: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
-) -> List[SpendingResponse]:
-    """Get all spendings, optionally filtered by category."""
-    service = SpendingService(db)
-    spendings = service.get_spendings(category=category)
-    return spendings[skip:skip + limit]
+    category_match: CategoryMatch = Query(
+        CategoryMatch.contains, description="How category is matched: exact, prefix or contains"
+    ),
+    skip: int = Query(0, ge=0, description="Number of spendings to skip (LIMIT/OFFSET mode)"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of spendings to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    db: Union[AsyncSession, Session] = Depends(get_read_session)
+) -> Response:
+    """
+    Get spendings ordered by date (newest first), optionally filtered by category.
+    
+    - **category**/**category_match**: `exact` name, case-insensitive `prefix`, or
+      case-insensitive substring (`contains`, the default).
+    - **skip**/**limit**: LIMIT/OFFSET pagination, kept for backward compatibility.
+    - **cursor**: Keyset pagination. Pass the `X-Next-Cursor` header of the previous
+      response to get the next page. Cannot be combined with skip.
+    
+    The `X-Next-Cursor` response header is set whenever more spendings are available.
+    Responses carry an `ETag`; send it back in `If-None-Match` to get `304 Not Modified`
+    (no query, no body) while no spending has changed.
+    """
+    if cursor and skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cursor cannot be combined with skip"
+        )
+
+    service = AsyncSpendingService(db)
+    stamp = await service.get_data_version()
+    not_modified = _not_modified(request, stamp)
+    if not_modified is not None:
+        return not_modified
+
+    # Fast path: rows are encoded straight to JSON, so response_model only documents
+    # the shape and FastAPI does not validate and re-serialize the page
+    try:
+        body, next_cursor = await service.get_spendings_page_json(
+            category=category,
+            limit=limit,
+            skip=skip,
+            cursor=cursor,
+            category_match=category_match
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    headers = validator_headers(stamp, make_etag(stamp))
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/export")
+async def export_spendings(
+    request: Request,
+    format: ExportFormat = Query(ExportFormat.csv, description="Export format: csv or ndjson"),
+    category: Optional[str] = None,
+    category_match: CategoryMatch = Query(
+        CategoryMatch.contains, description="How category is matched: exact, prefix or contains"
+    ),
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    date: Optional[date] = Query(None, description="Optional date to filter by (YYYY-MM-DD format). Takes precedence over year/month.")
+) -> StreamingResponse:
+    """
+    Stream all matching spendings as CSV or NDJSON.
+    
+    - **format**: `csv` (default) or `ndjson`.
+    - **category**/**category_match**: Optional category filter (same as the list endpoint).
+    - **year**/**month**/**date**: Optional date filters (same as the visualization endpoint).
+    
+    Rows are read from a server-side cursor and written as they arrive, so memory
+    stays flat whatever the row count.
+    """
+    if date is None:
+        _validate_year_month(year, month)
+    date_filter = datetime.combine(date, datetime.min.time()) if date else None
+
+    async def body():
+        # The stream outlives the request handler, so it owns its session
+        async with read_session_scope(use_primary=prefers_primary(request)) as db:
+            service = AsyncSpendingService(db)
+            async for chunk in service.export_spendings(
+                format,
+                category=category,
+                year=year,
+                month=month,
+                date=date_filter,
+                category_match=category_match
+            ):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="spendings.{format.value}"'}
+    )
+
+
+@router.get(
+    "/search",
+    response_model=List[SpendingSearchResult],
+    responses={304: {"description": NOT_MODIFIED_DESCRIPTION}}
+)
+async def search_spendings(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to look for in descriptions"),
+    category: Optional[str] = None,
+    category_match: CategoryMatch = Query(
+        CategoryMatch.contains, description="How category is matched: exact, prefix or contains"
+    ),
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    date: Optional[date] = Query(None, description="Optional date to filter by (YYYY-MM-DD format). Takes precedence over year/month."),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of results to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    db: Union[AsyncSession, Session] = Depends(get_read_session)
+) -> List[SpendingSearchResult]:
+    """
+    Full-text search of spending descriptions, best matches first.
+    
+    - **q**: On PostgreSQL a web search query (English stemming, `"quoted phrases"`,
+      `or`, `-excluded`); on SQLite every word must match.
+    - **category**/**category_match** and **year**/**month**/**date**: Optional filters,
+      applied in the same indexed query.
+    - **cursor**: Pass the `X-Next-Cursor` header of the previous response to get the
+      next page; results are ordered by `rank`, then newest first.
+    
+    Responses carry an `ETag` for conditional requests, as on the list endpoint.
+    """
+    if date is None:
+        _validate_year_month(year, month)
+    service = AsyncSpendingService(db)
+    stamp = await service.get_data_version()
+    not_modified = _not_modified(request, stamp)
+    if not_modified is not None:
+        return not_modified
+
+    try:
+        results, next_cursor = await service.search_spendings(
+            q,
+            limit=limit,
+            cursor=cursor,
+            category=category,
+            category_match=category_match,
+            year=year,
+            month=month,
+            date=datetime.combine(date, datetime.min.time()) if date else None
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    response.headers.update(validator_headers(stamp, make_etag(stamp)))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return results
+
+
+@router.get("/changes", response_model=SpendingChanges)
+async def get_spending_changes(
+    since: Optional[str] = Query(None, description="next_token of the previous call; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum number of changes to return"),
+    db: Union[AsyncSession, Session] = Depends(get_session)
+) -> SpendingChanges:
+    """
+    Get spendings created, updated or deleted since a change token, for incremental sync.
+    
+    Changes come oldest first; `upserted` entries carry the current spending and
+    `deleted` entries only its id. Store `next_token` and pass it as **since** next
+    time (straight away while `has_more` is true). Without **since**, every live
+    spending is returned.
+    
+    Tokens older than the tombstone retention period get `410 Gone`: drop the local
+    copy and sync again without **since**. Reads always go to the primary, since a
+    replica may not have every change before the token yet.
+    """
+    service = AsyncSpendingService(db)
+    try:
+        return await service.get_changes(since=since, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    except ChangeTokenExpired as exc:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(exc))
+
+
+async def _load_aggregate(
+    year: Optional[int],
+    month: Optional[int]
+) -> Tuple[SpendingAggregate, Dict[date, int]]:
+    """
+    Read the snapshot a live aggregate starts from, on the primary.
+
+    Writes committed before the stream subscribed are never broadcast to it,
+    so a lagging replica's snapshot would miss them for good.
+    """
+    async with read_session_scope(use_primary=True) as db:
+        return await AsyncSpendingService(db).get_aggregate_snapshot(year=year, month=month)
+
+
+async def _follow_aggregate(connection: StreamConnection, year: Optional[int], month: Optional[int]) -> None:
+    """Subscribe a stream to an aggregate, reporting failures to the client as error messages."""
+    try:
+        await connection.subscribe_aggregate(year, month)
+    except (ValueError, SnapshotUnstable) as exc:
+        connection.send_error(str(exc))
+
+
+async def _receive_stream_commands(websocket: WebSocket, connection: StreamConnection) -> None:
+    """Apply the subscribe/unsubscribe commands of a WebSocket client until it disconnects."""
+    try:
+        while True:
+            try:
+                command = await websocket.receive_json()
+            except ValueError:
+                connection.send_error("Commands must be JSON objects")
+                continue
+            if not isinstance(command, dict) or command.get("action") not in ("subscribe", "unsubscribe"):
+                connection.send_error('Commands need an "action" of "subscribe" or "unsubscribe"')
+                continue
+            year, month = command.get("year"), command.get("month")
+            if not all(value is None or type(value) is int for value in (year, month)):
+                connection.send_error("year and month must be integers")
+            elif command["action"] == "subscribe":
+                await _follow_aggregate(connection, year, month)
+            else:
+                connection.unsubscribe_aggregate(year, month)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        connection.close()
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}, "description": "Server-sent events"}}
+)
+async def stream_spendings_sse(
+    year: Optional[int] = Query(None, description="Also push the live categorized aggregate of this year"),
+    month: Optional[int] = Query(None, description="Narrow the live aggregate to a month (requires year)"),
+    aggregate: bool = Query(False, description="Push the all-time aggregate when no year is given"),
+    changes: bool = Query(True, description="Push each created, updated and deleted spending"),
+) -> StreamingResponse:
+    """
+    Stream spending writes as server-sent events.
+    
+    - `change` events carry `action` (`created`, `updated` or `deleted`), `id`, the
+      new `spending` and the `previous` version, as each write is committed.
+    - With **year**/**month** (or **aggregate**), `aggregate` events carry the same data
+      as `/stats/visualization`: once at the start, then after every write that changes
+      it. Totals are updated in memory from each write, not re-queried.
+    - `lagged` is sent before the stream ends when the client fell too far behind;
+      reload what it shows and reconnect. Idle streams get a comment every
+      `STREAM_HEARTBEAT_SECONDS`.
+    
+    Writes made outside the API (backfills, rollup rebuilds) are not streamed.
+    """
+    _validate_year_month(year, month)
+
+    async def body():
+        async with spending_stream.connect(
+            _load_aggregate, changes=changes, heartbeat=STREAM_HEARTBEAT_SECONDS
+        ) as connection:
+            if year is not None or aggregate:
+                await _follow_aggregate(connection, year, month)
+            try:
+                async for message in connection.messages():
+                    yield format_sse(message)
+            except StreamLagged as exc:
+                yield format_sse({"type": "lagged", "detail": str(exc)})
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
-@router.get("/{spending_id}", response_model=SpendingResponse)
+@router.websocket("/stream")
+async def stream_spendings_websocket(
+    websocket: WebSocket,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    aggregate: bool = False,
+    changes: bool = True
+) -> None:
+    """
+    Stream spending writes and live aggregates over a WebSocket.
+    
+    Sends the same JSON messages as the SSE endpoint, with a `type` field. Clients
+    can follow more aggregates at any time by sending
+    `{"action": "subscribe", "year": 2026, "month": 3}` (or stop with
+    `"unsubscribe"`); invalid commands get an `error` message. A client that
+    falls too far behind gets `lagged` and the socket is closed with code 1013.
+    """
+    await websocket.accept()
+    async with spending_stream.connect(_load_aggregate, changes=changes) as connection:
+        receiver = asyncio.create_task(_receive_stream_commands(websocket, connection))
+        try:
+            if year is not None or month is not None or aggregate:
+                await _follow_aggregate(connection, year, month)
+            async for message in connection.messages():
+                await websocket.send_json(message)
+        except StreamLagged as exc:
+            await websocket.send_json({"type": "lagged", "detail": str(exc)})
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            receiver.cancel()
+
+
+@router.get("/stream/stats")
+async def get_stream_stats():
+    """
+    Get live stream counters.
+    
+    Returns the broadcast backend, this worker's open stream connections, the
+    writes waiting to be broadcast and the writes dropped because that queue was full.
+    """
+    return spending_stream.stats()
+
+
+@router.get(
+    "/{spending_id}",
+    response_model=SpendingResponse,
+    responses={304: {"description": NOT_MODIFIED_DESCRIPTION}}
+)
 async def get_spending(
     spending_id: UUID,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: Union[AsyncSession, Session] = Depends(get_read_session)
 ) -> SpendingResponse:
-    """Get a specific spending by ID."""
-    service = SpendingService(db)
-    spending = service.get_spending_by_id(spending_id)
+    """Get a specific spending by ID (conditional with If-None-Match)."""
+    service = AsyncSpendingService(db)
+    stamp = await service.get_data_version()
+    not_modified = _not_modified(request, stamp)
+    if not_modified is not None:
+        return not_modified
+    spending = await service.get_spending_by_id(spending_id)
     if not spending:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Spending with id {spending_id} not found"
         )
+    response.headers.update(validator_headers(stamp, make_etag(stamp)))
     return spending
 
 
-@router.put("/{spending_id}", response_model=SpendingResponse)
+@router.put(
+    "/{spending_id}",
+    response_model=SpendingWriteResponse,
+    dependencies=[Depends(stick_to_primary)]
+)
 async def update_spending(
     spending_id: UUID,
     spending_update: SpendingUpdate,
-    db: Session = Depends(get_db)
-) -> SpendingResponse:
-    """Update an existing spending entry."""
-    service = SpendingService(db)
-    updated_spending = service.update_spending(spending_id, spending_update)
+    db: Union[AsyncSession, Session] = Depends(get_session)
+) -> SpendingWriteResponse:
+    """
+    Update an existing spending entry. Only the fields sent are changed.
+    
+    `over_budget` is true when the change adds to a category that is now over its monthly limit.
+    """
+    service = AsyncSpendingService(db)
+    updated_spending = await service.update_spending(spending_id, spending_update)
     if not updated_spending:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -71,14 +552,18 @@ async def update_spending(
     return updated_spending
 
 
-@router.delete("/{spending_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{spending_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(stick_to_primary)]
+)
 async def delete_spending(
     spending_id: UUID,
-    db: Session = Depends(get_db)
+    db: Union[AsyncSession, Session] = Depends(get_session)
 ):
     """Delete a spending entry."""
-    service = SpendingService(db)
-    deleted = service.delete_spending(spending_id)
+    service = AsyncSpendingService(db)
+    deleted = await service.delete_spending(spending_id)
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -86,10 +571,12 @@ async def delete_spending(
         )
 
 
-@router.get("/stats/summary")
+@router.get("/stats/summary", responses={304: {"description": NOT_MODIFIED_DESCRIPTION}})
 async def get_spending_summary(
+    request: Request,
+    response: Response,
     date: Optional[date] = Query(None, description="Optional date to filter summary by (YYYY-MM-DD format)"),
-    db: Session = Depends(get_db)
+    db: Union[AsyncSession, Session] = Depends(get_read_session)
 ):
     """
     Get summary statistics of all spendings.
@@ -97,18 +584,31 @@ async def get_spending_summary(
     - **date**: Optional date filter (YYYY-MM-DD format). If provided, returns summary for that specific date only.
     
     Returns summary statistics including total spendings, total amount, breakdown by category, and average amount.
+    The `ETag` only changes when a spending in the filtered window changes.
     """
-    service = SpendingService(db)
+    service = AsyncSpendingService(db)
     date_filter = datetime.combine(date, datetime.min.time()) if date else None
-    return service.get_summary(date=date_filter)
+    stamp = await service.get_data_version(*rollup_day_range(date=date_filter))
+    not_modified = _not_modified(request, stamp)
+    if not_modified is not None:
+        return not_modified
+    summary = await service.get_summary(date=date_filter, version=stamp.version)
+    response.headers.update(validator_headers(stamp, make_etag(stamp)))
+    return summary
 
 
-@router.get("/stats/visualization", response_model=SpendingVisualization)
+@router.get(
+    "/stats/visualization",
+    response_model=SpendingVisualization,
+    responses={304: {"description": NOT_MODIFIED_DESCRIPTION}}
+)
 async def get_spending_visualization(
+    request: Request,
+    response: Response,
     year: Optional[int] = None,
     month: Optional[int] = None,
     date: Optional[date] = Query(None, description="Optional date to filter by (YYYY-MM-DD format). Takes precedence over year/month."),
-    db: Session = Depends(get_db)
+    db: Union[AsyncSession, Session] = Depends(get_read_session)
 ):
     """
     Get categorized spending data with percentages for visualization.
@@ -120,19 +620,117 @@ async def get_spending_visualization(
     Returns categorized spending with percentages suitable for charts and graphs.
     """
     if date is None:
-        if month is not None and year is None:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Month filter requires year to be specified"
-            )
-        
-        if month is not None and (month < 1 or month > 12):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Month must be between 1 and 12"
-            )
-    
-    service = SpendingService(db)
+        _validate_year_month(year, month)
+    
+    service = AsyncSpendingService(db)
     date_filter = datetime.combine(date, datetime.min.time()) if date else None
-    return service.get_categorized_spending(year=year, month=month, date=date_filter)
+    window = rollup_day_range(year=year, month=month, date=date_filter) or (None, None)
+    stamp = await service.get_data_version(*window)
+    not_modified = _not_modified(request, stamp)
+    if not_modified is not None:
+        return not_modified
+    visualization = await service.get_categorized_spending(
+        year=year, month=month, date=date_filter, version=stamp.version
+    )
+    response.headers.update(validator_headers(stamp, make_etag(stamp)))
+    return visualization
 
+
+@router.get(
+    "/stats/timeseries",
+    response_model=SpendingTimeSeries,
+    responses={304: {"description": NOT_MODIFIED_DESCRIPTION}}
+)
+async def get_spending_timeseries(
+    request: Request,
+    response: Response,
+    from_date: date = Query(..., alias="from", description="First day included (YYYY-MM-DD format)"),
+    to_date: date = Query(..., alias="to", description="First day excluded (YYYY-MM-DD format)"),
+    bucket: TimeBucket = Query(TimeBucket.day, description="Bucket size: day, week or month"),
+    category: Optional[str] = Query(None, description="Optional exact category filter"),
+    db: Union[AsyncSession, Session] = Depends(get_read_session)
+):
+    """
+    Get spending totals per day, week or month in a single grouped query.
+    
+    - **from**/**to**: Half-open date range [from, to), e.g. `from=2025-01-01&to=2026-01-01` for 2025.
+    - **bucket**: `day` (default), `week` (starting Monday) or `month`.
+    - **category**: Optional exact category filter.
+    
+    Every bucket in the range is returned, with zero totals for empty ones.
+    """
+    if to_date <= from_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must be after 'from'"
+        )
+
+    service = AsyncSpendingService(db)
+    stamp = await service.get_data_version(from_date, to_date)
+    not_modified = _not_modified(request, stamp)
+    if not_modified is not None:
+        return not_modified
+    timeseries = await service.get_timeseries(from_date, to_date, bucket, category=category)
+    response.headers.update(validator_headers(stamp, make_etag(stamp)))
+    return timeseries
+
+
+@router.get(
+    "/stats/advanced",
+    response_model=AdvancedSpendingStats,
+    responses={304: {"description": NOT_MODIFIED_DESCRIPTION}}
+)
+async def get_spending_advanced_stats(
+    request: Request,
+    response: Response,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    date: Optional[date] = Query(None, description="Optional date to filter by (YYYY-MM-DD format). Takes precedence over year/month."),
+    category: Optional[str] = Query(None, description="Optional exact category filter"),
+    outliers: int = Query(20, ge=0, le=1000, description="Maximum number of outliers listed"),
+    db: Union[AsyncSession, Session] = Depends(get_read_session)
+):
+    """
+    Get distribution and trend statistics computed over an in-memory columnar snapshot.
+    
+    - **year**: Filter by year (e.g., 2025). Ignored if date is provided.
+    - **month**: Filter by month (1-12). Requires year to be specified. Ignored if date is provided.
+    - **date**: Optional date filter (YYYY-MM-DD format). If provided, takes precedence over year/month filters.
+    - **category**: Optional exact category filter.
+    - **outliers**: Maximum number of outliers listed (largest first).
+    
+    Returns amount percentiles, per-category medians, daily totals with rolling 7/30-day
+    averages, a day-of-week histogram and the spendings outside their category's
+    interquartile fences.
+    """
+    if date is None:
+        _validate_year_month(year, month)
+
+    service = AsyncSpendingService(db)
+    date_filter = datetime.combine(date, datetime.min.time()) if date else None
+    window = rollup_day_range(year=year, month=month, date=date_filter) or (None, None)
+    stamp = await service.get_data_version(*window)
+    # The snapshot may lag writes of other workers until it is reloaded, so its
+    # load time is part of the ETag: a reload lets clients fetch the fresh numbers
+    if snapshot_cache.loaded_at is not None:
+        not_modified = _not_modified(request, stamp, int(snapshot_cache.loaded_at * 1000))
+        if not_modified is not None:
+            return not_modified
+    stats = await service.get_advanced_stats(
+        year=year, month=month, date=date_filter, category=category, outlier_limit=outliers
+    )
+    response.headers.update(validator_headers(stamp, make_etag(stamp, int(snapshot_cache.loaded_at * 1000))))
+    return stats
+
+
+@router.get("/stats/cache")
+async def get_stats_cache():
+    """
+    Get stats cache counters.
+    
+    Returns the cache backend, this worker's hit and miss counters, and the number of cached results.
+    """
+    if stats_cache is None:
+        return {"backend": "none"}
+    # Counting entries is a round trip to Redis with the shared backend
+    return await run_in_threadpool(stats_cache.stats)
@@ -1,6 +1,28 @@
 """Pydantic schemas for data validation and serialization."""
 
-from app.schemas.spending import SpendingCreate, SpendingResponse, SpendingUpdate
+from app.schemas.spending import (
+    CategoryMatch,
+    SpendingBulkCreate,
+    SpendingBulkError,
+    SpendingBulkResponse,
+    SpendingCreate,
+    SpendingImportError,
+    SpendingImportResponse,
+    SpendingResponse,
+    SpendingSearchResult,
+    SpendingUpdate,
+)
 
-__all__ = ["SpendingCreate", "SpendingUpdate", "SpendingResponse"]
+__all__ = [
+    "CategoryMatch",
+    "SpendingCreate",
+    "SpendingUpdate",
+    "SpendingResponse",
+    "SpendingSearchResult",
+    "SpendingBulkCreate",
+    "SpendingBulkError",
+    "SpendingBulkResponse",
+    "SpendingImportError",
+    "SpendingImportResponse",
+]
 
@@ -0,0 +1,35 @@
+"""Schemas for aggregated spending statistics."""
+
+from datetime import date as DateType
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+from typing_extensions import NotRequired, TypedDict
+
+
+class CategoryTotal(BaseModel):
+    """Aggregated totals for a single category."""
+
+    amount: float = Field(..., description="Total amount spent in this category")
+    count: int = Field(..., description="Number of spending entries in this category")
+
+
+class SpendingAggregate(BaseModel):
+    """Aggregated spending totals computed by the storage layer."""
+
+    total_count: int = Field(..., description="Total number of spending entries")
+    total_amount: float = Field(..., description="Total amount of all spendings")
+    average_amount: float = Field(..., description="Average amount per spending entry")
+    by_category: Dict[str, CategoryTotal] = Field(
+        ..., description="Totals per category, ordered by amount (descending)"
+    )
+
+
+class SpendingSummary(TypedDict):
+    """Body of GET /spendings/stats/summary; date is only present when filtered by one."""
+
+    total_spendings: int
+    total_amount: float
+    by_category: Dict[str, float]
+    average_amount: float
+    date: NotRequired[Optional[DateType]]
@@ -0,0 +1,70 @@
+"""Schemas for the advanced (distribution and trend) spending statistics."""
+
+from datetime import date as DateType
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class CategoryDistribution(BaseModel):
+    """Amount distribution of a single category."""
+
+    category: str = Field(..., description="Category name")
+    count: int = Field(..., description="Number of spending entries in this category")
+    total_amount: float = Field(..., description="Total amount spent in this category")
+    average_amount: float = Field(..., description="Mean amount per spending entry")
+    median_amount: float = Field(..., description="Median amount per spending entry")
+    p90_amount: float = Field(..., description="90th percentile of the amounts")
+
+
+class DailyTrendPoint(BaseModel):
+    """Spending of one day with trailing averages."""
+
+    day: DateType = Field(..., description="Day")
+    amount: float = Field(..., description="Total amount spent on the day")
+    count: int = Field(..., description="Number of spending entries on the day")
+    rolling_7d: float = Field(..., description="Average daily amount over the 7 days ending on this day")
+    rolling_30d: float = Field(..., description="Average daily amount over the 30 days ending on this day")
+
+
+class WeekdayBucket(BaseModel):
+    """Spending on one day of the week."""
+
+    weekday: int = Field(..., description="Day of the week (0 = Monday, 6 = Sunday)")
+    name: str = Field(..., description="Name of the day")
+    count: int = Field(..., description="Number of spending entries")
+    amount: float = Field(..., description="Total amount spent")
+
+
+class SpendingOutlier(BaseModel):
+    """A spending far outside the usual range of its category."""
+
+    id: UUID = Field(..., description="Spending ID")
+    day: DateType = Field(..., description="Day of the spending")
+    category: str = Field(..., description="Category name")
+    amount: float = Field(..., description="Amount spent")
+    lower_fence: float = Field(..., description="Lowest usual amount for the category (Q1 - k * IQR)")
+    upper_fence: float = Field(..., description="Highest usual amount for the category (Q3 + k * IQR)")
+
+
+class AdvancedSpendingStats(BaseModel):
+    """Percentiles, per-category distributions, trends and outliers of the filtered spendings."""
+
+    total_count: int = Field(..., description="Total number of spending entries")
+    total_amount: float = Field(..., description="Total amount of all spendings")
+    average_amount: float = Field(..., description="Mean amount per spending entry")
+    percentiles: Dict[str, float] = Field(..., description="Amount percentiles (p50, p75, p90, p95, p99)")
+    categories: List[CategoryDistribution] = Field(
+        ..., description="Distribution per category, ordered by total amount (descending)"
+    )
+    daily: List[DailyTrendPoint] = Field(
+        ..., description="One point per day from the first to the last spending, empty days included"
+    )
+    weekdays: List[WeekdayBucket] = Field(..., description="Spending per day of the week, Monday first")
+    outlier_count: int = Field(..., description="Number of spendings outside their category's fences")
+    outliers: List[SpendingOutlier] = Field(..., description="Largest outliers, by amount (descending)")
+    year: Optional[int] = Field(None, description="Filter year (if applied)")
+    month: Optional[int] = Field(None, description="Filter month (if applied)")
+    date: Optional[DateType] = Field(None, description="Filter date (if applied)")
+    category: Optional[str] = Field(None, description="Filter category (if applied)")
@@ -0,0 +1,49 @@
+"""Schemas for budget-related data transfer objects."""
+
+from datetime import date as DateType
+from datetime import datetime
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.models.types import round_to_cents
+
+
+class BudgetCreate(BaseModel):
+    """DTO for setting a category's monthly limit."""
+
+    category: str = Field(..., min_length=1, description="Category the limit applies to")
+    monthly_limit: float = Field(..., gt=0, description="Maximum amount per calendar month (rounded to cents)")
+
+    _round_limit = field_validator("monthly_limit")(round_to_cents)
+
+
+class BudgetUpdate(BaseModel):
+    """DTO for changing a budget's monthly limit."""
+
+    monthly_limit: float = Field(..., gt=0, description="Maximum amount per calendar month (rounded to cents)")
+
+    _round_limit = field_validator("monthly_limit")(round_to_cents)
+
+
+class BudgetResponse(BaseModel):
+    """DTO for returning a budget."""
+
+    id: int
+    category: str
+    monthly_limit: float
+    created_at: datetime
+    updated_at: datetime
+
+
+class BudgetStatus(BaseModel):
+    """Spending of a budgeted category in one month, from the running monthly totals."""
+
+    budget_id: int = Field(..., description="Budget ID")
+    category: str = Field(..., description="Category name")
+    month: DateType = Field(..., description="First day of the month")
+    monthly_limit: float = Field(..., description="Maximum amount for the month")
+    spent: float = Field(..., description="Amount spent in the month so far")
+    remaining: float = Field(..., description="Amount left before the limit (negative when over)")
+    percent_used: float = Field(..., description="Spent amount as a percentage of the limit")
+    spending_count: int = Field(..., description="Number of spending entries in the month")
+    exceeded: bool = Field(..., description="Whether spending is over the limit")
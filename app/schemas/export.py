@@ -0,0 +1,10 @@
+"""Schemas for spending exports."""
+
+from enum import Enum
+
+
+class ExportFormat(str, Enum):
+    """Supported export file formats."""
+
+    csv = "csv"
+    ndjson = "ndjson"
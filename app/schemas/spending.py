@@ -1,29 +1,45 @@
 """Schemas for spending-related data transfer objects."""
 
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+from app.models.types import round_to_cents
+from app.schemas.budget import BudgetStatus
+
+
+class CategoryMatch(str, Enum):
+    """How a category filter is matched against category names."""
+
+    exact = "exact"
+    prefix = "prefix"
+    contains = "contains"
 
 
 class SpendingCreate(BaseModel):
     """DTO for creating a new spending entry."""
 
-    amount: float = Field(..., gt=0, description="Amount spent (must be positive)")
+    amount: float = Field(..., gt=0, description="Amount spent (must be positive, rounded to cents)")
     category: str = Field(..., min_length=1, description="Category of the spending")
     description: Optional[str] = Field(None, description="Optional description of the spending")
     date: Optional[datetime] = Field(default_factory=datetime.now, description="Date of the spending")
 
+    _round_amount = field_validator("amount")(round_to_cents)
+
 
 class SpendingUpdate(BaseModel):
     """DTO for updating an existing spending entry."""
 
-    amount: Optional[float] = Field(None, gt=0, description="Amount spent (must be positive)")
+    amount: Optional[float] = Field(None, gt=0, description="Amount spent (must be positive, rounded to cents)")
     category: Optional[str] = Field(None, min_length=1, description="Category of the spending")
     description: Optional[str] = Field(None, description="Description of the spending")
     date: Optional[datetime] = Field(None, description="Date of the spending")
 
+    _round_amount = field_validator("amount")(round_to_cents)
+
 
 class SpendingResponse(BaseModel):
     """DTO for returning spending information."""
@@ -38,3 +54,74 @@ class SpendingResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+class SpendingSearchResult(SpendingResponse):
+    """DTO for a spending found by full-text search."""
+
+    rank: float = Field(..., description="Relevance of the description to the query (higher is better)")
+
+
+class SpendingWriteResponse(SpendingResponse):
+    """DTO for returning a created or updated spending with its budget check."""
+
+    over_budget: bool = Field(
+        False, description="The write added to a category that is now over its monthly limit"
+    )
+    budget: Optional[BudgetStatus] = Field(
+        None, description="Budget status of the spending's category and month, if it has a budget"
+    )
+
+
+
+class SpendingBulkCreate(BaseModel):
+    """DTO for creating many spending entries in one request."""
+
+    spendings: List[Dict[str, Any]] = Field(
+        ..., description="Spendings to create, each in the SpendingCreate format"
+    )
+    atomic: bool = Field(
+        True,
+        description="Create all spendings or none. If false, invalid rows are reported and the rest are created"
+    )
+    return_rows: bool = Field(False, description="Echo the created spendings in the response")
+    batch_size: Optional[int] = Field(
+        None, gt=0, le=10000, description="Rows per INSERT batch (defaults to BULK_INSERT_BATCH_SIZE)"
+    )
+
+
+class SpendingBulkError(BaseModel):
+    """DTO describing a spending that could not be created."""
+
+    index: int = Field(..., description="Position of the spending in the request (0-based)")
+    detail: str = Field(..., description="Reason the spending was rejected")
+
+
+class SpendingBulkResponse(BaseModel):
+    """DTO for returning the outcome of a bulk create."""
+
+    created: int = Field(..., description="Number of spendings created")
+    failed: int = Field(..., description="Number of spendings rejected")
+    errors: List[SpendingBulkError] = Field(default_factory=list, description="Rejected spendings")
+    spendings: Optional[List[SpendingResponse]] = Field(
+        None, description="Created spendings (only if return_rows was requested)"
+    )
+
+
+class SpendingImportError(BaseModel):
+    """DTO describing a CSV line that could not be imported."""
+
+    line: int = Field(..., description="Line number in the uploaded file (the header is line 1)")
+    detail: str = Field(..., description="Reason the line was rejected")
+
+
+class SpendingImportResponse(BaseModel):
+    """DTO for returning the outcome of a CSV import."""
+
+    total_rows: int = Field(..., description="Number of data rows read from the file")
+    created: int = Field(..., description="Number of spendings created")
+    rejected: int = Field(..., description="Number of rows rejected")
+    rejected_lines: List[int] = Field(default_factory=list, description="Line numbers of all rejected rows")
+    errors: List[SpendingImportError] = Field(
+        default_factory=list, description="Details for the first rejected rows"
+    )
+
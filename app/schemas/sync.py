@@ -0,0 +1,34 @@
+"""Schemas for the spending change feed."""
+
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.schemas.spending import SpendingResponse
+
+
+class ChangeAction(str, Enum):
+    """What happened to a spending since the client's token."""
+
+    upserted = "upserted"
+    deleted = "deleted"
+
+
+class SpendingChangeEntry(BaseModel):
+    """Latest state of one changed spending."""
+
+    action: ChangeAction = Field(..., description="upserted (created or updated) or deleted")
+    id: UUID = Field(..., description="Spending ID")
+    changed_at: datetime = Field(..., description="When the change was written (UTC, database clock)")
+    spending: Optional[SpendingResponse] = Field(None, description="Current spending (absent when deleted)")
+
+
+class SpendingChanges(BaseModel):
+    """One page of the change feed."""
+
+    changes: List[SpendingChangeEntry] = Field(..., description="Changes in the order they were written")
+    next_token: str = Field(..., description="Token to pass as `since` in the next request")
+    has_more: bool = Field(..., description="More changes are available right away with next_token")
@@ -1,6 +1,7 @@
 """Schemas for spending visualization data."""
 
 from datetime import date as DateType
+from enum import Enum
 from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
@@ -27,3 +28,32 @@ class SpendingVisualization(BaseModel):
         ..., description="List of spending by category with percentages"
     )
 
+
+
+
+class TimeBucket(str, Enum):
+    """Bucket size for time-series stats."""
+
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+class TimeSeriesPoint(BaseModel):
+    """Spending totals for a single time bucket."""
+
+    start: DateType = Field(..., description="First day of the bucket")
+    amount: float = Field(..., description="Total amount spent in the bucket")
+    count: int = Field(..., description="Number of spending entries in the bucket")
+
+
+class SpendingTimeSeries(BaseModel):
+    """Spending totals per time bucket."""
+
+    bucket: TimeBucket = Field(..., description="Bucket size")
+    from_date: DateType = Field(..., description="First day included")
+    to_date: DateType = Field(..., description="First day excluded")
+    category: Optional[str] = Field(None, description="Category filter (if applied)")
+    total_amount: float = Field(..., description="Total amount over all buckets")
+    total_count: int = Field(..., description="Total number of spending entries over all buckets")
+    points: List[TimeSeriesPoint] = Field(..., description="One point per bucket, including empty ones")
@@ -1,6 +1,7 @@
 """Business logic layer."""
 
+from app.services.async_spending_service import AsyncSpendingService
 from app.services.spending_service import SpendingService
 
-__all__ = ["SpendingService"]
+__all__ = ["SpendingService", "AsyncSpendingService"]
 
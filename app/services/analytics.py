@@ -0,0 +1,350 @@
+"""Columnar (NumPy) analytics behind GET /spendings/stats/advanced."""
+
+import os
+import threading
+import time
+from calendar import day_name
+from typing import Callable, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from app.models.types import to_cents
+from app.schemas.analytics import (
+    AdvancedSpendingStats,
+    CategoryDistribution,
+    DailyTrendPoint,
+    SpendingOutlier,
+    WeekdayBucket,
+)
+from app.storage.events import SpendingChange, add_change_listener
+from app.storage.rollups import DayRange
+
+# Seconds before the snapshot is reloaded from the database. Writes made by
+# this process are applied as they happen; the reload picks up other workers'.
+ANALYTICS_SNAPSHOT_TTL = float(os.getenv("ANALYTICS_SNAPSHOT_TTL", "300"))
+
+# Tukey fence multiplier: outliers lie beyond Q1 - k * IQR or Q3 + k * IQR of their category
+ANALYTICS_OUTLIER_IQR_FACTOR = float(os.getenv("ANALYTICS_OUTLIER_IQR_FACTOR", "1.5"))
+
+# Categories with fewer spendings than this are not checked for outliers
+ANALYTICS_OUTLIER_MIN_COUNT = int(os.getenv("ANALYTICS_OUTLIER_MIN_COUNT", "8"))
+
+PERCENTILES = (50, 75, 90, 95, 99)
+
+# Spending ids are kept as their 16 raw bytes
+ID_DTYPE = np.dtype("V16")
+
+# 1970-01-01, day 0 of datetime64[D], was a Thursday
+_EPOCH_WEEKDAY = 3
+
+
+class ColumnarSnapshot(NamedTuple):
+    """
+    Every spending as parallel NumPy arrays.
+
+    Snapshots are immutable; applying changes builds a new one, so requests
+    can keep computing on the snapshot they started with.
+    """
+
+    ids: np.ndarray  # V16 raw UUID bytes
+    days: np.ndarray  # datetime64[D]
+    category_codes: np.ndarray  # int32 index into categories
+    amounts: np.ndarray  # int64 cents
+    categories: Tuple[str, ...]
+
+    @classmethod
+    def from_batches(
+        cls,
+        batches: Iterable[Sequence[Tuple]],
+        category_name: Callable[[int], str]
+    ) -> "ColumnarSnapshot":
+        """Build a snapshot from (id, date, category_id, amount in cents) row batches."""
+        ids, days, category_ids, amounts = [], [], [], []
+        for batch in batches:
+            if not batch:
+                continue
+            batch_ids, batch_dates, batch_category_ids, batch_amounts = zip(*batch)
+            ids.append(np.frombuffer(b"".join(spending_id.bytes for spending_id in batch_ids), dtype=ID_DTYPE))
+            days.append(np.array(batch_dates, dtype="datetime64[D]"))
+            category_ids.append(np.array(batch_category_ids, dtype=np.int64))
+            amounts.append(np.array(batch_amounts, dtype=np.int64))
+        if not ids:
+            return cls.empty()
+
+        unique_ids, codes = np.unique(np.concatenate(category_ids), return_inverse=True)
+        return cls(
+            ids=np.concatenate(ids),
+            days=np.concatenate(days),
+            category_codes=codes.astype(np.int32),
+            amounts=np.concatenate(amounts),
+            categories=tuple(category_name(int(category_id)) for category_id in unique_ids)
+        )
+
+    @classmethod
+    def empty(cls) -> "ColumnarSnapshot":
+        """Get a snapshot without spendings."""
+        return cls(
+            ids=np.empty(0, dtype=ID_DTYPE),
+            days=np.empty(0, dtype="datetime64[D]"),
+            category_codes=np.empty(0, dtype=np.int32),
+            amounts=np.empty(0, dtype=np.int64),
+            categories=()
+        )
+
+    def apply(self, changes: List[SpendingChange]) -> "ColumnarSnapshot":
+        """
+        Get a snapshot with the changes applied.
+
+        Every touched id is removed and its latest version (if not deleted)
+        appended, so applying a change the snapshot already has is harmless.
+        """
+        latest = {}
+        for change in changes:
+            spending = change.new if change.new is not None else change.old
+            latest[spending.id] = change.new
+        touched = np.frombuffer(b"".join(spending_id.bytes for spending_id in latest), dtype=ID_DTYPE)
+        keep = ~np.isin(self.ids, touched)
+
+        added = [spending for spending in latest.values() if spending is not None]
+        categories = list(self.categories)
+        codes = {name: code for code, name in enumerate(categories)}
+        for spending in added:
+            if spending.category not in codes:
+                codes[spending.category] = len(categories)
+                categories.append(spending.category)
+
+        return ColumnarSnapshot(
+            ids=np.concatenate([
+                self.ids[keep],
+                np.frombuffer(b"".join(spending.id.bytes for spending in added), dtype=ID_DTYPE)
+            ]),
+            days=np.concatenate([
+                self.days[keep], np.array([spending.date for spending in added], dtype="datetime64[D]")
+            ]),
+            category_codes=np.concatenate([
+                self.category_codes[keep],
+                np.array([codes[spending.category] for spending in added], dtype=np.int32)
+            ]),
+            amounts=np.concatenate([
+                self.amounts[keep],
+                np.array([to_cents(spending.amount) for spending in added], dtype=np.int64)
+            ]),
+            categories=tuple(categories)
+        )
+
+
+class SnapshotCache:
+    """
+    Keeps the columnar snapshot in memory and applies committed writes to it.
+
+    Changes published by this process are queued and applied on the next
+    read; the snapshot is reloaded from the database after the TTL.
+    """
+
+    def __init__(self, ttl: float = ANALYTICS_SNAPSHOT_TTL):
+        self.ttl = ttl
+        self._snapshot: Optional[ColumnarSnapshot] = None
+        self._loaded_at = 0.0
+        # Wall-clock load time of the current snapshot, for ETags (None until loaded)
+        self.loaded_at: Optional[float] = None
+        self._tracking = False
+        self._pending: List[SpendingChange] = []
+        self._load_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+
+    def get(self, load: Callable[[], ColumnarSnapshot]) -> ColumnarSnapshot:
+        """Get the current snapshot, loading it (in one bulk fetch) if missing or expired."""
+        with self._load_lock:
+            if self._snapshot is None or time.monotonic() - self._loaded_at >= self.ttl:
+                with self._pending_lock:
+                    # Changes committed from here on may or may not be in the load;
+                    # replaying them afterwards is idempotent
+                    self._pending = []
+                    self._tracking = True
+                self._loaded_at = time.monotonic()
+                self.loaded_at = time.time()
+                try:
+                    self._snapshot = load()
+                except Exception:
+                    self.clear()
+                    raise
+
+            with self._pending_lock:
+                pending, self._pending = self._pending, []
+            if pending:
+                self._snapshot = self._snapshot.apply(pending)
+            return self._snapshot
+
+    def on_changes(self, changes: List[SpendingChange]) -> None:
+        """Queue committed changes for the next read (no-op before the first load)."""
+        with self._pending_lock:
+            if self._tracking:
+                self._pending.extend(changes)
+
+    def clear(self) -> None:
+        """Drop the snapshot; the next read reloads it."""
+        with self._pending_lock:
+            self._tracking = False
+            self._pending = []
+        self._snapshot = None
+        self.loaded_at = None
+
+
+snapshot_cache = SnapshotCache()
+add_change_listener(snapshot_cache.on_changes)
+
+
+def _group_quantile(sorted_values: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """Linearly interpolated quantile of each group of a group-wise sorted array."""
+    position = starts + (counts - 1) * q
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, starts + counts - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over `window` entries (fewer at the start)."""
+    cumulative = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, 0)
+    return (cumulative[ends] - cumulative[starts]) / (ends - starts)
+
+
+def _cents(value) -> float:
+    return round(float(value) / 100, 2)
+
+
+def compute_advanced_stats(
+    snapshot: ColumnarSnapshot,
+    day_range: DayRange = (None, None),
+    category: Optional[str] = None,
+    outlier_limit: int = 20
+) -> AdvancedSpendingStats:
+    """
+    Compute the advanced stats of the spendings in [start, end) (and category).
+
+    Everything is vectorized over the snapshot columns: groups come from one
+    lexsort by (category, amount), daily and weekday totals from bincount.
+    """
+    start, end = day_range
+    mask = np.ones(len(snapshot.amounts), dtype=bool)
+    if start is not None:
+        mask &= snapshot.days >= np.datetime64(start, "D")
+    if end is not None:
+        mask &= snapshot.days < np.datetime64(end, "D")
+    if category is not None:
+        code = snapshot.categories.index(category) if category in snapshot.categories else -1
+        mask &= snapshot.category_codes == code
+
+    ids = snapshot.ids[mask]
+    days = snapshot.days[mask]
+    codes = snapshot.category_codes[mask]
+    amounts = snapshot.amounts[mask]
+    count = len(amounts)
+    if not count:
+        return AdvancedSpendingStats(
+            total_count=0,
+            total_amount=0.0,
+            average_amount=0.0,
+            percentiles={f"p{p}": 0.0 for p in PERCENTILES},
+            categories=[],
+            daily=[],
+            weekdays=[
+                WeekdayBucket(weekday=weekday, name=day_name[weekday], count=0, amount=0.0)
+                for weekday in range(7)
+            ],
+            outlier_count=0,
+            outliers=[]
+        )
+
+    total = int(amounts.sum())
+    percentiles = np.percentile(amounts, PERCENTILES)
+
+    # Per-category distributions from one sort by (category, amount)
+    order = np.lexsort((amounts, codes))
+    sorted_amounts = amounts[order].astype(np.float64)
+    group_codes, starts, counts = np.unique(codes[order], return_index=True, return_counts=True)
+    totals = np.add.reduceat(amounts[order], starts)
+    medians = _group_quantile(sorted_amounts, starts, counts, 0.5)
+    p90s = _group_quantile(sorted_amounts, starts, counts, 0.9)
+    q1 = _group_quantile(sorted_amounts, starts, counts, 0.25)
+    q3 = _group_quantile(sorted_amounts, starts, counts, 0.75)
+    categories = [
+        CategoryDistribution(
+            category=snapshot.categories[group_codes[i]],
+            count=int(counts[i]),
+            total_amount=_cents(totals[i]),
+            average_amount=_cents(totals[i] / counts[i]),
+            median_amount=_cents(medians[i]),
+            p90_amount=_cents(p90s[i])
+        )
+        for i in np.argsort(-totals, kind="stable")
+    ]
+
+    # Daily totals over the covered days, empty days included
+    first_day = days.min()
+    offsets = (days - first_day).astype(np.int64)
+    day_count = int(offsets.max()) + 1
+    daily_amounts = np.bincount(offsets, weights=amounts, minlength=day_count)
+    daily_counts = np.bincount(offsets, minlength=day_count)
+    rolling_7d = _rolling_mean(daily_amounts, 7)
+    rolling_30d = _rolling_mean(daily_amounts, 30)
+    daily = [
+        DailyTrendPoint(
+            day=(first_day + offset).item(),
+            amount=_cents(daily_amounts[offset]),
+            count=int(daily_counts[offset]),
+            rolling_7d=_cents(rolling_7d[offset]),
+            rolling_30d=_cents(rolling_30d[offset])
+        )
+        for offset in range(day_count)
+    ]
+
+    weekday_of = (days.astype(np.int64) + _EPOCH_WEEKDAY) % 7
+    weekday_counts = np.bincount(weekday_of, minlength=7)
+    weekday_amounts = np.bincount(weekday_of, weights=amounts, minlength=7)
+    weekdays = [
+        WeekdayBucket(
+            weekday=weekday,
+            name=day_name[weekday],
+            count=int(weekday_counts[weekday]),
+            amount=_cents(weekday_amounts[weekday])
+        )
+        for weekday in range(7)
+    ]
+
+    # Tukey fences per category, mapped back onto every row
+    spread = ANALYTICS_OUTLIER_IQR_FACTOR * (q3 - q1)
+    lower_fences, upper_fences = q1 - spread, q3 + spread
+    group_of = np.searchsorted(group_codes, codes)
+    is_outlier = (
+        (counts[group_of] >= ANALYTICS_OUTLIER_MIN_COUNT)
+        & ((amounts < lower_fences[group_of]) | (amounts > upper_fences[group_of]))
+    )
+    outlier_rows = np.flatnonzero(is_outlier)
+    top = outlier_rows[np.argsort(-amounts[outlier_rows], kind="stable")[:outlier_limit]]
+    outliers = [
+        SpendingOutlier(
+            id=UUID(bytes=ids[row].tobytes()),
+            day=days[row].item(),
+            category=snapshot.categories[codes[row]],
+            amount=_cents(amounts[row]),
+            lower_fence=_cents(lower_fences[group_of[row]]),
+            upper_fence=_cents(upper_fences[group_of[row]])
+        )
+        for row in top
+    ]
+
+    return AdvancedSpendingStats(
+        total_count=count,
+        total_amount=_cents(total),
+        average_amount=_cents(total / count),
+        percentiles={f"p{p}": _cents(value) for p, value in zip(PERCENTILES, percentiles)},
+        categories=categories,
+        daily=daily,
+        weekdays=weekdays,
+        outlier_count=len(outlier_rows),
+        outliers=outliers
+    )
@@ -0,0 +1,248 @@
+"""Async service layer for spending business logic."""
+
+from datetime import date as DateType
+from datetime import datetime
+from typing import AsyncIterator, BinaryIO, Dict, List, Optional, Tuple, Union
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import iterate_in_threadpool
+
+from app.schemas.aggregate import SpendingAggregate, SpendingSummary
+from app.schemas.analytics import AdvancedSpendingStats
+from app.schemas.export import ExportFormat
+from app.schemas.spending import (
+    CategoryMatch,
+    SpendingBulkCreate,
+    SpendingBulkResponse,
+    SpendingCreate,
+    SpendingImportResponse,
+    SpendingResponse,
+    SpendingSearchResult,
+    SpendingUpdate,
+    SpendingWriteResponse,
+)
+from app.schemas.sync import SpendingChanges
+from app.schemas.visualization import SpendingTimeSeries, SpendingVisualization, TimeBucket
+from app.services.csv_import import CsvImportReport, iter_csv_batches
+from app.services.export import encode_rows, export_header
+from app.services.spending_service import SpendingService, summary_cache_entry, visualization_cache_entry
+from app.services.stats_cache import stats_cache
+from app.services.write_buffer import write_buffer
+from app.storage.async_database import AsyncDatabaseStorage
+from app.storage.database import BULK_INSERT_BATCH_SIZE
+from app.storage.versions import VersionStamp
+
+
+class AsyncSpendingService:
+    """
+    Async service for managing spending operations.
+
+    Each call runs the matching SpendingService method as one unit of work
+    through AsyncDatabaseStorage, so request handlers can await it whether
+    the session is an AsyncSession (DB_ASYNC) or a sync Session.
+    """
+
+    def __init__(self, db: Union[AsyncSession, Session]):
+        self.storage = AsyncDatabaseStorage(db)
+
+    async def _call(self, method: str, *args, **kwargs):
+        """Call a SpendingService method without blocking the event loop."""
+        return await self.storage.run(
+            lambda session: getattr(SpendingService(session), method)(*args, **kwargs)
+        )
+
+    async def create_spending(self, spending_data: SpendingCreate) -> SpendingWriteResponse:
+        """
+        Create a new spending entry.
+
+        With GROUP_COMMIT_ENABLED the spending is committed together with other
+        concurrent creates by the write buffer.
+
+        Raises:
+            WriteBufferFull: If the write buffer queue is at capacity.
+            SpendingRejected: If the database rejected the grouped spending.
+            WriteFailed: If the group commit failed.
+        """
+        if write_buffer is not None:
+            return await write_buffer.submit(SpendingService.new_spending(spending_data))
+        return await self._call("create_spending", spending_data)
+
+    async def create_spendings_bulk(self, bulk: SpendingBulkCreate) -> SpendingBulkResponse:
+        """Create many spending entries in batches."""
+        return await self._call("create_spendings_bulk", bulk)
+
+    async def import_spendings_csv(
+        self,
+        file: BinaryIO,
+        batch_size: int = BULK_INSERT_BATCH_SIZE
+    ) -> SpendingImportResponse:
+        """
+        Import spendings from a CSV file, parsing and inserting batch by batch.
+
+        Parsing runs in the threadpool so large uploads never block the event loop.
+        """
+        report = CsvImportReport()
+        async for batch in iterate_in_threadpool(iter_csv_batches(file, batch_size)):
+            failed = await self.storage.bulk_create(
+                batch.spendings, batch_size=batch_size, atomic=False
+            )
+            report.add(batch, failed)
+        return report.to_response()
+
+    async def get_spendings_page_json(
+        self,
+        category: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        cursor: Optional[str] = None,
+        category_match: CategoryMatch = CategoryMatch.contains
+    ) -> Tuple[bytes, Optional[str]]:
+        """Get one page of spendings encoded as JSON, and the next cursor."""
+        return await self._call(
+            "get_spendings_page_json",
+            category=category,
+            limit=limit,
+            skip=skip,
+            cursor=cursor,
+            category_match=category_match
+        )
+
+    async def search_spendings(
+        self,
+        q: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        category: Optional[str] = None,
+        category_match: CategoryMatch = CategoryMatch.contains,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        date: Optional[datetime] = None
+    ) -> Tuple[List[SpendingSearchResult], Optional[str]]:
+        """Search spending descriptions, best matches first, and get the next cursor."""
+        return await self._call(
+            "search_spendings",
+            q,
+            limit=limit,
+            cursor=cursor,
+            category=category,
+            category_match=category_match,
+            year=year,
+            month=month,
+            date=date
+        )
+
+    async def export_spendings(
+        self,
+        export_format: ExportFormat,
+        category: Optional[str] = None,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        date: Optional[datetime] = None,
+        category_match: CategoryMatch = CategoryMatch.contains
+    ) -> AsyncIterator[bytes]:
+        """Export spendings as CSV or NDJSON, one encoded chunk per fetched batch."""
+        header = export_header(export_format)
+        if header:
+            yield header
+        async for rows in self.storage.stream_export_rows(
+            category=category, year=year, month=month, date=date, category_match=category_match
+        ):
+            yield encode_rows(rows, export_format)
+
+    async def get_spending_by_id(self, spending_id: UUID) -> Optional[SpendingResponse]:
+        """Get a spending by ID."""
+        return await self._call("get_spending_by_id", spending_id)
+
+    async def get_changes(self, since: Optional[str] = None, limit: int = 500) -> SpendingChanges:
+        """Get spendings created, updated or deleted after a change token."""
+        return await self._call("get_changes", since, limit)
+
+    async def update_spending(
+        self,
+        spending_id: UUID,
+        spending_update: SpendingUpdate
+    ) -> Optional[SpendingWriteResponse]:
+        """Update an existing spending entry."""
+        return await self._call("update_spending", spending_id, spending_update)
+
+    async def delete_spending(self, spending_id: UUID) -> bool:
+        """Delete a spending entry."""
+        return await self._call("delete_spending", spending_id)
+
+    async def get_summary(self, date: Optional[datetime] = None, version: Optional[int] = None) -> Dict:
+        """
+        Get summary statistics of all spendings.
+
+        The stats cache is read here rather than inside the session's unit of
+        work, which runs on the event loop with an AsyncSession.
+        """
+        if stats_cache is None:
+            return await self._call("get_summary", date=date, version=version)
+        key, window = summary_cache_entry(date, version)
+        return await stats_cache.get_or_compute_async(
+            key, window, lambda: self._call("_compute_summary", date), SpendingSummary
+        )
+
+    async def get_data_version(
+        self,
+        start: Optional[DateType] = None,
+        end: Optional[DateType] = None
+    ) -> VersionStamp:
+        """Get the data version of spendings dated in [start, end)."""
+        return await self._call("get_data_version", start, end)
+
+    async def get_timeseries(
+        self,
+        start: DateType,
+        end: DateType,
+        bucket: TimeBucket,
+        category: Optional[str] = None
+    ) -> SpendingTimeSeries:
+        """Get spending totals per day, week or month."""
+        return await self._call("get_timeseries", start, end, bucket, category=category)
+
+    async def get_advanced_stats(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        date: Optional[datetime] = None,
+        category: Optional[str] = None,
+        outlier_limit: int = 20
+    ) -> AdvancedSpendingStats:
+        """Get percentiles, category distributions, trends and outliers."""
+        return await self._call(
+            "get_advanced_stats",
+            year=year,
+            month=month,
+            date=date,
+            category=category,
+            outlier_limit=outlier_limit
+        )
+
+    async def get_categorized_spending(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        date: Optional[datetime] = None,
+        version: Optional[int] = None
+    ) -> SpendingVisualization:
+        """Calculate categorized spending with percentages for visualization (cached like get_summary)."""
+        if stats_cache is None:
+            return await self._call("get_categorized_spending", year=year, month=month, date=date)
+        key, window = visualization_cache_entry(year, month, date, version)
+        return await stats_cache.get_or_compute_async(
+            key,
+            window,
+            lambda: self._call("_compute_categorized_spending", year=year, month=month, date=date),
+            SpendingVisualization
+        )
+
+    async def get_aggregate_snapshot(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None
+    ) -> Tuple[SpendingAggregate, Dict[DateType, int]]:
+        """Get the per-category aggregate of a year/month together with its months' data versions."""
+        return await self._call("get_aggregate_snapshot", year=year, month=month)
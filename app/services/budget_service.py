@@ -0,0 +1,111 @@
+"""Service layer for budget business logic."""
+
+from datetime import date as DateType
+from typing import List, Optional, Union
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.schemas.budget import BudgetCreate, BudgetResponse, BudgetStatus, BudgetUpdate
+from app.storage.async_database import AsyncDatabaseStorage
+from app.storage.budgets import BudgetStorage
+from app.storage.rollups import month_start
+
+
+class BudgetExists(Exception):
+    """Raised when creating a budget for a category that already has one."""
+
+
+class BudgetService:
+    """Service for managing budgets."""
+
+    def __init__(self, db: Session):
+        self.storage = BudgetStorage(db)
+
+    def list_budgets(self) -> List[BudgetResponse]:
+        """Get all budgets."""
+        return self.storage.get_all()
+
+    def get_budget(self, budget_id: int) -> Optional[BudgetResponse]:
+        """Get a budget by ID."""
+        return self.storage.get_by_id(budget_id)
+
+    def create_budget(self, budget: BudgetCreate) -> BudgetResponse:
+        """
+        Set the monthly limit of a category.
+
+        Raises:
+            BudgetExists: If the category already has a budget.
+        """
+        existing = self.storage.get_by_category(budget.category)
+        if existing is not None:
+            raise BudgetExists(f"Category {budget.category!r} already has budget {existing.id}")
+        try:
+            return self.storage.create(budget.category, budget.monthly_limit)
+        except IntegrityError:
+            # A concurrent create for the same category won the unique constraint
+            self.storage.db.rollback()
+            existing = self.storage.get_by_category(budget.category)
+            if existing is None:
+                raise
+            raise BudgetExists(f"Category {budget.category!r} already has budget {existing.id}")
+
+    def update_budget(self, budget_id: int, budget: BudgetUpdate) -> Optional[BudgetResponse]:
+        """Change the monthly limit of a budget."""
+        return self.storage.update(budget_id, budget.monthly_limit)
+
+    def delete_budget(self, budget_id: int) -> bool:
+        """Delete a budget."""
+        return self.storage.delete(budget_id)
+
+    def get_status(self, month: Optional[DateType] = None, category: Optional[str] = None) -> List[BudgetStatus]:
+        """
+        Get spent and remaining amounts of every budget for a month.
+
+        Args:
+            month: Any day of the month (defaults to the current month).
+            category: Optional exact category filter.
+        """
+        return self.storage.get_status(month_start(month or DateType.today()), category=category)
+
+
+class AsyncBudgetService:
+    """Runs BudgetService methods without blocking the event loop."""
+
+    def __init__(self, db: Union[AsyncSession, Session]):
+        self.storage = AsyncDatabaseStorage(db)
+
+    async def _call(self, method: str, *args, **kwargs):
+        """Call a BudgetService method as one unit of work."""
+        return await self.storage.run(
+            lambda session: getattr(BudgetService(session), method)(*args, **kwargs)
+        )
+
+    async def list_budgets(self) -> List[BudgetResponse]:
+        """Get all budgets."""
+        return await self._call("list_budgets")
+
+    async def get_budget(self, budget_id: int) -> Optional[BudgetResponse]:
+        """Get a budget by ID."""
+        return await self._call("get_budget", budget_id)
+
+    async def create_budget(self, budget: BudgetCreate) -> BudgetResponse:
+        """Set the monthly limit of a category."""
+        return await self._call("create_budget", budget)
+
+    async def update_budget(self, budget_id: int, budget: BudgetUpdate) -> Optional[BudgetResponse]:
+        """Change the monthly limit of a budget."""
+        return await self._call("update_budget", budget_id, budget)
+
+    async def delete_budget(self, budget_id: int) -> bool:
+        """Delete a budget."""
+        return await self._call("delete_budget", budget_id)
+
+    async def get_status(
+        self,
+        month: Optional[DateType] = None,
+        category: Optional[str] = None
+    ) -> List[BudgetStatus]:
+        """Get spent and remaining amounts of every budget for a month."""
+        return await self._call("get_status", month=month, category=category)
@@ -0,0 +1,38 @@
+"""ETag and Last-Modified validators for conditional GETs, derived from data versions."""
+
+from datetime import timezone
+from email.utils import format_datetime
+from typing import Dict, Optional
+
+from app.storage.versions import VersionStamp
+
+
+def make_etag(stamp: VersionStamp, *extra: object) -> str:
+    """
+    Build a weak ETag from a data version (and anything else the body depends on).
+
+    The latest write time is part of the tag, so a version sum that comes
+    back after counters were reset (a restored database) is not mistaken
+    for the one a client cached.
+    """
+    written = int(stamp.updated_at.timestamp() * 1_000_000) if stamp.updated_at else 0
+    return 'W/"' + "-".join(str(part) for part in (stamp.version, written, *extra)) + '"'
+
+
+def validator_headers(stamp: VersionStamp, etag: str) -> Dict[str, str]:
+    """ETag, Last-Modified and a Cache-Control asking clients to revalidate before reuse."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if stamp.updated_at is not None:
+        # Versions are written with naive local timestamps
+        headers["Last-Modified"] = format_datetime(stamp.updated_at.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches the ETag (weak comparison, as for GET)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
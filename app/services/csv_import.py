@@ -0,0 +1,120 @@
+"""Incremental parsing of spending CSV uploads."""
+
+import csv
+import io
+from datetime import datetime
+from typing import BinaryIO, Iterator, List, NamedTuple, Tuple
+
+from pydantic import ValidationError
+
+from app.schemas.spending import SpendingImportError, SpendingImportResponse, SpendingResponse
+from app.services.validation import format_validation_error, validate_new_spending
+
+# CSV columns mapped onto SpendingCreate; any other column (e.g. id/created_at
+# from an export) is ignored
+IMPORT_COLUMNS = ("amount", "category", "description", "date")
+REQUIRED_COLUMNS = ("amount", "category")
+
+# Rejected rows reported with a reason; further rejections only list their line number
+MAX_ERROR_DETAILS = 100
+
+
+class CsvImportBatch(NamedTuple):
+    """One batch of parsed CSV rows."""
+
+    spendings: List[SpendingResponse]
+    lines: List[int]
+    errors: List[Tuple[int, str]]
+    total_rows: int
+
+
+def iter_csv_batches(file: BinaryIO, batch_size: int) -> Iterator[CsvImportBatch]:
+    """
+    Parse a spending CSV upload incrementally.
+
+    Rows are read one at a time from the file object and validated against
+    SpendingCreate, so memory is bounded by batch_size rather than file size.
+
+    Args:
+        file: Binary file object with a header row.
+        batch_size: Number of valid spendings per yielded batch.
+
+    Yields:
+        CsvImportBatch with the valid spendings and their line numbers, plus
+        (line, error) for rows rejected by validation.
+
+    Raises:
+        ValueError: If the header is missing a required column or the file is not UTF-8.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        header = [name.strip() for name in reader.fieldnames or []]
+        missing = [column for column in REQUIRED_COLUMNS if column not in header]
+        if missing:
+            raise ValueError(f"CSV header is missing required columns: {', '.join(missing)}")
+        reader.fieldnames = header
+
+        created_at = datetime.now()
+        spendings: List[SpendingResponse] = []
+        lines: List[int] = []
+        errors: List[Tuple[int, str]] = []
+        total_rows = 0
+        for row in reader:
+            total_rows += 1
+            item = {
+                column: row[column].strip()
+                for column in IMPORT_COLUMNS
+                if row.get(column) and row[column].strip()
+            }
+            try:
+                spendings.append(validate_new_spending(item, created_at))
+                lines.append(reader.line_num)
+            except ValidationError as exc:
+                errors.append((reader.line_num, format_validation_error(exc)))
+
+            if len(spendings) >= batch_size:
+                yield CsvImportBatch(spendings, lines, errors, total_rows)
+                spendings, lines, errors, total_rows = [], [], [], 0
+
+        if spendings or errors or total_rows:
+            yield CsvImportBatch(spendings, lines, errors, total_rows)
+    finally:
+        # Leave the underlying upload open for its owner to close
+        text.detach()
+
+
+class CsvImportReport:
+    """Accumulates the outcome of an import across batches."""
+
+    def __init__(self):
+        self.total_rows = 0
+        self.created = 0
+        self.rejected_lines: List[int] = []
+        self.errors: List[Tuple[int, str]] = []
+
+    def add(self, batch: CsvImportBatch, failed: List[Tuple[int, str]]) -> None:
+        """
+        Record a processed batch.
+
+        Args:
+            batch: The parsed batch.
+            failed: (position in batch.spendings, error) for rows the database rejected.
+        """
+        self.total_rows += batch.total_rows
+        self.created += len(batch.spendings) - len(failed)
+        rejected = sorted(batch.errors + [(batch.lines[position], detail) for position, detail in failed])
+        self.rejected_lines.extend(line for line, _ in rejected)
+        # Only the first rejections keep their reason, so a badly broken file
+        # does not hold a detail string per line in memory
+        self.errors.extend(rejected[:MAX_ERROR_DETAILS - len(self.errors)])
+
+    def to_response(self) -> SpendingImportResponse:
+        """Build the API response."""
+        return SpendingImportResponse(
+            total_rows=self.total_rows,
+            created=self.created,
+            rejected=len(self.rejected_lines),
+            rejected_lines=self.rejected_lines,
+            errors=[SpendingImportError(line=line, detail=detail) for line, detail in self.errors]
+        )
@@ -0,0 +1,48 @@
+"""Encoding of exported spending rows."""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Iterable, Sequence
+from uuid import UUID
+
+from app.schemas.export import ExportFormat
+
+# Column order of exported rows (matches SpendingResponse)
+EXPORT_COLUMNS = ("id", "amount", "category", "description", "date", "created_at")
+
+MEDIA_TYPES = {
+    ExportFormat.csv: "text/csv",
+    ExportFormat.ndjson: "application/x-ndjson",
+}
+
+
+def export_header(export_format: ExportFormat) -> bytes:
+    """Get the bytes written before the first row."""
+    if export_format == ExportFormat.csv:
+        return (",".join(EXPORT_COLUMNS) + "\r\n").encode()
+    return b""
+
+
+def encode_rows(rows: Iterable[Sequence[Any]], export_format: ExportFormat) -> bytes:
+    """Encode a batch of (id, amount, category, description, date, created_at) rows."""
+    if export_format == ExportFormat.csv:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows([_export_value(value) for value in row] for row in rows)
+        return buffer.getvalue().encode()
+
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, (_export_value(value) for value in row)))) + "\n"
+        for row in rows
+    ).encode()
+
+
+def _export_value(value: Any) -> Any:
+    """Convert a column value to its exported representation."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
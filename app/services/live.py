@@ -0,0 +1,526 @@
+"""Live spending changes and push-updated aggregates for the stream endpoints."""
+
+import asyncio
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from datetime import date as DateType
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.models.types import from_cents, to_cents
+from app.schemas.aggregate import CategoryTotal, SpendingAggregate
+from app.schemas.spending import SpendingResponse
+from app.services.spending_service import build_visualization
+from app.services.stats_cache import REDIS_URL
+from app.storage.events import SpendingChange, add_change_listener
+from app.storage.rollups import rollup_day_range
+
+logger = logging.getLogger(__name__)
+
+# Broadcast backend: "memory" (writes reach the streams of the same worker) or
+# "redis" (pub/sub, writes reach the streams of every worker)
+STREAM_BROADCAST_BACKEND = os.getenv("STREAM_BROADCAST_BACKEND", "memory").lower()
+STREAM_REDIS_CHANNEL = os.getenv("STREAM_REDIS_CHANNEL", "spendings:changes")
+# Committed writes waiting per connection; a client that falls this far behind is disconnected
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "256"))
+# Committed writes waiting to be broadcast; on overflow every stream is told it missed changes
+STREAM_FANOUT_QUEUE_SIZE = int(os.getenv("STREAM_FANOUT_QUEUE_SIZE", "10000"))
+# Seconds between keep-alive comments on an idle SSE stream
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+
+# Live aggregates one connection may subscribe to
+MAX_AGGREGATES_PER_CONNECTION = 16
+
+# Broadcast when changes were dropped, so every worker disconnects its streams
+LAGGED_MESSAGE = json.dumps({"type": "lagged"})
+
+# (year, month) of a live aggregate; both None for all time
+AggregateKey = Tuple[Optional[int], Optional[int]]
+AggregateLoader = Callable[
+    [Optional[int], Optional[int]], Awaitable[Tuple[SpendingAggregate, Dict[DateType, int]]]
+]
+
+
+class StreamLagged(Exception):
+    """Raised to a stream that missed changes; the client should reload and reconnect."""
+
+
+def _spending_json(spending: Optional[SpendingResponse]) -> Optional[Dict[str, Any]]:
+    """Serialize the SpendingResponse fields of a spending (without budget details)."""
+    if spending is None:
+        return None
+    return spending.model_dump(mode="json", include=set(SpendingResponse.model_fields))
+
+
+def encode_changes(changes: List[SpendingChange]) -> str:
+    """Encode the changes of one committed write as a broadcast message."""
+    return json.dumps({
+        "type": "changes",
+        "changes": [
+            {
+                "action": change.action,
+                "id": str((change.new or change.old).id),
+                "spending": _spending_json(change.new),
+                "previous": _spending_json(change.old),
+                "versions": {month.isoformat(): version for month, version in (change.versions or {}).items()},
+            }
+            for change in changes
+        ],
+    })
+
+
+def format_sse(message: Dict[str, Any]) -> str:
+    """Format a stream message as a server-sent event named after its type."""
+    if message["type"] == "ping":
+        return ": ping\n\n"
+    return f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+
+
+class Subscriber:
+    """Bounded queue of committed writes for one connection."""
+
+    def __init__(self, queue_size: int = STREAM_QUEUE_SIZE):
+        self.queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue(maxsize=queue_size)
+        self.lagged = False
+        self.closed = False
+
+    def offer(self, message: Dict[str, Any]) -> None:
+        """Queue a message, or mark the subscriber lagged if its queue is full."""
+        if self.lagged or self.closed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.lag()
+
+    def lag(self) -> None:
+        """Mark the subscriber as having missed messages; its reader gets StreamLagged."""
+        self.lagged = True
+        self._wake()
+
+    def close(self) -> None:
+        """End the subscription; its reader gets None."""
+        self.closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        # A full queue means the reader isn't waiting
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the next message.
+
+        Returns:
+            The message, or None once the subscription is closed.
+
+        Raises:
+            StreamLagged: If messages were dropped.
+            asyncio.TimeoutError: If nothing arrived within timeout seconds.
+        """
+        while True:
+            if self.closed:
+                return None
+            if self.lagged:
+                raise StreamLagged("The stream fell behind and missed changes")
+            message = await asyncio.wait_for(self.queue.get(), timeout)
+            if message is not None and not (self.lagged or self.closed):
+                return message
+
+
+class LiveAggregate:
+    """
+    Per-category totals of a year/month kept current by applying each write's delta.
+
+    The snapshot comes with the data version of each of its months. A write
+    is applied only if it gave its month a higher version, so writes already
+    in the snapshot are never counted twice, whatever order they arrive in.
+    """
+
+    def __init__(self, year: Optional[int] = None, month: Optional[int] = None):
+        self.year = year
+        self.month = month
+        self.start, self.end = rollup_day_range(year=year, month=month) or (None, None)
+        self.ready = False
+        self._totals: Dict[str, List[int]] = {}
+        self._versions: Dict[DateType, int] = {}
+        self._pending: List[Dict[str, Any]] = []
+
+    def load(self, aggregate: SpendingAggregate, versions: Dict[DateType, int]) -> None:
+        """Start from a snapshot and apply the changes that arrived while it was read."""
+        self._totals = {
+            category: [to_cents(total.amount), total.count] for category, total in aggregate.by_category.items()
+        }
+        self._versions = versions
+        self.ready = True
+        pending, self._pending = self._pending, []
+        for change in pending:
+            self.apply(change)
+
+    def apply(self, change: Dict[str, Any]) -> bool:
+        """Apply one change (as broadcast); returns whether the totals changed."""
+        if not self.ready:
+            self._pending.append(change)
+            return False
+        changed = False
+        for key, sign in (("previous", -1), ("spending", 1)):
+            spending = change[key]
+            if spending is None:
+                continue
+            day = datetime.fromisoformat(spending["date"]).date()
+            if (self.start is not None and day < self.start) or (self.end is not None and day >= self.end):
+                continue
+            month = day.replace(day=1)
+            version = change["versions"].get(month.isoformat())
+            if version is not None and version <= self._versions.get(month, 0):
+                continue
+            totals = self._totals.setdefault(spending["category"], [0, 0])
+            totals[0] += sign * to_cents(spending["amount"])
+            totals[1] += sign
+            if totals[1] == 0:
+                del self._totals[spending["category"]]
+            changed = True
+        return changed
+
+    def message(self) -> Dict[str, Any]:
+        """Get the current totals as an aggregate stream message (visualization data)."""
+        ordered = sorted(self._totals.items(), key=lambda item: item[1][0], reverse=True)
+        total_cents = sum(cents for _, (cents, _) in ordered)
+        total_count = sum(count for _, (_, count) in ordered)
+        aggregate = SpendingAggregate(
+            total_count=total_count,
+            total_amount=from_cents(total_cents),
+            average_amount=from_cents(total_cents) / total_count if total_count else 0.0,
+            by_category={
+                category: CategoryTotal(amount=from_cents(cents), count=count)
+                for category, (cents, count) in ordered
+            }
+        )
+        visualization = build_visualization(aggregate, year=self.year, month=self.month)
+        return {"type": "aggregate", "data": visualization.model_dump(mode="json")}
+
+
+class StreamConnection:
+    """One client's stream: committed changes, the aggregates it follows and keep-alives."""
+
+    def __init__(
+        self,
+        subscriber: Subscriber,
+        load_aggregate: AggregateLoader,
+        changes: bool = True,
+        heartbeat: Optional[float] = None
+    ):
+        self.subscriber = subscriber
+        self.load_aggregate = load_aggregate
+        self.changes = changes
+        self.heartbeat = heartbeat
+        self.aggregates: Dict[AggregateKey, LiveAggregate] = {}
+
+    async def subscribe_aggregate(self, year: Optional[int] = None, month: Optional[int] = None) -> None:
+        """
+        Follow the categorized aggregate of a year/month (both None for all time).
+
+        The current totals are sent once loaded, then again after every write
+        that changes them.
+
+        Raises:
+            ValueError: If the filters are invalid or too many aggregates are followed.
+        """
+        if month is not None and year is None:
+            raise ValueError("Month filter requires year to be specified")
+        if month is not None and not 1 <= month <= 12:
+            raise ValueError("Month must be between 1 and 12")
+        key = (year, month)
+        if key not in self.aggregates and len(self.aggregates) >= MAX_AGGREGATES_PER_CONNECTION:
+            raise ValueError(f"At most {MAX_AGGREGATES_PER_CONNECTION} aggregates can be followed")
+
+        aggregate = LiveAggregate(year, month)
+        self.aggregates[key] = aggregate
+        try:
+            snapshot = await self.load_aggregate(year, month)
+        except Exception:
+            if self.aggregates.get(key) is aggregate:
+                del self.aggregates[key]
+            raise
+        # Changes queued meanwhile are applied from the snapshot's versions on
+        if self.aggregates.get(key) is aggregate:
+            aggregate.load(*snapshot)
+            self.subscriber.offer({"type": "aggregate_ready", "key": key})
+
+    def unsubscribe_aggregate(self, year: Optional[int] = None, month: Optional[int] = None) -> None:
+        """Stop following an aggregate."""
+        self.aggregates.pop((year, month), None)
+
+    def send_error(self, detail: str) -> None:
+        """Queue an error message for the client (the stream stays open)."""
+        self.subscriber.offer({"type": "error", "detail": detail})
+
+    def close(self) -> None:
+        """End messages() (e.g. once the client disconnected)."""
+        self.subscriber.close()
+
+    async def messages(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the messages to send, in order, until the connection is closed.
+
+        Raises:
+            StreamLagged: If the client fell behind and changes were dropped.
+        """
+        while True:
+            try:
+                item = await self.subscriber.get(self.heartbeat)
+            except asyncio.TimeoutError:
+                yield {"type": "ping"}
+                continue
+            if item is None:
+                return
+
+            if item["type"] == "aggregate_ready":
+                aggregate = self.aggregates.get(item["key"])
+                if aggregate is not None:
+                    yield aggregate.message()
+            elif item["type"] == "error":
+                yield item
+            elif item["type"] == "changes":
+                changed = []
+                for change in item["changes"]:
+                    if self.changes:
+                        yield {
+                            "type": "change",
+                            "action": change["action"],
+                            "id": change["id"],
+                            "spending": change["spending"],
+                            "previous": change["previous"],
+                        }
+                    for aggregate in list(self.aggregates.values()):
+                        if aggregate.apply(change) and aggregate not in changed:
+                            changed.append(aggregate)
+                # One update per aggregate for a whole bulk write
+                for aggregate in changed:
+                    if self.aggregates.get((aggregate.year, aggregate.month)) is aggregate:
+                        yield aggregate.message()
+
+
+class BroadcastBackend(ABC):
+    """Carries committed writes from the worker that made them to the workers streaming them."""
+
+    name = "base"
+    # Whether publish only reaches this worker
+    local = True
+
+    @abstractmethod
+    async def start(self, deliver: Callable[[str], None]) -> None:
+        """Start receiving; deliver is called on the event loop with each published message."""
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Stop receiving."""
+
+    @abstractmethod
+    async def publish(self, message: str) -> None:
+        """Send a message to every worker (including this one)."""
+
+
+class InMemoryBroadcastBackend(BroadcastBackend):
+    """Delivers messages to the streams of this worker only."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._deliver: Optional[Callable[[str], None]] = None
+
+    async def start(self, deliver: Callable[[str], None]) -> None:
+        self._deliver = deliver
+
+    async def stop(self) -> None:
+        self._deliver = None
+
+    async def publish(self, message: str) -> None:
+        if self._deliver is not None:
+            self._deliver(message)
+
+
+class RedisBroadcastBackend(BroadcastBackend):
+    """
+    Redis pub/sub channel shared by all uvicorn workers.
+
+    Messages published while a worker's subscription is down are lost to it,
+    so its streams are told they lagged once it resubscribes.
+    """
+
+    name = "redis"
+    local = False
+
+    def __init__(self, url: str = REDIS_URL, channel: str = STREAM_REDIS_CHANNEL):
+        self.url = url
+        self.channel = channel
+        self.client = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self, deliver: Callable[[str], None]) -> None:
+        import redis.asyncio as redis
+
+        self.client = redis.Redis.from_url(self.url)
+        self._listener = asyncio.create_task(self._listen(deliver))
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def publish(self, message: str) -> None:
+        await self.client.publish(self.channel, message)
+
+    async def _listen(self, deliver: Callable[[str], None]) -> None:
+        resubscribing = False
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                if resubscribing:
+                    deliver(LAGGED_MESSAGE)
+                    resubscribing = False
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        deliver(message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Lost the stream broadcast channel; resubscribing")
+                resubscribing = True
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+
+class SpendingStream:
+    """
+    Fans committed spending writes out to the stream connections.
+
+    Writing threads hand each commit's changes to a bounded fan-out queue on
+    the event loop; a publisher task passes them to the broadcast backend,
+    which delivers them to every connection's own bounded queue. Neither
+    queue ever blocks a writer: when one is full, the affected connections
+    are disconnected as lagged instead.
+    """
+
+    def __init__(
+        self,
+        backend: BroadcastBackend,
+        queue_size: int = STREAM_QUEUE_SIZE,
+        fanout_queue_size: int = STREAM_FANOUT_QUEUE_SIZE
+    ):
+        self.backend = backend
+        self.queue_size = queue_size
+        self.fanout_queue_size = fanout_queue_size
+        self.dropped = 0
+        self._subscribers: Set[Subscriber] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._outbox: Optional["asyncio.Queue[str]"] = None
+        self._overflowed = False
+        self._publisher: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the backend and the publisher task on the running event loop."""
+        self._outbox = asyncio.Queue(maxsize=self.fanout_queue_size)
+        await self.backend.start(self._deliver)
+        self._publisher = asyncio.create_task(self._run())
+        self._loop = asyncio.get_running_loop()
+
+    async def stop(self) -> None:
+        """Stop publishing and end every open stream."""
+        self._loop = None
+        if self._publisher is not None:
+            self._publisher.cancel()
+            try:
+                await self._publisher
+            except asyncio.CancelledError:
+                pass
+            self._publisher = None
+        await self.backend.stop()
+        for subscriber in list(self._subscribers):
+            subscriber.close()
+
+    def on_changes(self, changes: List[SpendingChange]) -> None:
+        """Queue the changes of a committed write for broadcast. Runs in the writing thread."""
+        loop = self._loop
+        if loop is None or (self.backend.local and not self._subscribers):
+            return
+        loop.call_soon_threadsafe(self._enqueue, encode_changes(changes))
+
+    @asynccontextmanager
+    async def connect(
+        self,
+        load_aggregate: AggregateLoader,
+        changes: bool = True,
+        heartbeat: Optional[float] = None
+    ) -> AsyncIterator[StreamConnection]:
+        """Open a stream connection that receives every write committed while it is open."""
+        subscriber = Subscriber(self.queue_size)
+        self._subscribers.add(subscriber)
+        try:
+            yield StreamConnection(subscriber, load_aggregate, changes=changes, heartbeat=heartbeat)
+        finally:
+            self._subscribers.discard(subscriber)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the open connections of this worker and the writes dropped by the fan-out queue."""
+        return {
+            "backend": self.backend.name,
+            "connections": len(self._subscribers),
+            "fanout_depth": self._outbox.qsize() if self._outbox is not None else 0,
+            "dropped": self.dropped,
+        }
+
+    def _enqueue(self, message: str) -> None:
+        try:
+            self._outbox.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self._overflowed = True
+
+    async def _run(self) -> None:
+        while True:
+            message = await self._outbox.get()
+            try:
+                if self._overflowed:
+                    self._overflowed = False
+                    await self.backend.publish(LAGGED_MESSAGE)
+                await self.backend.publish(message)
+            except Exception:
+                logger.exception("Could not broadcast spending changes")
+                self._overflowed = True
+
+    def _deliver(self, message: str) -> None:
+        event = json.loads(message)
+        for subscriber in list(self._subscribers):
+            if event["type"] == "lagged":
+                subscriber.lag()
+            else:
+                subscriber.offer(event)
+
+
+def build_spending_stream() -> SpendingStream:
+    """Create the spending stream with the backend configured by STREAM_BROADCAST_BACKEND."""
+    if STREAM_BROADCAST_BACKEND == "redis":
+        return SpendingStream(RedisBroadcastBackend())
+    if STREAM_BROADCAST_BACKEND == "memory":
+        return SpendingStream(InMemoryBroadcastBackend())
+    raise ValueError(f"Unknown STREAM_BROADCAST_BACKEND: {STREAM_BROADCAST_BACKEND}")
+
+
+spending_stream = build_spending_stream()
+add_change_listener(spending_stream.on_changes)
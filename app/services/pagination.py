@@ -0,0 +1,49 @@
+"""Opaque cursor encoding for keyset pagination."""
+
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+
+def encode_cursor(date: datetime, spending_id: UUID) -> str:
+    """Encode the (date, id) of the last returned row as an opaque cursor."""
+    payload = json.dumps({"d": date.isoformat(), "i": str(spending_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["d"]), UUID(payload["i"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid pagination cursor") from exc
+
+
+def encode_search_cursor(rank: float, date: datetime, spending_id: UUID) -> str:
+    """Encode the (rank, date, id) of the last returned search result as an opaque cursor."""
+    payload = json.dumps({"r": rank, "d": date.isoformat(), "i": str(spending_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, datetime, UUID]:
+    """
+    Decode a cursor produced by encode_search_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(payload["r"]), datetime.fromisoformat(payload["d"]), UUID(payload["i"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid pagination cursor") from exc
@@ -0,0 +1,30 @@
+"""Fast JSON encoding of spending rows read as plain column tuples."""
+
+import json
+from typing import Any, Iterable, Sequence
+
+from pydantic_core import to_jsonable_python
+
+from app.schemas.spending import SpendingResponse
+
+# Field order of SpendingResponse, which is also the column order of the row tuples
+RESPONSE_FIELDS = tuple(SpendingResponse.model_fields)
+
+
+def encode_spending_rows(rows: Iterable[Sequence[Any]]) -> bytes:
+    """
+    Encode (id, amount, category, description, date, created_at) rows as a JSON array.
+
+    Produces the same bytes FastAPI writes for a List[SpendingResponse] response:
+    values are converted with pydantic's JSON-mode rules (UUIDs and datetimes to
+    strings) and dumped with JSONResponse's json.dumps settings. The rows come
+    straight from the database, so there is no model construction or validation.
+    """
+    items = [dict(zip(RESPONSE_FIELDS, row)) for row in rows]
+    return json.dumps(
+        to_jsonable_python(items),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
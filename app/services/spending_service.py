@@ -1,14 +1,114 @@
 """Service layer for spending business logic."""
 
-from datetime import datetime
-from typing import Dict, List, Optional
+from datetime import date as DateType
+from datetime import datetime, timedelta
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
 from uuid import UUID, uuid4
 
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
-from app.schemas.spending import SpendingCreate, SpendingResponse, SpendingUpdate
-from app.schemas.visualization import CategorySpending, SpendingVisualization
-from app.storage.database import DatabaseStorage
+from app.schemas.aggregate import SpendingAggregate, SpendingSummary
+from app.schemas.analytics import AdvancedSpendingStats
+from app.schemas.export import ExportFormat
+from app.schemas.spending import (
+    CategoryMatch,
+    SpendingBulkCreate,
+    SpendingBulkError,
+    SpendingBulkResponse,
+    SpendingCreate,
+    SpendingImportResponse,
+    SpendingResponse,
+    SpendingSearchResult,
+    SpendingUpdate,
+    SpendingWriteResponse,
+)
+from app.schemas.sync import ChangeAction, SpendingChangeEntry, SpendingChanges
+from app.schemas.visualization import (
+    CategorySpending,
+    SpendingTimeSeries,
+    SpendingVisualization,
+    TimeBucket,
+    TimeSeriesPoint,
+)
+from app.services.analytics import ColumnarSnapshot, compute_advanced_stats, snapshot_cache
+from app.services.csv_import import CsvImportReport, iter_csv_batches
+from app.services.export import encode_rows, export_header
+from app.services.pagination import decode_cursor, decode_search_cursor, encode_cursor, encode_search_cursor
+from app.services.serialization import encode_spending_rows
+from app.services.stats_cache import CacheKey, stats_cache
+from app.services.validation import format_validation_error, validate_new_spending
+from app.storage.changes import SYNC_TOMBSTONE_RETENTION_DAYS
+from app.storage.database import BULK_INSERT_BATCH_SIZE, DatabaseStorage
+from app.storage.rollups import DayRange, rollup_day_range
+from app.storage.timeseries import iter_bucket_starts
+from app.storage.versions import VersionStamp
+
+
+# Smallest id, paired with the horizon in tokens that resume after every change so far
+NIL_ID = UUID(int=0)
+
+
+# Reads of an aggregate snapshot before giving up on a window that keeps changing
+SNAPSHOT_ATTEMPTS = 5
+
+
+class SnapshotUnstable(Exception):
+    """Raised when an aggregate snapshot can't be read between two writes to its window."""
+
+
+def build_visualization(
+    aggregate: SpendingAggregate,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    date: Optional[DateType] = None
+) -> SpendingVisualization:
+    """Turn a per-category aggregate into visualization data with percentages."""
+    total_amount = aggregate.total_amount
+    # Create category spending list with percentages (already ordered by amount)
+    categories = []
+    for category, data in aggregate.by_category.items():
+        percentage = (data.amount / total_amount * 100) if total_amount > 0 else 0.0
+        categories.append(
+            CategorySpending(
+                category=category,
+                amount=round(data.amount, 2),
+                percentage=round(percentage, 2),
+                count=data.count
+            )
+        )
+
+    return SpendingVisualization(
+        total_amount=round(total_amount, 2),
+        total_count=aggregate.total_count,
+        year=year,
+        month=month,
+        date=date,
+        categories=categories
+    )
+
+
+def summary_cache_entry(date: Optional[datetime], version: Optional[int]) -> Tuple[CacheKey, DayRange]:
+    """Get the stats cache key and day window of a summary."""
+    day = date.date() if isinstance(date, datetime) else date
+    return ("summary", None, None, day, version), rollup_day_range(date=date)
+
+
+def visualization_cache_entry(
+    year: Optional[int],
+    month: Optional[int],
+    date: Optional[datetime],
+    version: Optional[int]
+) -> Tuple[CacheKey, DayRange]:
+    """Get the stats cache key and day window of categorized spending (date takes precedence)."""
+    if date is not None:
+        day = date.date() if isinstance(date, datetime) else date
+        return ("visualization", None, None, day, version), rollup_day_range(date=date)
+    return ("visualization", year, month, None, version), rollup_day_range(year=year, month=month) or (None, None)
+
+
+class ChangeTokenExpired(Exception):
+    """Raised when a change token predates the tombstones still kept; the client must resync."""
 
 
 class SpendingService:
@@ -17,9 +117,14 @@ class SpendingService:
     def __init__(self, db: Session):
         self.storage = DatabaseStorage(db)
 
-    def create_spending(self, spending_data: SpendingCreate) -> SpendingResponse:
-        """Create a new spending entry."""
-        new_spending = SpendingResponse(
+    def create_spending(self, spending_data: SpendingCreate) -> SpendingWriteResponse:
+        """Create a new spending entry and report whether it pushed its category over budget."""
+        return self.storage.create(self.new_spending(spending_data))
+
+    @staticmethod
+    def new_spending(spending_data: SpendingCreate) -> SpendingResponse:
+        """Build the spending to store for a create request."""
+        return SpendingResponse(
             id=uuid4(),
             amount=spending_data.amount,
             category=spending_data.category,
@@ -27,57 +132,285 @@ class SpendingService:
             date=spending_data.date or datetime.now(),
             created_at=datetime.now()
         )
-        return self.storage.create(new_spending)
 
-    def get_spendings(self, category: Optional[str] = None) -> List[SpendingResponse]:
-        """Get all spendings, optionally filtered by category."""
-        return self.storage.get_all(category=category)
+    def create_spendings_bulk(self, bulk: SpendingBulkCreate) -> SpendingBulkResponse:
+        """
+        Create many spending entries in batches.
+
+        Each item is validated against SpendingCreate individually. In atomic
+        mode nothing is written if any item is invalid; otherwise invalid items
+        are reported and the rest are created.
+        """
+        errors: List[SpendingBulkError] = []
+        new_spendings: List[SpendingResponse] = []
+        positions: List[int] = []
+        created_at = datetime.now()
+
+        for index, item in enumerate(bulk.spendings):
+            try:
+                new_spendings.append(validate_new_spending(item, created_at))
+            except ValidationError as exc:
+                errors.append(SpendingBulkError(index=index, detail=format_validation_error(exc)))
+                continue
+            positions.append(index)
+
+        if errors and bulk.atomic:
+            return SpendingBulkResponse(created=0, failed=len(errors), errors=errors)
+
+        failed = self.storage.bulk_create(
+            new_spendings,
+            batch_size=bulk.batch_size or BULK_INSERT_BATCH_SIZE,
+            atomic=bulk.atomic
+        )
+        failed_positions = set()
+        for position, detail in failed:
+            failed_positions.add(position)
+            errors.append(SpendingBulkError(index=positions[position], detail=detail))
+        errors.sort(key=lambda e: e.index)
+
+        created = [s for i, s in enumerate(new_spendings) if i not in failed_positions]
+        return SpendingBulkResponse(
+            created=len(created),
+            failed=len(errors),
+            errors=errors,
+            spendings=created if bulk.return_rows else None
+        )
+
+    def import_spendings_csv(
+        self,
+        file: BinaryIO,
+        batch_size: int = BULK_INSERT_BATCH_SIZE
+    ) -> SpendingImportResponse:
+        """
+        Import spendings from a CSV file, parsing and inserting batch by batch.
+
+        Each batch is committed as soon as it is parsed; invalid rows are skipped
+        and reported by line number.
+
+        Raises:
+            ValueError: If the CSV header is invalid or the file is not UTF-8.
+        """
+        report = CsvImportReport()
+        for batch in iter_csv_batches(file, batch_size):
+            failed = self.storage.bulk_create(batch.spendings, batch_size=batch_size, atomic=False)
+            report.add(batch, failed)
+        return report.to_response()
+
+    def search_spendings(
+        self,
+        q: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        category: Optional[str] = None,
+        category_match: CategoryMatch = CategoryMatch.contains,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        date: Optional[datetime] = None
+    ) -> Tuple[List[SpendingSearchResult], Optional[str]]:
+        """
+        Search spending descriptions, best matches first.
+
+        Args:
+            q: Search string.
+            limit: Maximum number of results to return.
+            cursor: Opaque cursor from a previous page.
+            category: Optional category filter.
+            category_match: How category is matched (exact, prefix or contains).
+            year: Optional year filter. Ignored if date is provided.
+            month: Optional month filter. Ignored if date is provided.
+            date: Optional date filter. If provided, takes precedence over year/month.
+
+        Returns:
+            Tuple of (results, next_cursor). next_cursor is None on the last page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        after = decode_search_cursor(cursor) if cursor else None
+        # Fetch one extra row to find out whether another page exists
+        rows = self.storage.search(
+            q,
+            limit=limit + 1,
+            after=after,
+            category=category,
+            category_match=category_match,
+            year=year,
+            month=month,
+            date=date
+        )
+        results = [SpendingSearchResult(**spending.model_dump(), rank=rank) for spending, rank in rows[:limit]]
+        if len(rows) <= limit:
+            return results, None
+        last = results[-1]
+        return results, encode_search_cursor(last.rank, last.date, last.id)
+
+    def get_spendings_page_json(
+        self,
+        category: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        cursor: Optional[str] = None,
+        category_match: CategoryMatch = CategoryMatch.contains
+    ) -> Tuple[bytes, Optional[str]]:
+        """
+        Get one page of spendings, optionally filtered by category, encoded as JSON.
+
+        Rows are read as column tuples and encoded directly, skipping the ORM and
+        SpendingResponse models. The bytes match what FastAPI would produce from
+        the same page as a list of SpendingResponse.
+
+        Args:
+            category: Optional category filter.
+            limit: Maximum number of spendings to return.
+            skip: Number of spendings to skip (LIMIT/OFFSET mode).
+            cursor: Opaque cursor from a previous page (keyset mode).
+            category_match: How category is matched (exact, prefix or contains).
+
+        Returns:
+            Tuple of (JSON array, next_cursor). next_cursor is None on the last page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        # Fetch one extra row to find out whether another page exists
+        rows = self.storage.get_page_rows(
+            category=category,
+            limit=limit + 1,
+            offset=skip,
+            after=after,
+            category_match=category_match
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][4], rows[-1][0])
+        return encode_spending_rows(rows), next_cursor
+
+    def export_spendings(
+        self,
+        export_format: ExportFormat,
+        category: Optional[str] = None,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        date: Optional[datetime] = None,
+        category_match: CategoryMatch = CategoryMatch.contains
+    ) -> Iterator[bytes]:
+        """
+        Export spendings as CSV or NDJSON, one encoded chunk per fetched batch.
+
+        Args:
+            export_format: Output format.
+            category: Optional category filter.
+            year: Optional year filter. Ignored if date is provided.
+            month: Optional month filter. Ignored if date is provided.
+            date: Optional date filter. If provided, takes precedence over year/month.
+            category_match: How category is matched (exact, prefix or contains).
+        """
+        header = export_header(export_format)
+        if header:
+            yield header
+        for rows in self.storage.iter_export_rows(
+            category=category, year=year, month=month, date=date, category_match=category_match
+        ):
+            yield encode_rows(rows, export_format)
 
     def get_spending_by_id(self, spending_id: UUID) -> Optional[SpendingResponse]:
         """Get a spending by ID."""
         return self.storage.get_by_id(spending_id)
 
+    def get_changes(self, since: Optional[str] = None, limit: int = 500) -> SpendingChanges:
+        """
+        Get spendings created, updated or deleted after a change token.
+
+        Args:
+            since: next_token of the previous call; None starts from the beginning.
+            limit: Maximum number of changes to return.
+
+        Returns:
+            SpendingChanges with the changes in write order and the token to continue from.
+
+        Raises:
+            ValueError: If the token is malformed.
+            ChangeTokenExpired: If the token is older than SYNC_TOMBSTONE_RETENTION_DAYS.
+        """
+        after = None
+        if since:
+            try:
+                after = decode_cursor(since)
+            except ValueError as exc:
+                raise ValueError("Invalid change token") from exc
+
+        changes, horizon = self.storage.get_changes(after, limit + 1)
+        if after is not None and after[0] < horizon - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS):
+            raise ChangeTokenExpired("Change token has expired; fetch all spendings again without since")
+
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        if has_more:
+            next_key = changes[-1][0]
+        else:
+            # Everything before the horizon was returned; later changes sort after it
+            next_key = max(after or (horizon, NIL_ID), (horizon, NIL_ID))
+        return SpendingChanges(
+            changes=[
+                SpendingChangeEntry(
+                    action=ChangeAction.upserted if spending is not None else ChangeAction.deleted,
+                    id=spending_id,
+                    changed_at=changed_at,
+                    spending=spending
+                )
+                for (changed_at, spending_id), spending in changes
+            ],
+            next_token=encode_cursor(*next_key),
+            has_more=has_more
+        )
+
     def update_spending(
         self,
         spending_id: UUID,
         spending_update: SpendingUpdate
-    ) -> Optional[SpendingResponse]:
-        """Update an existing spending entry."""
-        existing_spending = self.storage.get_by_id(spending_id)
-        if not existing_spending:
-            return None
-
-        update_data = spending_update.model_dump(exclude_unset=True)
-        updated_spending = SpendingResponse(
-            id=existing_spending.id,
-            amount=update_data.get("amount", existing_spending.amount),
-            category=update_data.get("category", existing_spending.category),
-            description=update_data.get("description", existing_spending.description),
-            date=update_data.get("date", existing_spending.date),
-            created_at=existing_spending.created_at
-        )
-        return self.storage.update(spending_id, updated_spending)
+    ) -> Optional[SpendingWriteResponse]:
+        """
+        Update an existing spending entry.
+
+        Only the fields present in the request are written; an explicit null is
+        ignored for the required fields (amount, category, date). The result
+        tells whether the change pushed its category over budget.
+        """
+        changes = {
+            field: value
+            for field, value in spending_update.model_dump(exclude_unset=True).items()
+            if value is not None or field == "description"
+        }
+        return self.storage.update(spending_id, changes)
 
     def delete_spending(self, spending_id: UUID) -> bool:
         """Delete a spending entry."""
         return self.storage.delete(spending_id)
 
-    def get_summary(self, date: Optional[datetime] = None) -> Dict:
+    def get_summary(self, date: Optional[datetime] = None, version: Optional[int] = None) -> Dict:
         """
         Get summary statistics of all spendings.
         
         Args:
             date: Optional date to filter spendings by. If provided, returns summary for that specific date.
+            version: Data version of the window, if the caller read it (see get_data_version).
+                Part of the cache key, so writes made by other workers are never served stale.
             
         Returns:
             Dictionary with summary statistics including total_spendings, total_amount, by_category, and average_amount.
         """
-        if date is not None:
-            all_spendings = self.storage.get_spendings_by_date(date)
-        else:
-            all_spendings = self.storage.get_all_spendings()
-        
-        if not all_spendings:
+        if stats_cache is None:
+            return self._compute_summary(date)
+        key, window = summary_cache_entry(date, version)
+        return stats_cache.get_or_compute(key, window, lambda: self._compute_summary(date), SpendingSummary)
+
+    def _compute_summary(self, date: Optional[datetime] = None) -> Dict:
+        """Compute summary statistics (uncached)."""
+        aggregate = self.storage.get_aggregate(date=date)
+
+        if not aggregate.total_count:
             return {
                 "total_spendings": 0,
                 "total_amount": 0.0,
@@ -86,18 +419,13 @@ class SpendingService:
                 "date": date.date() if date else None
             }
 
-        total_amount = sum(s.amount for s in all_spendings)
-        category_totals: Dict[str, float] = {}
-        for spending in all_spendings:
-            category_totals[spending.category] = (
-                category_totals.get(spending.category, 0) + spending.amount
-            )
-
         result = {
-            "total_spendings": len(all_spendings),
-            "total_amount": total_amount,
-            "by_category": category_totals,
-            "average_amount": total_amount / len(all_spendings)
+            "total_spendings": aggregate.total_count,
+            "total_amount": aggregate.total_amount,
+            "by_category": {
+                category: totals.amount for category, totals in aggregate.by_category.items()
+            },
+            "average_amount": aggregate.average_amount
         }
         
         if date is not None:
@@ -105,11 +433,104 @@ class SpendingService:
         
         return result
 
+    def get_data_version(self, start: Optional[DateType] = None, end: Optional[DateType] = None) -> VersionStamp:
+        """
+        Get the data version of spendings dated in [start, end) (everything if unbounded).
+
+        One small aggregate over per-month counters; read endpoints compare it
+        with If-None-Match before running their query.
+        """
+        return self.storage.versions.get(start, end)
+
+    def get_timeseries(
+        self,
+        start: DateType,
+        end: DateType,
+        bucket: TimeBucket,
+        category: Optional[str] = None
+    ) -> SpendingTimeSeries:
+        """
+        Get spending totals per day, week or month.
+
+        Args:
+            start: First day included.
+            end: First day excluded.
+            bucket: Bucket size.
+            category: Optional exact category filter.
+
+        Returns:
+            SpendingTimeSeries with one point per bucket, empty buckets included.
+        """
+        totals = {
+            day: (amount, count)
+            for day, amount, count in self.storage.get_timeseries(start, end, bucket, category=category)
+        }
+        points = [
+            TimeSeriesPoint(
+                start=day,
+                amount=round(totals.get(day, (0.0, 0))[0], 2),
+                count=totals.get(day, (0.0, 0))[1]
+            )
+            for day in iter_bucket_starts(start, end, bucket)
+        ]
+        return SpendingTimeSeries(
+            bucket=bucket,
+            from_date=start,
+            to_date=end,
+            category=category,
+            total_amount=round(sum(amount for amount, _ in totals.values()), 2),
+            total_count=sum(count for _, count in totals.values()),
+            points=points
+        )
+
+    def get_advanced_stats(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        date: Optional[datetime] = None,
+        category: Optional[str] = None,
+        outlier_limit: int = 20
+    ) -> AdvancedSpendingStats:
+        """
+        Get percentiles, category distributions, trends and outliers.
+
+        Computed with NumPy over the cached columnar snapshot of all spendings,
+        which is loaded with one bulk fetch and kept up to date with writes.
+
+        Args:
+            year: Optional year filter. Ignored if date is provided.
+            month: Optional month filter. Ignored if date is provided.
+            date: Optional date filter. If provided, takes precedence over year/month.
+            category: Optional exact category filter.
+            outlier_limit: Maximum number of outliers listed.
+
+        Returns:
+            AdvancedSpendingStats for the filtered spendings.
+        """
+        snapshot = snapshot_cache.get(
+            lambda: ColumnarSnapshot.from_batches(
+                self.storage.iter_analytics_columns(), self.storage.categories.name
+            )
+        )
+        stats = compute_advanced_stats(
+            snapshot,
+            rollup_day_range(year=year, month=month, date=date) or (None, None),
+            category=category,
+            outlier_limit=outlier_limit
+        )
+        return stats.model_copy(update={
+            "year": year if date is None else None,
+            "month": month if date is None else None,
+            "date": date.date() if isinstance(date, datetime) else date,
+            "category": category
+        })
+
     def get_categorized_spending(
         self,
         year: Optional[int] = None,
         month: Optional[int] = None,
-        date: Optional[datetime] = None
+        date: Optional[datetime] = None,
+        version: Optional[int] = None
     ) -> SpendingVisualization:
         """
         Calculate categorized spending with percentages for visualization.
@@ -118,59 +539,57 @@ class SpendingService:
             year: Optional year filter (e.g., 2025). Ignored if date is provided.
             month: Optional month filter (1-12). Ignored if date is provided.
             date: Optional date filter. If provided, takes precedence over year/month.
+            version: Data version of the window, if the caller read it (part of the cache key).
             
         Returns:
             SpendingVisualization with categorized data and percentages
         """
-        # Get filtered spendings - date takes precedence over year/month
+        if stats_cache is None:
+            return self._compute_categorized_spending(year=year, month=month, date=date)
+        key, window = visualization_cache_entry(year, month, date, version)
+        return stats_cache.get_or_compute(
+            key,
+            window,
+            lambda: self._compute_categorized_spending(year=year, month=month, date=date),
+            SpendingVisualization
+        )
+
+    def _compute_categorized_spending(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        date: Optional[datetime] = None
+    ) -> SpendingVisualization:
+        """Calculate categorized spending with percentages (uncached)."""
+        # Aggregate in the database - date takes precedence over year/month
         if date is not None:
-            spendings = self.storage.get_spendings_by_date(date)
+            aggregate = self.storage.get_aggregate(date=date)
             filter_date = date.date() if isinstance(date, datetime) else date
-        else:
-            spendings = self.storage.get_spendings_by_date_range(year=year, month=month)
-            filter_date = None
-        
-        if not spendings:
-            return SpendingVisualization(
-                total_amount=0.0,
-                total_count=0,
-                year=year if date is None else None,
-                month=month if date is None else None,
-                date=filter_date,
-                categories=[]
-            )
+            return build_visualization(aggregate, date=filter_date)
+        aggregate = self.storage.get_aggregate(year=year, month=month)
+        return build_visualization(aggregate, year=year, month=month)
 
-        # Calculate totals
-        total_amount = sum(s.amount for s in spendings)
-        total_count = len(spendings)
-
-        # Group by category and calculate totals
-        category_data: Dict[str, Dict[str, float]] = {}
-        for spending in spendings:
-            if spending.category not in category_data:
-                category_data[spending.category] = {"amount": 0.0, "count": 0}
-            category_data[spending.category]["amount"] += spending.amount
-            category_data[spending.category]["count"] += 1
-
-        # Create category spending list with percentages
-        categories = []
-        for category, data in sorted(category_data.items(), key=lambda x: x[1]["amount"], reverse=True):
-            percentage = (data["amount"] / total_amount * 100) if total_amount > 0 else 0.0
-            categories.append(
-                CategorySpending(
-                    category=category,
-                    amount=round(data["amount"], 2),
-                    percentage=round(percentage, 2),
-                    count=data["count"]
-                )
-            )
+    def get_aggregate_snapshot(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None
+    ) -> Tuple[SpendingAggregate, Dict[DateType, int]]:
+        """
+        Get the per-category aggregate of a year/month together with its months' data versions.
 
-        return SpendingVisualization(
-            total_amount=round(total_amount, 2),
-            total_count=total_count,
-            year=year if date is None else None,
-            month=month if date is None else None,
-            date=filter_date,
-            categories=categories
-        )
+        The versions are read before and after the aggregate and the read is
+        retried until they agree, so the aggregate includes exactly the writes
+        that gave those months a version up to the returned one.
+        """
+        start, end = rollup_day_range(year=year, month=month) or (None, None)
+        versions = self.storage.versions.get_months(start, end)
+        for _ in range(SNAPSHOT_ATTEMPTS):
+            aggregate = self.storage.get_aggregate(year=year, month=month)
+            versions_after = self.storage.versions.get_months(start, end)
+            if versions_after == versions:
+                break
+            versions = versions_after
+        else:
+            raise SnapshotUnstable("Spendings kept changing while their aggregate was read")
+        return aggregate, versions
 
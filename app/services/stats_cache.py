@@ -0,0 +1,357 @@
+"""Write-invalidated result cache for the stats endpoints."""
+
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date as DateType
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
+
+from app.storage.events import SpendingChange, add_change_listener
+from app.storage.rollups import DayRange
+
+logger = logging.getLogger(__name__)
+
+# Cache backend: "memory" (per worker), "redis" (shared by all workers) or "none"
+STATS_CACHE_BACKEND = os.getenv("STATS_CACHE_BACKEND", "memory").lower()
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "60"))
+STATS_CACHE_MAX_ENTRIES = int(os.getenv("STATS_CACHE_MAX_ENTRIES", "256"))
+REDIS_URL = os.getenv("REDIS_URL") or "redis://localhost:6379/0"
+
+# (endpoint, year, month, date, data version of the window if known)
+CacheKey = Tuple[str, Optional[int], Optional[int], Optional[DateType], Optional[int]]
+
+
+@lru_cache(maxsize=None)
+def _adapter(value_type: Any) -> TypeAdapter:
+    """Get the (reused) TypeAdapter that validates and serializes cached values of a type."""
+    return TypeAdapter(value_type)
+
+
+def _window_contains(window: DayRange, days: Iterable[DateType]) -> bool:
+    """Whether any of the days falls inside the half-open [start, end) window."""
+    start, end = window
+    return any(
+        (start is None or day >= start) and (end is None or day < end)
+        for day in days
+    )
+
+
+class StatsCacheBackend(ABC):
+    """
+    Storage for cached stats results.
+
+    Every entry remembers the day window it was computed over, so a write only
+    evicts the entries whose window contains one of the days it touched.
+    """
+
+    name = "base"
+    # Whether calls do network I/O, so they must be kept off the event loop
+    blocking = False
+
+    @abstractmethod
+    def get(self, key: CacheKey, adapter: TypeAdapter) -> Optional[Any]:
+        """Get a cached value (rebuilt through adapter if it was serialized), or None on a miss."""
+
+    @abstractmethod
+    def set(self, key: CacheKey, value: Any, window: DayRange, generation: int, adapter: TypeAdapter) -> None:
+        """Store a value unless an invalidation happened since `generation` was read."""
+
+    @abstractmethod
+    def generation(self) -> int:
+        """Get the invalidation counter, read before computing a value to store."""
+
+    @abstractmethod
+    def invalidate(self, days: Set[DateType]) -> None:
+        """Evict every entry whose window contains one of the days."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Evict every entry."""
+
+    @abstractmethod
+    def size(self) -> int:
+        """Get the number of cached entries."""
+
+
+class InMemoryStatsCacheBackend(StatsCacheBackend):
+    """Per-process LRU cache with TTL expiry."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = STATS_CACHE_MAX_ENTRIES, ttl: float = STATS_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[CacheKey, Tuple[float, DayRange, Any]]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey, adapter: TypeAdapter) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, _, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: CacheKey, value: Any, window: DayRange, generation: int, adapter: TypeAdapter) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, window, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def invalidate(self, days: Set[DateType]) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in [k for k, (_, window, _) in self._entries.items() if _window_contains(window, days)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisStatsCacheBackend(StatsCacheBackend):
+    """
+    Redis cache shared by all uvicorn workers.
+
+    Entries expire with the TTL; LRU eviction is left to the Redis
+    maxmemory-policy. An index sorted set records each entry's window, scored
+    by its expiry time, so that any worker can evict the entries a write
+    affects; members of expired entries are trimmed from it on every set and
+    invalidation, so it stays as small as the cache. Values are stored as JSON
+    and validated on the way back, so nothing in Redis is ever executed.
+    """
+
+    name = "redis"
+    blocking = True
+
+    def __init__(self, url: str = REDIS_URL, ttl: float = STATS_CACHE_TTL, prefix: str = "stats-cache"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self._index_key = f"{prefix}:expiries"
+        self._generation_key = f"{prefix}:generation"
+        self._entry_prefix = f"{prefix}:entry:"
+
+    @staticmethod
+    def _member(key: CacheKey, window: DayRange) -> str:
+        """Encode a key and its window as an index member."""
+        start, end = window
+        parts = [str(part) if part is not None else "" for part in key]
+        parts += [start.isoformat() if start else "", end.isoformat() if end else ""]
+        return "|".join(parts)
+
+    @staticmethod
+    def _window(member: str) -> DayRange:
+        """Decode the window of an index member."""
+        start, end = member.rsplit("|", 2)[1:]
+        return (
+            DateType.fromisoformat(start) if start else None,
+            DateType.fromisoformat(end) if end else None
+        )
+
+    def _entry_key(self, key: CacheKey) -> str:
+        return self._entry_prefix + "|".join(str(part) if part is not None else "" for part in key)
+
+    def get(self, key: CacheKey, adapter: TypeAdapter) -> Optional[Any]:
+        payload = self.client.get(self._entry_key(key))
+        return adapter.validate_json(payload) if payload is not None else None
+
+    def set(self, key: CacheKey, value: Any, window: DayRange, generation: int, adapter: TypeAdapter) -> None:
+        import redis
+
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(self._generation_key)
+                if int(pipe.get(self._generation_key) or 0) != generation:
+                    return
+                ttl = max(1, int(self.ttl))
+                now = time.time()
+                pipe.multi()
+                pipe.set(self._entry_key(key), adapter.dump_json(value), ex=ttl)
+                pipe.zadd(self._index_key, {self._member(key, window): now + ttl})
+                pipe.zremrangebyscore(self._index_key, "-inf", now)
+                pipe.execute()
+            except redis.WatchError:
+                # Invalidated while computing; don't store a possibly stale value
+                return
+
+    def generation(self) -> int:
+        return int(self.client.get(self._generation_key) or 0)
+
+    def _live_members(self) -> List[str]:
+        """Drop index members of expired entries and list the others."""
+        with self.client.pipeline(transaction=False) as pipe:
+            pipe.zremrangebyscore(self._index_key, "-inf", time.time())
+            pipe.zrange(self._index_key, 0, -1)
+            _, members = pipe.execute()
+        return [member.decode() for member in members]
+
+    def invalidate(self, days: Set[DateType]) -> None:
+        self.client.incr(self._generation_key)
+        stale = [member for member in self._live_members() if _window_contains(self._window(member), days)]
+        if not stale:
+            return
+        with self.client.pipeline(transaction=False) as pipe:
+            for member in stale:
+                pipe.delete(self._entry_prefix + member.rsplit("|", 2)[0])
+            pipe.zrem(self._index_key, *stale)
+            pipe.execute()
+
+    def clear(self) -> None:
+        self.client.incr(self._generation_key)
+        members = self._live_members()
+        with self.client.pipeline(transaction=False) as pipe:
+            for member in members:
+                pipe.delete(self._entry_prefix + member.rsplit("|", 2)[0])
+            pipe.delete(self._index_key)
+            pipe.execute()
+
+    def size(self) -> int:
+        return int(self.client.zcount(self._index_key, time.time(), "+inf"))
+
+
+class StatsCache:
+    """
+    Caches stats results and evicts them when writes touch their window.
+
+    With a blocking backend, evictions run on a background thread: writes
+    may commit on the event loop (AsyncSession.run_sync). Keys carry the
+    window's data version, so a late eviction never serves a stale result
+    to a caller that read the version.
+    """
+
+    def __init__(self, backend: StatsCacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._invalidator = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="stats-cache") if backend.blocking else None
+        )
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get_or_compute(
+        self,
+        key: CacheKey,
+        window: DayRange,
+        compute: Callable[[], Any],
+        value_type: Any
+    ) -> Any:
+        """Get a cached result of value_type or compute and store it (from a worker thread)."""
+        adapter = _adapter(value_type)
+        value = self.backend.get(key, adapter)
+        self._count(value is not None)
+        if value is not None:
+            return value
+
+        generation = self.backend.generation()
+        value = compute()
+        self.backend.set(key, value, window, generation, adapter)
+        return value
+
+    async def get_or_compute_async(
+        self,
+        key: CacheKey,
+        window: DayRange,
+        compute: Callable[[], Awaitable[Any]],
+        value_type: Any
+    ) -> Any:
+        """Get a cached result of value_type or await compute and store it, without blocking the event loop."""
+        adapter = _adapter(value_type)
+        value = await self._call_backend(self.backend.get, key, adapter)
+        self._count(value is not None)
+        if value is not None:
+            return value
+
+        generation = await self._call_backend(self.backend.generation)
+        value = await compute()
+        await self._call_backend(self.backend.set, key, value, window, generation, adapter)
+        return value
+
+    async def _call_backend(self, method: Callable[..., Any], *args: Any) -> Any:
+        """Call a backend method, in the thread pool if it does network I/O."""
+        if self.backend.blocking:
+            return await run_in_threadpool(method, *args)
+        return method(*args)
+
+    def on_changes(self, changes: List[SpendingChange]) -> None:
+        """Evict results whose window contains a day touched by the changes."""
+        days = {
+            spending.date.date() if isinstance(spending.date, datetime) else spending.date
+            for change in changes
+            for spending in (change.old, change.new)
+            if spending is not None
+        }
+        if self._invalidator is None:
+            self.backend.invalidate(days)
+        else:
+            self._invalidator.submit(self._invalidate, days)
+
+    def _invalidate(self, days: Set[DateType]) -> None:
+        """Evict on the background thread, logging (not raising) backend errors."""
+        try:
+            self.backend.invalidate(days)
+        except Exception:
+            logger.exception("Could not evict stats cache entries")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for this worker and the backend size."""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "backend": self.backend.name,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "size": self.backend.size(),
+        }
+
+
+def build_stats_cache() -> Optional[StatsCache]:
+    """Create the stats cache configured by STATS_CACHE_BACKEND."""
+    if STATS_CACHE_BACKEND == "none":
+        return None
+    if STATS_CACHE_BACKEND == "redis":
+        return StatsCache(RedisStatsCacheBackend())
+    if STATS_CACHE_BACKEND == "memory":
+        return StatsCache(InMemoryStatsCacheBackend())
+    raise ValueError(f"Unknown STATS_CACHE_BACKEND: {STATS_CACHE_BACKEND}")
+
+
+stats_cache = build_stats_cache()
+if stats_cache is not None:
+    add_change_listener(stats_cache.on_changes)
@@ -0,0 +1,35 @@
+"""Validation helpers for spendings created in bulk."""
+
+from datetime import datetime
+from typing import Any, Dict
+from uuid import uuid4
+
+from pydantic import ValidationError
+
+from app.schemas.spending import SpendingCreate, SpendingResponse
+
+
+def validate_new_spending(item: Dict[str, Any], created_at: datetime) -> SpendingResponse:
+    """
+    Validate a raw item against SpendingCreate and build the spending to store.
+
+    Raises:
+        ValidationError: If the item does not satisfy SpendingCreate.
+    """
+    spending_data = SpendingCreate.model_validate(item)
+    return SpendingResponse(
+        id=uuid4(),
+        amount=spending_data.amount,
+        category=spending_data.category,
+        description=spending_data.description,
+        date=spending_data.date or created_at,
+        created_at=created_at
+    )
+
+
+def format_validation_error(exc: ValidationError) -> str:
+    """Flatten a pydantic ValidationError into a single line."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'spending'}: {error['msg']}"
+        for error in exc.errors()
+    )
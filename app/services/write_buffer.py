@@ -0,0 +1,149 @@
+"""Group commit of concurrently created spendings."""
+
+import asyncio
+import logging
+import os
+from typing import List, Optional, Tuple
+
+from app.database.base import session_scope
+from app.schemas.spending import SpendingResponse, SpendingWriteResponse
+from app.storage.async_database import AsyncDatabaseStorage
+
+logger = logging.getLogger(__name__)
+
+# Queue POST /spendings rows and write them together in one transaction
+GROUP_COMMIT_ENABLED = os.getenv("GROUP_COMMIT_ENABLED", "false").lower() in ("1", "true", "yes")
+GROUP_COMMIT_BATCH_SIZE = int(os.getenv("GROUP_COMMIT_BATCH_SIZE", "500"))
+GROUP_COMMIT_MAX_WAIT_MS = float(os.getenv("GROUP_COMMIT_MAX_WAIT_MS", "5"))
+GROUP_COMMIT_QUEUE_DEPTH = int(os.getenv("GROUP_COMMIT_QUEUE_DEPTH", "10000"))
+
+
+class WriteBufferFull(Exception):
+    """Raised when a spending is submitted while the queue is at capacity."""
+
+
+class WriteFailed(Exception):
+    """Raised to the callers of a batch that could not be written (the database failed)."""
+
+
+class SpendingRejected(WriteFailed):
+    """Raised to a caller whose spending was rejected by the database; the rest of its batch was written."""
+
+
+class GroupCommitBuffer:
+    """
+    Collects spendings from concurrent requests and writes them in batches.
+
+    A single flusher task takes up to batch_size queued spendings, waiting at
+    most max_wait_ms after the first one, and writes them with one multi-row
+    INSERT and one COMMIT. Each submitter is resumed only after the commit of
+    the batch containing its spending, so a response always means durable.
+    While a batch is being written new spendings keep queueing, so batches
+    grow with load instead of commits.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = GROUP_COMMIT_BATCH_SIZE,
+        max_wait_ms: float = GROUP_COMMIT_MAX_WAIT_MS,
+        queue_depth: int = GROUP_COMMIT_QUEUE_DEPTH
+    ):
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue_depth = queue_depth
+        self._queue: Optional["asyncio.Queue[Tuple[SpendingResponse, asyncio.Future]]"] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the flusher task on the running event loop."""
+        self._queue = asyncio.Queue(maxsize=self.queue_depth)
+        self._flusher = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Write everything still queued, then stop the flusher task."""
+        if self._flusher is None:
+            return
+        await self._queue.join()
+        self._flusher.cancel()
+        try:
+            await self._flusher
+        except asyncio.CancelledError:
+            pass
+        self._flusher = None
+
+    async def submit(self, spending: SpendingResponse) -> SpendingWriteResponse:
+        """
+        Queue a spending and wait until it is committed.
+
+        The budget status is the category's as of this spending, in batch order.
+
+        Raises:
+            WriteBufferFull: If queue_depth spendings are already waiting.
+            SpendingRejected: If the database rejected the spending.
+            WriteFailed: If the whole batch failed.
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((spending, future))
+        except asyncio.QueueFull:
+            raise WriteBufferFull("Too many spendings are waiting to be written") from None
+        return await future
+
+    def depth(self) -> int:
+        """Get the number of spendings waiting to be written."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.batch_size:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(self._queue.get_nowait())
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: List[Tuple[SpendingResponse, asyncio.Future]]) -> None:
+        """Write one batch and resume its submitters."""
+        spendings = [spending for spending, _ in batch]
+        try:
+            async with session_scope() as db:
+                # Budget statuses are read in the batch's transaction, each as of its own row
+                results = await AsyncDatabaseStorage(db).create_grouped(spendings)
+        except Exception as exc:
+            logger.exception("Group commit of %d spendings failed", len(batch))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(WriteFailed(str(exc)))
+            return
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                # The request was cancelled; its spending is written anyway
+                continue
+            if isinstance(result, str):
+                future.set_exception(SpendingRejected(result))
+            else:
+                future.set_result(result)
+
+
+def build_write_buffer() -> Optional[GroupCommitBuffer]:
+    """Create the group commit buffer if GROUP_COMMIT_ENABLED is set."""
+    if not GROUP_COMMIT_ENABLED:
+        return None
+    return GroupCommitBuffer()
+
+
+write_buffer = build_write_buffer()
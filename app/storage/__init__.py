@@ -1,6 +1,7 @@
 """Storage layer for data persistence."""
 
+from app.storage.async_database import AsyncDatabaseStorage
 from app.storage.database import DatabaseStorage
 
-__all__ = ["DatabaseStorage"]
+__all__ = ["DatabaseStorage", "AsyncDatabaseStorage"]
 
@@ -0,0 +1,96 @@
+"""Non-blocking storage facade for use from async request handlers."""
+
+from datetime import datetime
+from typing import AsyncIterator, Callable, List, Optional, Tuple, TypeVar, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from app.schemas.spending import CategoryMatch, SpendingResponse, SpendingWriteResponse
+from app.storage.categories import CategoryStorage
+from app.storage.database import BULK_INSERT_BATCH_SIZE, EXPORT_BATCH_SIZE, DatabaseStorage
+
+T = TypeVar("T")
+
+
+class AsyncDatabaseStorage:
+    """
+    Runs DatabaseStorage code from async handlers.
+
+    The query logic lives in DatabaseStorage only: services pass their unit of
+    work to run(). With an AsyncSession it is driven through
+    AsyncSession.run_sync on the async driver; with a plain Session it runs
+    in the threadpool. Either way the event loop is never blocked on a query.
+    Only the export stream reads natively from an AsyncSession.
+    """
+
+    def __init__(self, db: Union[AsyncSession, Session]):
+        self.db = db
+
+    async def run(self, fn: Callable[[Session], T]) -> T:
+        """Run fn(session) without blocking the event loop."""
+        if isinstance(self.db, AsyncSession):
+            return await self.db.run_sync(fn)
+        return await run_in_threadpool(fn, self.db)
+
+    async def _call(self, method: str, *args, **kwargs):
+        """Call a DatabaseStorage method through run()."""
+        return await self.run(
+            lambda session: getattr(DatabaseStorage(session), method)(*args, **kwargs)
+        )
+
+    async def bulk_create(
+        self,
+        spendings: List[SpendingResponse],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+        atomic: bool = True
+    ) -> List[Tuple[int, str]]:
+        """Create many spending entries with batched multi-row INSERTs."""
+        return await self._call("bulk_create", spendings, batch_size=batch_size, atomic=atomic)
+
+    async def create_grouped(self, spendings: List[SpendingResponse]) -> List[Union[SpendingWriteResponse, str]]:
+        """Create the spendings of concurrent create requests in one transaction, each with its budget status."""
+        return await self._call("create_grouped", spendings)
+
+    async def stream_export_rows(
+        self,
+        category: Optional[str] = None,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        date: Optional[datetime] = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+        category_match: CategoryMatch = CategoryMatch.contains
+    ) -> AsyncIterator[List[Tuple]]:
+        """Stream spendings for export in batches from a server-side cursor."""
+        if isinstance(self.db, AsyncSession):
+            category_ids = None
+            if category:
+                category_ids = await self.run(
+                    lambda session: CategoryStorage(session).match_ids(category, category_match)
+                )
+            names = await self.run(lambda session: CategoryStorage(session).names_by_id())
+            statement = DatabaseStorage.export_statement(
+                category_ids=category_ids, year=year, month=month, date=date
+            )
+            result = await self.db.stream(statement.execution_options(yield_per=batch_size))
+            try:
+                async for partition in result.partitions():
+                    if {row[2] for row in partition} - names.keys():
+                        # Categories created while the export is running
+                        names = await self.run(lambda session: CategoryStorage(session).reload())
+                    yield DatabaseStorage.resolve_category_names(partition, names)
+            finally:
+                await result.close()
+            return
+
+        rows = DatabaseStorage(self.db).iter_export_rows(
+            category=category,
+            year=year,
+            month=month,
+            date=date,
+            batch_size=batch_size,
+            category_match=category_match
+        )
+        async for partition in iterate_in_threadpool(rows):
+            yield partition
@@ -0,0 +1,225 @@
+"""Storage for category budgets and their status."""
+
+from datetime import date as DateType
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import and_, delete, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.models.budget import Budget
+from app.models.category import Category
+from app.models.rollup import SpendingMonthlyRollup
+from app.schemas.budget import BudgetResponse, BudgetStatus
+from app.storage.categories import CategoryStorage
+from app.models.types import from_cents, to_cents
+from app.storage.rollups import MonthlyTotals
+
+BUDGET_COLUMNS = (Budget.id, Category.name, Budget.monthly_limit, Budget.created_at, Budget.updated_at)
+
+
+class BudgetStorage:
+    """Database storage for budgets; status is read from the monthly rollups."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.categories = CategoryStorage(db)
+
+    def _select(self):
+        return select(*BUDGET_COLUMNS).join(Category, Budget.category_id == Category.id)
+
+    def get_all(self) -> List[BudgetResponse]:
+        """Get all budgets ordered by category."""
+        rows = self.db.execute(self._select().order_by(Category.name)).all()
+        return [self._row_to_response(row) for row in rows]
+
+    def get_by_id(self, budget_id: int) -> Optional[BudgetResponse]:
+        """Get a budget by ID."""
+        row = self.db.execute(self._select().where(Budget.id == budget_id)).one_or_none()
+        return self._row_to_response(row) if row is not None else None
+
+    def get_by_category(self, category: str) -> Optional[BudgetResponse]:
+        """Get the budget of a category, if it has one."""
+        row = self.db.execute(self._select().where(Category.name == category)).one_or_none()
+        return self._row_to_response(row) if row is not None else None
+
+    def create(self, category: str, monthly_limit: float) -> BudgetResponse:
+        """Create a budget, creating the category if needed."""
+        category_id = self.categories.get_or_create_ids([category])[category]
+        now = datetime.now()
+        budget_id = self.db.execute(
+            insert(Budget)
+            .values(category_id=category_id, monthly_limit=monthly_limit, created_at=now, updated_at=now)
+            .returning(Budget.id)
+        ).scalar_one()
+        self.db.commit()
+        return BudgetResponse(
+            id=budget_id, category=category, monthly_limit=monthly_limit, created_at=now, updated_at=now
+        )
+
+    def update(self, budget_id: int, monthly_limit: float) -> Optional[BudgetResponse]:
+        """Change a budget's limit. Returns None if no budget has this ID."""
+        row = self.db.execute(
+            update(Budget)
+            .where(Budget.id == budget_id)
+            .values(monthly_limit=monthly_limit, updated_at=datetime.now())
+            .returning(Budget.id, Budget.category_id, Budget.monthly_limit, Budget.created_at, Budget.updated_at)
+        ).one_or_none()
+        if row is None:
+            self.db.rollback()
+            return None
+        self.db.commit()
+        budget_id, category_id, monthly_limit, created_at, updated_at = row
+        return BudgetResponse(
+            id=budget_id,
+            category=self.categories.name(category_id),
+            monthly_limit=monthly_limit,
+            created_at=created_at,
+            updated_at=updated_at
+        )
+
+    def delete(self, budget_id: int) -> bool:
+        """Delete a budget. Returns True if deleted, False if not found."""
+        deleted = self.db.execute(
+            delete(Budget).where(Budget.id == budget_id).returning(Budget.id)
+        ).one_or_none()
+        if deleted is None:
+            self.db.rollback()
+            return False
+        self.db.commit()
+        return True
+
+    def get_status(self, month: DateType, category: Optional[str] = None) -> List[BudgetStatus]:
+        """
+        Get every budget's status for a month with one indexed join.
+
+        Spent amounts come from the running monthly rollups, so the cost
+        depends on the number of budgets, not on the number of spendings.
+        """
+        statement = (
+            select(
+                Budget.id,
+                Category.name,
+                Budget.monthly_limit,
+                SpendingMonthlyRollup.total_amount,
+                SpendingMonthlyRollup.spending_count
+            )
+            .join(Category, Budget.category_id == Category.id)
+            .outerjoin(
+                SpendingMonthlyRollup,
+                and_(SpendingMonthlyRollup.category == Category.name, SpendingMonthlyRollup.month == month)
+            )
+            .order_by(Category.name)
+        )
+        if category is not None:
+            statement = statement.where(Category.name == category)
+        return [
+            self._status(budget_id, name, month, monthly_limit, spent or 0.0, count or 0)
+            for budget_id, name, monthly_limit, spent, count in self.db.execute(statement)
+        ]
+
+    def check(self, totals: MonthlyTotals) -> Dict[Tuple[DateType, str], BudgetStatus]:
+        """
+        Get the budget status of (month, category) running totals returned by a write.
+
+        One indexed lookup of the categories' limits; nothing is re-summed.
+        """
+        if not totals:
+            return {}
+        rows = self.db.execute(
+            select(Category.name, Budget.id, Budget.monthly_limit)
+            .join(Category, Budget.category_id == Category.id)
+            .where(Category.name.in_({category for _, category in totals}))
+        )
+        budgets = {name: (budget_id, monthly_limit) for name, budget_id, monthly_limit in rows}
+        return {
+            (month, category): self._status(budgets[category][0], category, month, budgets[category][1], spent, count)
+            for (month, category), (spent, count) in totals.items()
+            if category in budgets
+        }
+
+    def check_each(
+        self,
+        totals: MonthlyTotals,
+        spendings: Sequence[Tuple[DateType, str, float]]
+    ) -> List[Optional[BudgetStatus]]:
+        """
+        Get the budget status right after each of several spendings written together, in order.
+
+        totals are the running totals after all of them (as returned by
+        RollupStorage.apply). The status of each spending leaves out the ones
+        after it, as if they had been written one by one in that order.
+
+        Args:
+            totals: Monthly totals after the write.
+            spendings: (month, category, amount) of each spending written.
+        """
+        final = self.check(totals)
+        # Walk back from the final totals, in cents so the subtractions are exact
+        running = {key: [to_cents(spent), count] for key, (spent, count) in totals.items()}
+        statuses: List[Optional[BudgetStatus]] = [None] * len(spendings)
+        for position in reversed(range(len(spendings))):
+            month, category, amount = spendings[position]
+            status = final.get((month, category))
+            if status is None:
+                continue
+            cents, count = running[(month, category)]
+            statuses[position] = self._status(
+                status.budget_id, category, month, status.monthly_limit, from_cents(cents), count
+            )
+            running[(month, category)] = [cents - to_cents(amount), count - 1]
+        return statuses
+
+    def get_statuses(self, keys: Set[Tuple[DateType, str]]) -> Dict[Tuple[DateType, str], BudgetStatus]:
+        """Get the budget status of (month, category) pairs with one join (after a bulk write)."""
+        if not keys:
+            return {}
+        rows = self.db.execute(
+            select(
+                Budget.id,
+                Category.name,
+                SpendingMonthlyRollup.month,
+                Budget.monthly_limit,
+                SpendingMonthlyRollup.total_amount,
+                SpendingMonthlyRollup.spending_count
+            )
+            .join(Category, Budget.category_id == Category.id)
+            .join(SpendingMonthlyRollup, SpendingMonthlyRollup.category == Category.name)
+            .where(tuple_(SpendingMonthlyRollup.month, SpendingMonthlyRollup.category).in_(keys))
+        )
+        return {
+            (month, name): self._status(budget_id, name, month, monthly_limit, spent, count)
+            for budget_id, name, month, monthly_limit, spent, count in rows
+        }
+
+    @staticmethod
+    def _status(
+        budget_id: int,
+        category: str,
+        month: DateType,
+        monthly_limit: float,
+        spent: float,
+        count: int
+    ) -> BudgetStatus:
+        return BudgetStatus(
+            budget_id=budget_id,
+            category=category,
+            month=month,
+            monthly_limit=monthly_limit,
+            spent=round(spent, 2),
+            remaining=round(monthly_limit - spent, 2),
+            percent_used=round(spent / monthly_limit * 100, 2) if monthly_limit else 0.0,
+            spending_count=count,
+            exceeded=spent > monthly_limit
+        )
+
+    @staticmethod
+    def _row_to_response(row) -> BudgetResponse:
+        budget_id, category, monthly_limit, created_at, updated_at = row
+        return BudgetResponse(
+            id=budget_id,
+            category=category,
+            monthly_limit=monthly_limit,
+            created_at=created_at,
+            updated_at=updated_at
+        )
@@ -0,0 +1,125 @@
+"""Storage for the category dictionary."""
+
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.category import Category
+from app.schemas.spending import CategoryMatch
+
+
+class CategoryStorage:
+    """
+    Category dictionary storage with a process-wide id/name cache.
+
+    Categories are never renamed or deleted, so cached mappings never go
+    stale; an unknown id or name triggers a single reload query.
+    """
+
+    _lock = threading.Lock()
+    _ids_by_name: Dict[str, int] = {}
+    _names_by_id: Dict[int, str] = {}
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def name(self, category_id: int) -> str:
+        """Get the name of a category id."""
+        name = self._names_by_id.get(category_id)
+        if name is None:
+            self.reload()
+            name = self._names_by_id[category_id]
+        return name
+
+    def names_by_id(self) -> Dict[int, str]:
+        """Get a snapshot of the id -> name mapping."""
+        if not self._names_by_id:
+            self.reload()
+        return dict(self._names_by_id)
+
+    def get_id(self, name: str) -> Optional[int]:
+        """Get the id of a category name, or None if it doesn't exist."""
+        category_id = self._ids_by_name.get(name)
+        if category_id is None:
+            category_id = self.db.execute(
+                select(Category.id).where(Category.name == name)
+            ).scalar()
+            if category_id is not None:
+                self._remember({name: category_id})
+        return category_id
+
+    def get_or_create_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        """
+        Get the ids of category names, creating missing categories.
+
+        Missing categories are inserted in the current transaction (without
+        committing). Their ids are not cached until they have been read back
+        after commit, so a rolled-back insert can't leave a stale mapping.
+        """
+        names = set(names)
+        ids = {name: self._ids_by_name[name] for name in names if name in self._ids_by_name}
+        missing = names - ids.keys()
+        if not missing:
+            return ids
+
+        existing = dict(
+            self.db.execute(select(Category.name, Category.id).where(Category.name.in_(missing))).all()
+        )
+        self._remember(existing)
+        ids.update(existing)
+        missing -= existing.keys()
+        if not missing:
+            return ids
+
+        dialect = self.db.get_bind().dialect.name
+        rows = [{"name": name} for name in sorted(missing)]
+        if dialect in ("postgresql", "sqlite"):
+            dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            self.db.execute(dialect_insert(Category).values(rows).on_conflict_do_nothing())
+        else:
+            self.db.execute(insert(Category), rows)
+        ids.update(
+            self.db.execute(select(Category.name, Category.id).where(Category.name.in_(missing))).all()
+        )
+        return ids
+
+    def match_ids(self, term: str, match: CategoryMatch = CategoryMatch.contains) -> List[int]:
+        """
+        Find the ids of categories matching a search term.
+
+        - exact: the category name equals the term (unique index)
+        - prefix: the name starts with the term, case-insensitive (lower(name) index)
+        - contains: the name contains the term, case-insensitive (trigram index on PostgreSQL)
+
+        The dictionary is tiny compared to spendings, so spendings are then
+        filtered with an indexed category_id IN (...) instead of a text scan.
+        """
+        if match == CategoryMatch.exact:
+            category_id = self.get_id(term)
+            return [category_id] if category_id is not None else []
+
+        if match == CategoryMatch.prefix:
+            condition = func.lower(Category.name).startswith(term.lower(), autoescape=True)
+        else:
+            escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            condition = Category.name.ilike(f"%{escaped}%", escape="\\")
+        rows = self.db.execute(select(Category.name, Category.id).where(condition)).all()
+        self._remember(dict(rows))
+        return [category_id for _, category_id in rows]
+
+    def reload(self) -> Dict[int, str]:
+        """Reload the whole dictionary into the cache with one query and return id -> name."""
+        self._remember(dict(self.db.execute(select(Category.name, Category.id)).all()))
+        return dict(self._names_by_id)
+
+    @classmethod
+    def _remember(cls, ids_by_name: Dict[str, int]) -> None:
+        """Add name -> id mappings to the process-wide cache."""
+        if not ids_by_name:
+            return
+        with cls._lock:
+            cls._ids_by_name.update(ids_by_name)
+            cls._names_by_id.update({category_id: name for name, category_id in ids_by_name.items()})
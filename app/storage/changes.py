@@ -0,0 +1,72 @@
+"""Change feed support: the sync horizon and spending tombstones."""
+
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, select, text, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.tombstone import SpendingTombstone
+from app.models.types import utcnow
+
+# Databases other than PostgreSQL can't list open transactions; the change feed
+# stops this many seconds short of their clock so in-flight writes can commit first
+SYNC_SETTLE_SECONDS = float(os.getenv("SYNC_SETTLE_SECONDS", "2"))
+
+# Days tombstones are kept; change tokens older than this must resync from scratch
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "90"))
+
+# (updated_at or deleted_at, id): position of a row in the change feed
+ChangeKey = Tuple[datetime, UUID]
+
+
+class ChangeStorage:
+    """Horizon and tombstone queries of the change feed."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def horizon(self) -> datetime:
+        """
+        Get the time before which every change is committed (UTC, database clock).
+
+        Rows are stamped by the database with their transaction's start time
+        on PostgreSQL, so changes older than the oldest open transaction can
+        no longer appear behind a client's token. Elsewhere the horizon is
+        SYNC_SETTLE_SECONDS before the database clock.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            return self.db.execute(text(
+                "SELECT timezone('utc', least(now(), coalesce(min(xact_start), now()))) "
+                "FROM pg_stat_activity "
+                "WHERE datname = current_database() AND backend_type = 'client backend' "
+                "AND xact_start IS NOT NULL AND pid <> pg_backend_pid()"
+            )).scalar_one()
+        return self.db.execute(select(utcnow())).scalar_one() - timedelta(seconds=SYNC_SETTLE_SECONDS)
+
+    def tombstones(self, after: Optional[ChangeKey], until: datetime, limit: int) -> List[ChangeKey]:
+        """Get (deleted_at, id) of up to limit deletions after a key and before until, in feed order."""
+        statement = select(SpendingTombstone.deleted_at, SpendingTombstone.id).where(
+            SpendingTombstone.deleted_at < until
+        )
+        if after is not None:
+            statement = statement.where(tuple_(SpendingTombstone.deleted_at, SpendingTombstone.id) > after)
+        statement = statement.order_by(SpendingTombstone.deleted_at, SpendingTombstone.id).limit(limit)
+        return [tuple(row) for row in self.db.execute(statement)]
+
+    def purge_tombstones(self, retention_days: int = SYNC_TOMBSTONE_RETENTION_DAYS) -> int:
+        """
+        Delete tombstones older than the retention period and commit.
+
+        Tokens from before the same cutoff are rejected by the change feed,
+        so no client can miss a deletion whose tombstone is gone.
+
+        Returns:
+            Number of tombstones removed.
+        """
+        cutoff = self.db.execute(select(utcnow())).scalar_one() - timedelta(days=retention_days)
+        result = self.db.execute(delete(SpendingTombstone).where(SpendingTombstone.deleted_at < cutoff))
+        self.db.commit()
+        return result.rowcount
@@ -1,13 +1,46 @@
 """Database storage implementation for spendings."""
 
-from datetime import datetime
-from typing import List, Optional
+import io
+import os
+from datetime import date as DateType
+from datetime import datetime, time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from uuid import UUID
 
-from sqlalchemy.orm import Session
+from sqlalchemy import BigInteger, Row, Select, delete, extract, func, insert, select, tuple_, type_coerce, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Query, Session
 
 from app.models.spending import Spending
-from app.schemas.spending import SpendingResponse
+from app.models.tombstone import SpendingTombstone
+from app.schemas.aggregate import CategoryTotal, SpendingAggregate
+from app.schemas.budget import BudgetStatus
+from app.schemas.spending import CategoryMatch, SpendingResponse, SpendingWriteResponse
+from app.schemas.visualization import TimeBucket
+from app.storage.budgets import BudgetStorage
+from app.storage.categories import CategoryStorage
+from app.storage.changes import ChangeKey, ChangeStorage
+from app.storage.events import SpendingChange, publish_changes
+from app.storage.rollups import STATS_USE_ROLLUPS, RollupDeltas, RollupStorage, month_start, rollup_day_range
+from app.storage.search import search_select
+from app.storage.timeseries import date_bucket, to_date
+from app.storage.versions import VersionStorage
+
+# Default number of rows written per INSERT (or COPY) batch by bulk_create
+BULK_INSERT_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", "1000"))
+
+# Rows fetched per round-trip from the server-side cursor used by exports
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# Columns selected or RETURNed as plain rows, in SpendingResponse field order
+ROW_COLUMNS = (
+    Spending.id,
+    Spending.amount,
+    Spending.category_id,
+    Spending.description,
+    Spending.date,
+    Spending.created_at
+)
 
 
 class DatabaseStorage:
@@ -15,104 +48,716 @@ class DatabaseStorage:
 
     def __init__(self, db: Session):
         self.db = db
+        self.categories = CategoryStorage(db)
+        self.rollups = RollupStorage(db)
+        self.budgets = BudgetStorage(db)
+        self.versions = VersionStorage(db)
 
-    def create(self, spending: SpendingResponse) -> SpendingResponse:
-        """Create a new spending entry."""
-        db_spending = Spending(
-            id=str(spending.id),
-            amount=spending.amount,
-            category=spending.category,
-            description=spending.description,
-            date=spending.date,
-            created_at=spending.created_at
-        )
-        self.db.add(db_spending)
+    def create(self, spending: SpendingResponse) -> SpendingWriteResponse:
+        """
+        Create a new spending entry with a single INSERT ... RETURNING.
+
+        The category's monthly running total comes back from the rollup
+        upsert and is checked against its budget in the same transaction.
+        """
+        category_ids = self.categories.get_or_create_ids([spending.category])
+        row = self.db.execute(
+            insert(Spending)
+            .values(self._to_row(spending, category_ids[spending.category]))
+            .returning(*ROW_COLUMNS)
+        ).one()
+        deltas = RollupDeltas()
+        deltas.add(spending.date, spending.category, spending.amount)
+        budgets = self.budgets.check(self.rollups.apply(deltas))
+        versions = self.versions.bump(deltas.months())
         self.db.commit()
-        self.db.refresh(db_spending)
-        return self._to_response(db_spending)
+        created = self._with_budget(self._row_to_response(row, spending.category), budgets, increased=True)
+        publish_changes([SpendingChange("created", None, created, versions)])
+        return created
 
-    def get_all(self, category: Optional[str] = None) -> List[SpendingResponse]:
-        """Get all spendings, optionally filtered by category."""
-        query = self.db.query(Spending)
-        if category:
-            query = query.filter(Spending.category.ilike(f"%{category}%"))
-        db_spendings = query.order_by(Spending.date.desc()).all()
+    def bulk_create(
+        self,
+        spendings: List[SpendingResponse],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+        atomic: bool = True
+    ) -> List[Tuple[int, str]]:
+        """
+        Create many spending entries with batched multi-row INSERTs.
+
+        On PostgreSQL with psycopg2, atomic batches are written with COPY instead.
+
+        Args:
+            spendings: Spendings to create.
+            batch_size: Number of rows per INSERT/COPY statement.
+            atomic: If True, any failure rolls back every batch and is re-raised.
+                If False, a failing batch is retried row by row inside savepoints
+                and only the offending rows are skipped.
+
+        Returns:
+            (position, error) for each spending that was not created. Always empty when atomic.
+        """
+        return self._create_many(spendings, batch_size, atomic)[0]
+
+    def create_grouped(self, spendings: List[SpendingResponse]) -> List[Union[SpendingWriteResponse, str]]:
+        """
+        Create the spendings of concurrent create requests in one transaction (group commit).
+
+        Rows the database rejects are skipped. Each created spending gets the
+        budget status of its category right after it, as if the spendings had
+        been created one by one in order.
+
+        Returns:
+            For each spending, in order: the created spending, or the error that rejected it.
+        """
+        failed, statuses = self._create_many(spendings, len(spendings), atomic=False, check_budgets=True)
+        errors = dict(failed)
+        return [
+            errors[position] if position in errors else SpendingWriteResponse(
+                **spending.model_dump(),
+                over_budget=status is not None and status.exceeded,
+                budget=status
+            )
+            for position, (spending, status) in enumerate(zip(spendings, statuses))
+        ]
+
+    def _create_many(
+        self,
+        spendings: List[SpendingResponse],
+        batch_size: int,
+        atomic: bool,
+        check_budgets: bool = False
+    ) -> Tuple[List[Tuple[int, str]], List[Optional[BudgetStatus]]]:
+        """
+        Insert spendings and update the rollups in one transaction (see bulk_create).
+
+        Returns:
+            (position, error) of each spending that was not created, and, with
+            check_budgets, the budget status right after each created spending
+            (None for the others and when unchecked).
+        """
+        use_copy = atomic and self._supports_copy()
+        failed: List[Tuple[int, str]] = []
+        try:
+            category_ids = self.categories.get_or_create_ids({s.category for s in spendings})
+            rows = [self._to_row(s, category_ids[s.category]) for s in spendings]
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                if atomic:
+                    if use_copy:
+                        self._copy_batch(batch)
+                    else:
+                        self._insert_batch(batch)
+                    continue
+                try:
+                    with self.db.begin_nested():
+                        self._insert_batch(batch)
+                except SQLAlchemyError:
+                    # Isolate the rows that made the batch fail
+                    for offset, row in enumerate(batch):
+                        try:
+                            with self.db.begin_nested():
+                                self._insert_batch([row])
+                        except SQLAlchemyError as exc:
+                            failed.append((start + offset, str(getattr(exc, "orig", exc))))
+
+            failed_positions = {position for position, _ in failed}
+            created = [
+                (position, spending) for position, spending in enumerate(spendings)
+                if position not in failed_positions
+            ]
+            deltas = RollupDeltas()
+            for _, spending in created:
+                deltas.add(spending.date, spending.category, spending.amount)
+            totals = self.rollups.apply(deltas)
+            statuses: List[Optional[BudgetStatus]] = [None] * len(spendings)
+            if check_budgets:
+                checked = self.budgets.check_each(totals, [
+                    (month_start(spending.date), spending.category, spending.amount) for _, spending in created
+                ])
+                for (position, _), status in zip(created, checked):
+                    statuses[position] = status
+            versions = self.versions.bump(deltas.months())
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        publish_changes([SpendingChange("created", None, spending, versions) for _, spending in created])
+        return failed, statuses
+
+    def _insert_batch(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert rows with a single multi-row INSERT statement."""
+        self.db.execute(insert(Spending), rows)
+
+    def _supports_copy(self) -> bool:
+        """Whether the current connection can load rows with PostgreSQL COPY."""
+        dialect = self.db.get_bind().dialect
+        return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+    def _copy_batch(self, rows: List[Dict[str, Any]]) -> None:
+        """Load rows with COPY ... FROM STDIN in the session's transaction."""
+        columns = [Spending.__table__.c[key] for key in rows[0]]
+        # COPY bypasses the column types, so convert ids and amounts to their stored form
+        dialect = self.db.get_bind().dialect
+        processors = [column.type.bind_processor(dialect) or (lambda value: value) for column in columns]
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(
+                self._copy_value(process(row[column.key])) for column, process in zip(columns, processors)
+            ))
+            buffer.write("\n")
+        buffer.seek(0)
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {Spending.__tablename__} ({', '.join(column.name for column in columns)}) FROM STDIN",
+                buffer
+            )
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _copy_value(value: Any) -> str:
+        """Format a value for COPY text format."""
+        if value is None:
+            return "\\N"
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return (
+            str(value)
+            .replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
+
+    def get_page(
+        self,
+        category: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        category_match: CategoryMatch = CategoryMatch.contains
+    ) -> List[SpendingResponse]:
+        """
+        Get one page of spendings ordered by (date, id) descending.
+
+        Args:
+            category: Optional category filter.
+            limit: Maximum number of rows to return.
+            offset: Number of rows to skip (LIMIT/OFFSET mode).
+            after: (date, id) of the last row of the previous page (keyset mode).
+                Rows strictly after it in sort order are returned, so deep pages
+                cost the same as the first one.
+            category_match: How category is matched (exact, prefix or contains).
+
+        Returns:
+            At most `limit` spendings.
+        """
+        query = self._filter_category(self.db.query(Spending), category, category_match)
+        query = query.order_by(Spending.date.desc(), Spending.id.desc())
+        db_spendings = self._paginate(query, limit, offset, after).all()
         return [self._to_response(s) for s in db_spendings]
 
+    def get_page_rows(
+        self,
+        category: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        category_match: CategoryMatch = CategoryMatch.contains
+    ) -> List[Tuple]:
+        """
+        Get the same page as get_page as plain column tuples.
+
+        Skips ORM objects and SpendingResponse models entirely; rows are
+        (id, amount, category, description, date, created_at) in
+        SpendingResponse field order, ready for encode_spending_rows.
+        """
+        category_ids = self.categories.match_ids(category, category_match) if category else None
+        statement = self._paginate(self.export_statement(category_ids=category_ids), limit, offset, after)
+        rows = self.db.execute(statement).all()
+        return self.resolve_category_names(rows, self.categories.names_by_id(), self.categories)
+
+    def search(
+        self,
+        q: str,
+        limit: int = 50,
+        after: Optional[Tuple[float, datetime, UUID]] = None,
+        category: Optional[str] = None,
+        category_match: CategoryMatch = CategoryMatch.contains,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        date: Optional[datetime] = None
+    ) -> List[Tuple[SpendingResponse, float]]:
+        """
+        Full-text search of descriptions, best matches first.
+
+        The match runs on the full-text index (GIN on PostgreSQL, FTS5 on
+        SQLite), with the category and date filters in the same query.
+
+        Args:
+            q: Search string.
+            limit: Maximum number of results.
+            after: (rank, date, id) of the last result of the previous page.
+            category: Optional category filter.
+            category_match: How category is matched (exact, prefix or contains).
+            year: Optional year filter. Ignored if date is provided.
+            month: Optional month filter. Ignored if date is provided.
+            date: Optional date filter. If provided, takes precedence over year/month.
+
+        Returns:
+            (spending, rank) ordered by rank, then date and id, all descending.
+        """
+        statement = search_select(self.db.get_bind().dialect.name, q, *ROW_COLUMNS)
+        if statement is None:
+            return []
+        if category:
+            statement = statement.where(Spending.category_id.in_(self.categories.match_ids(category, category_match)))
+        statement = self._filter_by_date(statement, year=year, month=month, date=date)
+
+        # Ranked in a subquery so the keyset can compare the computed rank
+        ranked = statement.subquery()
+        key = (ranked.c.rank, ranked.c.date, ranked.c.id)
+        page = select(ranked)
+        if after is not None:
+            page = page.where(tuple_(*key) < after)
+        page = page.order_by(*(column.desc() for column in key)).limit(limit)
+        return [(self._row_to_response(row[:-1]), row[-1]) for row in self.db.execute(page)]
+
     def get_by_id(self, spending_id: UUID) -> Optional[SpendingResponse]:
         """Get a spending by ID."""
-        db_spending = self.db.query(Spending).filter(Spending.id == str(spending_id)).first()
+        db_spending = self.db.query(Spending).filter(Spending.id == spending_id).first()
         if not db_spending:
             return None
         return self._to_response(db_spending)
 
-    def update(self, spending_id: UUID, updated_spending: SpendingResponse) -> Optional[SpendingResponse]:
-        """Update a spending entry."""
-        db_spending = self.db.query(Spending).filter(Spending.id == str(spending_id)).first()
-        if not db_spending:
+    def update(self, spending_id: UUID, changes: Dict[str, Any]) -> Optional[SpendingWriteResponse]:
+        """
+        Update only the given columns of a spending entry.
+
+        The row is changed and read back with one UPDATE ... RETURNING; on
+        PostgreSQL the pre-update values come back in the same statement.
+
+        Args:
+            spending_id: ID of the spending to update.
+            changes: New values keyed by SpendingUpdate field (amount, category,
+                description, date). Fields that are absent are left untouched.
+
+        Returns:
+            The updated spending with its budget check, or None if no spending has this ID.
+        """
+        if not changes:
+            spending = self.get_by_id(spending_id)
+            if spending is None:
+                return None
+            key = (month_start(spending.date), spending.category)
+            return self._with_budget(spending, self.budgets.get_statuses({key}), increased=False)
+
+        values = {key: value for key, value in changes.items() if key != "category"}
+        if "category" in changes:
+            category_ids = self.categories.get_or_create_ids([changes["category"]])
+            values["category_id"] = category_ids[changes["category"]]
+
+        rows = self._update_returning_old(spending_id, values)
+        if rows is None:
             return None
+        old_row, new_row = rows
+        old = self._row_to_response(old_row)
+        updated = self._row_to_response(new_row, changes.get("category"))
 
-        db_spending.amount = updated_spending.amount
-        db_spending.category = updated_spending.category
-        db_spending.description = updated_spending.description
-        db_spending.date = updated_spending.date
+        # Move the old values out of the rollups and the new ones in
+        deltas = RollupDeltas()
+        deltas.remove(old.date, old.category, old.amount)
+        deltas.add(updated.date, updated.category, updated.amount)
+        budgets = self.budgets.check(self.rollups.apply(deltas))
+        versions = self.versions.bump(deltas.months())
 
         self.db.commit()
-        self.db.refresh(db_spending)
-        return self._to_response(db_spending)
+        same_budget_month = (old.category, month_start(old.date)) == (updated.category, month_start(updated.date))
+        updated = self._with_budget(
+            updated, budgets, increased=not same_budget_month or updated.amount > old.amount
+        )
+        publish_changes([SpendingChange("updated", old, updated, versions)])
+        return updated
+
+    def _update_returning_old(
+        self,
+        spending_id: UUID,
+        values: Dict[str, Any]
+    ) -> Optional[Tuple[Tuple, Tuple]]:
+        """
+        UPDATE a spending and return its (old, new) rows in ROW_COLUMNS order.
+
+        On PostgreSQL the old row is locked and read by a CTE of the UPDATE
+        itself, which then targets it by its full (id, date) key. SQLite
+        cannot RETURN columns of other tables, so there the old row is
+        selected first (a local call, not a network round-trip).
+
+        Returns:
+            None if no spending has this ID.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            old = (
+                select(*ROW_COLUMNS)
+                .where(Spending.id == spending_id)
+                .with_for_update()
+                .cte("old")
+            )
+            row = self.db.execute(
+                update(Spending)
+                .where(Spending.id == old.c.id, Spending.date == old.c.date)
+                .values(values)
+                .returning(*ROW_COLUMNS, *(column.label(f"old_{column.name}") for column in old.c))
+            ).one_or_none()
+            if row is None:
+                return None
+            width = len(ROW_COLUMNS)
+            return tuple(row[width:]), tuple(row[:width])
+
+        old_row = self.db.execute(
+            select(*ROW_COLUMNS).where(Spending.id == spending_id).with_for_update()
+        ).one_or_none()
+        if old_row is None:
+            return None
+        new_row = self.db.execute(
+            update(Spending)
+            .where(Spending.id == spending_id)
+            .values(values)
+            .returning(*ROW_COLUMNS)
+        ).one()
+        return tuple(old_row), tuple(new_row)
 
     def delete(self, spending_id: UUID) -> bool:
-        """Delete a spending entry. Returns True if deleted, False if not found."""
-        db_spending = self.db.query(Spending).filter(Spending.id == str(spending_id)).first()
-        if not db_spending:
+        """
+        Delete a spending entry with a single DELETE ... RETURNING.
+
+        A tombstone is left in the same transaction so the change feed can
+        tell syncing clients about the deletion.
+
+        Returns True if deleted, False if not found.
+        """
+        row = self.db.execute(
+            delete(Spending).where(Spending.id == spending_id).returning(*ROW_COLUMNS)
+        ).one_or_none()
+        if row is None:
+            self.db.rollback()
             return False
-        self.db.delete(db_spending)
+        old = self._row_to_response(row)
+        self.db.execute(insert(SpendingTombstone).values(id=old.id))
+        deltas = RollupDeltas()
+        deltas.remove(old.date, old.category, old.amount)
+        self.rollups.apply(deltas)
+        versions = self.versions.bump(deltas.months())
         self.db.commit()
+        publish_changes([SpendingChange("deleted", old, None, versions)])
         return True
 
-    def get_all_spendings(self) -> List[SpendingResponse]:
-        """Get all spendings without filtering."""
-        db_spendings = self.db.query(Spending).order_by(Spending.date.desc()).all()
-        return [self._to_response(s) for s in db_spendings]
+    def get_changes(
+        self,
+        after: Optional[ChangeKey],
+        limit: int
+    ) -> Tuple[List[Tuple[ChangeKey, Optional[SpendingResponse]]], datetime]:
+        """
+        Get up to limit spendings written or deleted after a change feed key.
+
+        Live rows and tombstones are each read with a keyset scan of their
+        (updated_at, id) / (deleted_at, id) index and merged, so the cost
+        depends on the number of changes, not on the size of the table.
 
-    def get_spendings_by_date_range(
+        Returns:
+            (key, spending or None if deleted) in feed order, and the horizon
+            the changes were read up to (see ChangeStorage.horizon).
+        """
+        changes = ChangeStorage(self.db)
+        horizon = changes.horizon()
+        statement = select(*ROW_COLUMNS, Spending.updated_at).where(Spending.updated_at < horizon)
+        if after is not None:
+            statement = statement.where(tuple_(Spending.updated_at, Spending.id) > after)
+        statement = statement.order_by(Spending.updated_at, Spending.id).limit(limit)
+        upserted = [
+            ((row[-1], row[0]), self._row_to_response(row[:-1]))
+            for row in self.db.execute(statement)
+        ]
+        deleted = [(key, None) for key in changes.tombstones(after, horizon, limit)]
+        return sorted(upserted + deleted, key=lambda change: change[0])[:limit], horizon
+
+    def iter_export_rows(
         self,
+        category: Optional[str] = None,
         year: Optional[int] = None,
-        month: Optional[int] = None
-    ) -> List[SpendingResponse]:
-        """Get spendings filtered by year and/or month."""
-        from sqlalchemy import extract
-        from datetime import datetime
+        month: Optional[int] = None,
+        date: Optional[datetime] = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+        category_match: CategoryMatch = CategoryMatch.contains
+    ) -> Iterator[List[Tuple]]:
+        """
+        Stream spendings for export in batches from a server-side cursor.
 
-        query = self.db.query(Spending)
+        Yields lists of (id, amount, category, description, date, created_at) rows,
+        so memory stays bounded by batch_size whatever the total row count.
+        """
+        category_ids = self.categories.match_ids(category, category_match) if category else None
+        statement = self.export_statement(
+            category_ids=category_ids, year=year, month=month, date=date
+        )
+        names = self.categories.names_by_id()
+        result = self.db.execute(statement.execution_options(yield_per=batch_size))
+        try:
+            for partition in result.partitions():
+                yield self.resolve_category_names(partition, names, self.categories)
+        finally:
+            result.close()
 
-        if year is not None:
-            query = query.filter(extract('year', Spending.date) == year)
-        if month is not None:
-            query = query.filter(extract('month', Spending.date) == month)
+    def iter_analytics_columns(self, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[Row]]:
+        """
+        Stream (id, date, category_id, amount in cents) of every spending in batches.
 
-        db_spendings = query.order_by(Spending.date.desc()).all()
-        return [self._to_response(s) for s in db_spendings]
+        Amounts are selected as the stored integer cents, skipping the float
+        conversion, for loading into the columnar analytics snapshot.
+        """
+        statement = select(
+            Spending.id,
+            Spending.date,
+            Spending.category_id,
+            type_coerce(Spending.amount, BigInteger)
+        )
+        result = self.db.execute(statement.execution_options(yield_per=batch_size))
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
 
-    def get_spendings_by_date(self, date: datetime) -> List[SpendingResponse]:
-        """Get spendings filtered by a specific date."""
-        from sqlalchemy import func
+    @staticmethod
+    def resolve_category_names(
+        rows: List[Row],
+        names: Dict[int, str],
+        categories: Optional[CategoryStorage] = None
+    ) -> List[Tuple]:
+        """Replace the category_id column of export rows with the category name."""
+        missing = {row[2] for row in rows} - names.keys()
+        if missing and categories is not None:
+            # Categories created while the export is running
+            names.update(categories.reload())
+        return [
+            (row[0], row[1], names[row[2]], row[3], row[4], row[5])
+            for row in rows
+        ]
 
-        # Filter by date (ignoring time component)
-        target_date = date.date() if isinstance(date, datetime) else date
-        query = self.db.query(Spending).filter(
-            func.date(Spending.date) == target_date
+    @classmethod
+    def export_statement(
+        cls,
+        category_ids: Optional[List[int]] = None,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        date: Optional[datetime] = None
+    ) -> Select:
+        """
+        Build the column-only SELECT used by exports and get_page_rows.
+
+        Selects category_id; resolve_category_names maps it to the name.
+        """
+        statement = select(*ROW_COLUMNS)
+        if category_ids is not None:
+            statement = statement.filter(Spending.category_id.in_(category_ids))
+        statement = cls._filter_by_date(statement, year=year, month=month, date=date)
+        return statement.order_by(Spending.date.desc(), Spending.id.desc())
+
+    def get_aggregate(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        date: Optional[datetime] = None
+    ) -> SpendingAggregate:
+        """
+        Aggregate spendings per category with a single GROUP BY query.
+
+        Filters that line up with day boundaries are answered from the daily
+        rollups, so the cost depends on days × categories rather than rows.
+
+        Args:
+            year: Optional year filter. Ignored if date is provided.
+            month: Optional month filter. Ignored if date is provided.
+            date: Optional date filter. If provided, takes precedence over year/month.
+
+        Returns:
+            SpendingAggregate with overall count, sum and average plus per-category totals.
+        """
+        day_range = rollup_day_range(year=year, month=month, date=date)
+        if STATS_USE_ROLLUPS and day_range is not None:
+            return self._build_aggregate(self.rollups.aggregate(*day_range))
+
+        query = self.db.query(
+            Spending.category_id,
+            func.sum(Spending.amount),
+            func.count(Spending.id)
         )
-        db_spendings = query.order_by(Spending.date.desc()).all()
-        return [self._to_response(s) for s in db_spendings]
+        query = self._filter_by_date(query, year=year, month=month, date=date)
+        rows = query.group_by(Spending.category_id).all()
+        return self._build_aggregate(
+            [(self.categories.name(category_id), amount, count) for category_id, amount, count in rows]
+        )
+
+    def get_timeseries(
+        self,
+        start: DateType,
+        end: DateType,
+        bucket: TimeBucket,
+        category: Optional[str] = None
+    ) -> List[Tuple[DateType, float, int]]:
+        """
+        Get spending totals per time bucket with one grouped query.
+
+        Args:
+            start: First day included.
+            end: First day excluded.
+            bucket: Bucket size (day, week or month).
+            category: Optional exact category filter.
+
+        Returns:
+            (bucket start, total amount, count) for each non-empty bucket, in order.
+        """
+        if STATS_USE_ROLLUPS:
+            return self.rollups.timeseries(start, end, bucket, category=category)
+
+        bucket_column = date_bucket(Spending.date, bucket, self.db.get_bind().dialect.name)
+        query = self.db.query(
+            bucket_column,
+            func.sum(Spending.amount),
+            func.count(Spending.id)
+        ).filter(
+            Spending.date >= datetime.combine(start, time.min),
+            Spending.date < datetime.combine(end, time.min)
+        )
+        if category:
+            query = query.filter(Spending.category_id == self.categories.get_id(category))
+        rows = query.group_by(bucket_column).order_by(bucket_column).all()
+        return [(to_date(day), float(amount or 0.0), int(count or 0)) for day, amount, count in rows]
+
+    @staticmethod
+    def _build_aggregate(rows) -> SpendingAggregate:
+        """Build a SpendingAggregate from (category, amount, count) rows."""
+        by_category = {
+            category: CategoryTotal(amount=float(amount or 0.0), count=int(count))
+            for category, amount, count in sorted(rows, key=lambda r: r[1] or 0.0, reverse=True)
+        }
+        total_count = sum(c.count for c in by_category.values())
+        total_amount = sum(c.amount for c in by_category.values())
+        return SpendingAggregate(
+            total_count=total_count,
+            total_amount=total_amount,
+            average_amount=total_amount / total_count if total_count else 0.0,
+            by_category=by_category
+        )
+
+    @staticmethod
+    def _filter_by_date(
+        query: Union[Query, Select],
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        date: Optional[datetime] = None
+    ) -> Union[Query, Select]:
+        """
+        Apply the date or year/month filters shared by list and stats queries.
+
+        Filters are expressed as half-open [start, end) timestamp ranges on the
+        bare column so the planner can use the date indexes and, when spendings
+        is partitioned by month, skip every partition outside the range. A
+        month without a year (rejected by the API) has to look at all of them.
+        """
+        day_range = rollup_day_range(year=year, month=month, date=date)
+        if day_range is None:
+            # A month without a year isn't a contiguous range
+            return query.filter(extract('month', Spending.date) == month)
+
+        start, end = day_range
+        if start is not None:
+            query = query.filter(Spending.date >= datetime.combine(start, time.min))
+        if end is not None:
+            query = query.filter(Spending.date < datetime.combine(end, time.min))
+        return query
+
+    def _filter_category(
+        self,
+        query: Query,
+        category: Optional[str],
+        category_match: CategoryMatch
+    ) -> Query:
+        """Filter by category through the category dictionary (indexed category_id IN)."""
+        if not category:
+            return query
+        return query.filter(Spending.category_id.in_(self.categories.match_ids(category, category_match)))
+
+    @staticmethod
+    def _paginate(
+        query: Union[Query, Select],
+        limit: int,
+        offset: int = 0,
+        after: Optional[Tuple[datetime, UUID]] = None
+    ) -> Union[Query, Select]:
+        """
+        Apply keyset (after) and LIMIT/OFFSET pagination to a (date, id) ordered query.
+
+        The row comparison is repeated as a plain bound on date, which the
+        planner can use to skip monthly partitions newer than the cursor.
+        """
+        if after is not None:
+            query = query.filter(Spending.date <= after[0], tuple_(Spending.date, Spending.id) < after)
+        if offset:
+            query = query.offset(offset)
+        return query.limit(limit)
 
     @staticmethod
-    def _to_response(db_spending: Spending) -> SpendingResponse:
-        """Convert database model to response schema."""
+    def _to_row(spending: SpendingResponse, category_id: int) -> Dict[str, Any]:
+        """Convert response schema to a column dict for bulk writes."""
+        return {
+            "id": spending.id,
+            "amount": spending.amount,
+            "category_id": category_id,
+            "description": spending.description,
+            "date": spending.date,
+            "created_at": spending.created_at
+        }
+
+    @staticmethod
+    def _with_budget(
+        spending: SpendingResponse,
+        budgets: Dict[Tuple[DateType, str], BudgetStatus],
+        increased: bool
+    ) -> SpendingWriteResponse:
+        """Attach the budget status of the spending's category and month."""
+        status = budgets.get((month_start(spending.date), spending.category))
+        return SpendingWriteResponse(
+            **spending.model_dump(),
+            over_budget=status is not None and status.exceeded and increased,
+            budget=status
+        )
+
+    def _row_to_response(self, row: Sequence[Any], category: Optional[str] = None) -> SpendingResponse:
+        """
+        Convert a ROW_COLUMNS row to response schema.
+
+        The category name comes from the cached dictionary unless given.
+        """
+        spending_id, amount, category_id, description, date, created_at = row
+        return SpendingResponse(
+            id=spending_id,
+            amount=amount,
+            category=category if category is not None else self.categories.name(category_id),
+            description=description,
+            date=date,
+            created_at=created_at
+        )
+
+    def _to_response(self, db_spending: Spending, category: Optional[str] = None) -> SpendingResponse:
+        """
+        Convert database model to response schema.
+
+        The category name comes from the cached dictionary unless given.
+        """
         return SpendingResponse(
-            id=UUID(db_spending.id),
+            id=db_spending.id,
             amount=db_spending.amount,
-            category=db_spending.category,
+            category=category if category is not None else self.categories.name(db_spending.category_id),
             description=db_spending.description,
             date=db_spending.date,
             created_at=db_spending.created_at
@@ -0,0 +1,41 @@
+"""Change notifications published by the storage layer after each commit."""
+
+from datetime import date as DateType
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from app.schemas.spending import SpendingResponse
+
+
+class SpendingChange(NamedTuple):
+    """A committed change to a single spending."""
+
+    action: str  # "created", "updated" or "deleted"
+    old: Optional[SpendingResponse]
+    new: Optional[SpendingResponse]
+    # Data versions the write's transaction gave the months it touched (see VersionStorage.bump)
+    versions: Optional[Dict[DateType, int]] = None
+
+
+ChangeListener = Callable[[List[SpendingChange]], None]
+
+_listeners: List[ChangeListener] = []
+
+
+def add_change_listener(listener: ChangeListener) -> None:
+    """Register a callback invoked with the changes of every committed write."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_change_listener(listener: ChangeListener) -> None:
+    """Unregister a callback added with add_change_listener."""
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def publish_changes(changes: List[SpendingChange]) -> None:
+    """Notify listeners of committed changes. Runs in the writing thread."""
+    if not changes:
+        return
+    for listener in list(_listeners):
+        listener(changes)
@@ -0,0 +1,263 @@
+"""Storage for the per-day and per-month, per-category spending rollups."""
+
+import os
+from datetime import date as DateType
+from datetime import datetime, time, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import Date, cast, delete, func, insert, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.category import Category
+from app.models.rollup import SpendingDailyRollup, SpendingMonthlyRollup
+from app.models.spending import Spending
+from app.models.types import from_cents, to_cents
+from app.schemas.visualization import TimeBucket
+from app.storage.timeseries import date_bucket, to_date
+from app.storage.versions import VersionStorage
+
+# Answer stats queries from the rollup table instead of scanning spendings
+STATS_USE_ROLLUPS = os.getenv("STATS_USE_ROLLUPS", "true").lower() in ("1", "true", "yes")
+
+DayRange = Tuple[Optional[DateType], Optional[DateType]]
+
+# (month, category) -> (total amount, spending count) after a write
+MonthlyTotals = Dict[Tuple[DateType, str], Tuple[float, int]]
+
+
+def rollup_day_range(
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    date: Optional[datetime] = None
+) -> Optional[DayRange]:
+    """
+    Translate stats filters into a half-open [start, end) day range.
+
+    Returns None when the filters don't line up with a contiguous day range
+    (a month without a year), in which case the rollups can't answer the query.
+    """
+    if date is not None:
+        day = date.date() if isinstance(date, datetime) else date
+        return day, day + timedelta(days=1)
+    if year is None:
+        return None if month is not None else (None, None)
+    if month is None:
+        return DateType(year, 1, 1), DateType(year + 1, 1, 1)
+    if month == 12:
+        return DateType(year, 12, 1), DateType(year + 1, 1, 1)
+    return DateType(year, month, 1), DateType(year, month + 1, 1)
+
+
+def month_start(when: datetime) -> DateType:
+    """Get the first day of the month containing a spending date (the monthly rollup key)."""
+    day = when.date() if isinstance(when, datetime) else when
+    return day.replace(day=1)
+
+
+class RollupDeltas:
+    """Accumulates rollup changes so they are written in one statement."""
+
+    def __init__(self):
+        # Amounts are summed in integer cents so many small deltas add up exactly
+        self._deltas: Dict[Tuple[DateType, str], List[int]] = {}
+
+    def add(self, when: datetime, category: str, amount: float, count: int = 1) -> None:
+        """Record a spending added to (or, with negative values, removed from) a day."""
+        key = (when.date() if isinstance(when, datetime) else when, category)
+        delta = self._deltas.setdefault(key, [0, 0])
+        delta[0] += to_cents(amount)
+        delta[1] += count
+
+    def remove(self, when: datetime, category: str, amount: float) -> None:
+        """Record a spending removed from a day."""
+        self.add(when, category, -amount, -1)
+
+    def months(self) -> Set[DateType]:
+        """First days of every month touched, including changes that cancel out."""
+        return {month_start(day) for day, _ in self._deltas}
+
+    def rows(self) -> List[dict]:
+        """Non-empty deltas as rollup rows, in key order to avoid lock-order deadlocks."""
+        return [
+            {"day": day, "category": category, "total_amount": from_cents(cents), "spending_count": count}
+            for (day, category), (cents, count) in sorted(self._deltas.items())
+            if cents or count
+        ]
+
+    def monthly_rows(self) -> List[dict]:
+        """Non-empty deltas summed per month, as monthly rollup rows in key order."""
+        months: Dict[Tuple[DateType, str], List[int]] = {}
+        for (day, category), (cents, count) in self._deltas.items():
+            delta = months.setdefault((month_start(day), category), [0, 0])
+            delta[0] += cents
+            delta[1] += count
+        return [
+            {"month": month, "category": category, "total_amount": from_cents(cents), "spending_count": count}
+            for (month, category), (cents, count) in sorted(months.items())
+            if cents or count
+        ]
+
+
+class RollupStorage:
+    """Maintains the daily and monthly rollup tables and queries the daily one."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply(self, deltas: RollupDeltas) -> MonthlyTotals:
+        """
+        Add deltas to the daily and monthly rollups in the current transaction (without committing).
+
+        Returns:
+            The monthly (total amount, count) of every touched (month, category)
+            after the change, read back by the same statement that updated them.
+        """
+        self._apply_rows(SpendingDailyRollup, [SpendingDailyRollup.day], deltas.rows())
+        rows = self._apply_rows(SpendingMonthlyRollup, [SpendingMonthlyRollup.month], deltas.monthly_rows())
+        return {(to_date(month), category): (total, count) for month, category, total, count in rows}
+
+    def _apply_rows(self, model, date_keys: List, rows: List[dict]) -> List[Tuple]:
+        """Upsert rollup rows, returning (date, category, total, count) after the change."""
+        if not rows:
+            return []
+        keys = [*date_keys, model.category]
+        returning = (*keys, model.total_amount, model.spending_count)
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            statement = dialect_insert(model).values(rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=keys,
+                set_={
+                    "total_amount": model.total_amount + statement.excluded.total_amount,
+                    "spending_count": model.spending_count + statement.excluded.spending_count,
+                }
+            )
+            return self.db.execute(statement.returning(*returning)).all()
+
+        # Portable fallback: update the existing row, insert if there is none
+        results = []
+        for row in rows:
+            where = [key == row[key.key] for key in keys]
+            result = self.db.execute(
+                update(model)
+                .where(*where)
+                .values(
+                    total_amount=model.total_amount + row["total_amount"],
+                    spending_count=model.spending_count + row["spending_count"]
+                )
+            )
+            if result.rowcount == 0:
+                self.db.execute(insert(model).values(row))
+            results.append(self.db.execute(select(*returning).where(*where)).one())
+        return results
+
+    def aggregate(self, start: Optional[DateType] = None, end: Optional[DateType] = None) -> List[Tuple]:
+        """
+        Get (category, total amount, count) rows for days in [start, end).
+
+        Cost depends on days × categories in the range, not on the number of spendings.
+        """
+        query = self.db.query(
+            SpendingDailyRollup.category,
+            func.sum(SpendingDailyRollup.total_amount),
+            func.sum(SpendingDailyRollup.spending_count)
+        )
+        query = self._filter_days(query, start, end)
+        return (
+            query.group_by(SpendingDailyRollup.category)
+            .having(func.sum(SpendingDailyRollup.spending_count) > 0)
+            .all()
+        )
+
+    def timeseries(
+        self,
+        start: DateType,
+        end: DateType,
+        bucket: TimeBucket,
+        category: Optional[str] = None
+    ) -> List[Tuple[DateType, float, int]]:
+        """Get (bucket start, total amount, count) for days in [start, end), from the rollups."""
+        bucket_column = date_bucket(
+            SpendingDailyRollup.day, bucket, self.db.get_bind().dialect.name
+        )
+        query = self.db.query(
+            bucket_column,
+            func.sum(SpendingDailyRollup.total_amount),
+            func.sum(SpendingDailyRollup.spending_count)
+        )
+        query = self._filter_days(query, start, end)
+        if category:
+            query = query.filter(SpendingDailyRollup.category == category)
+        rows = query.group_by(bucket_column).order_by(bucket_column).all()
+        return [(to_date(day), float(amount or 0.0), int(count or 0)) for day, amount, count in rows]
+
+    def rebuild(self, start: Optional[DateType] = None, end: Optional[DateType] = None) -> int:
+        """
+        Recompute the rollups for days in [start, end) from the spendings table and commit.
+
+        Monthly rollups are recomputed for every month overlapping the range.
+        On PostgreSQL spendings is locked against writes for the duration so
+        concurrent writes can't be lost between the recompute and the commit.
+
+        Returns:
+            Number of rollup rows written.
+        """
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            self.db.execute(text(f"LOCK TABLE {Spending.__tablename__} IN SHARE MODE"))
+
+        written = self._rebuild_rows(SpendingDailyRollup.day, func.date(Spending.date), start, end)
+
+        first_month = start.replace(day=1) if start is not None else None
+        month_end = end
+        if end is not None and end.day != 1:
+            # First day of the following month
+            month_end = (end.replace(day=28) + timedelta(days=4)).replace(day=1)
+        month = date_bucket(Spending.date, TimeBucket.month, dialect)
+        if dialect == "postgresql":
+            month = cast(month, Date)
+        written += self._rebuild_rows(SpendingMonthlyRollup.month, month, first_month, month_end)
+        # Whatever changed the spendings bypassed the API; make clients revalidate
+        VersionStorage(self.db).bump_range(first_month, month_end)
+
+        self.db.commit()
+        return written
+
+    def _rebuild_rows(self, date_key, bucket, start: Optional[DateType], end: Optional[DateType]) -> int:
+        """Replace one rollup table's rows in [start, end) with sums grouped by bucket."""
+        model = date_key.class_
+        statement = delete(model)
+        if start is not None:
+            statement = statement.where(date_key >= start)
+        if end is not None:
+            statement = statement.where(date_key < end)
+        self.db.execute(statement)
+
+        source = select(
+            bucket,
+            Category.name,
+            func.sum(Spending.amount),
+            func.count(Spending.id)
+        ).join(Category, Spending.category_id == Category.id)
+        if start is not None:
+            source = source.where(Spending.date >= datetime.combine(start, time.min))
+        if end is not None:
+            source = source.where(Spending.date < datetime.combine(end, time.min))
+        source = source.group_by(bucket, Category.name)
+
+        result = self.db.execute(
+            insert(model).from_select([date_key.key, "category", "total_amount", "spending_count"], source)
+        )
+        return result.rowcount
+
+    @staticmethod
+    def _filter_days(statement, start: Optional[DateType], end: Optional[DateType]):
+        """Restrict a query or DELETE to rollup days in [start, end)."""
+        if start is not None:
+            statement = statement.where(SpendingDailyRollup.day >= start)
+        if end is not None:
+            statement = statement.where(SpendingDailyRollup.day < end)
+        return statement
@@ -0,0 +1,58 @@
+"""Full-text match and rank of spending descriptions (PostgreSQL GIN index, SQLite FTS5)."""
+
+import re
+from typing import Optional
+
+from sqlalchemy import Float, Select, cast, func, literal_column, select, table
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.spending import SEARCH_CONFIG, SQLITE_FTS_TABLE, Spending, description_document
+
+_TERM_PATTERN = re.compile(r"\w+")
+
+_fts_table = table(SQLITE_FTS_TABLE)
+
+
+def fts5_query(q: str) -> Optional[str]:
+    """
+    Turn a search string into an FTS5 query matching every word.
+
+    Words are quoted, so operators and punctuation in user input are plain
+    text rather than FTS5 syntax. Returns None if there is no word to match.
+    """
+    terms = _TERM_PATTERN.findall(q)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def search_select(dialect: str, q: str, *columns: ColumnElement) -> Optional[Select]:
+    """
+    Select columns of the spendings whose description matches q, with a rank column.
+
+    Higher ranks are better matches. PostgreSQL parses q as a web search
+    (quoted phrases, OR, -word) and ranks with ts_rank; SQLite requires every
+    word and ranks with bm25.
+
+    Returns:
+        The statement, or None if q can't match anything.
+    """
+    if dialect == "sqlite":
+        query = fts5_query(q)
+        if query is None:
+            return None
+        match = literal_column(SQLITE_FTS_TABLE)
+        # bm25 is lower for better matches
+        rank = -func.bm25(match)
+        return (
+            select(*columns, rank.label("rank"))
+            .select_from(Spending)
+            .join(_fts_table, literal_column(f"{SQLITE_FTS_TABLE}.rowid") == literal_column("spendings.rowid"))
+            .where(match.op("MATCH")(query))
+        )
+
+    tsquery = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), q)
+    document = description_document(Spending.description)
+    # ts_rank is a real; as a double it survives the round trip through cursors exactly
+    rank = cast(func.ts_rank(document, tsquery), Float(precision=53))
+    return select(*columns, rank.label("rank")).where(document.op("@@")(tsquery))
@@ -0,0 +1,60 @@
+"""Date bucketing helpers for time-series queries."""
+
+from datetime import date as DateType
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from sqlalchemy import func
+from sqlalchemy.sql import ColumnElement
+
+from app.schemas.visualization import TimeBucket
+
+
+def date_bucket(column: ColumnElement, bucket: TimeBucket, dialect_name: str) -> ColumnElement:
+    """
+    Build the SQL expression for the start of the bucket containing `column`.
+
+    Uses date_trunc on PostgreSQL and SQLite date functions elsewhere. Weeks
+    start on Monday in both.
+    """
+    if dialect_name == "postgresql":
+        return func.date_trunc(bucket.value, column)
+    if bucket == TimeBucket.day:
+        return func.date(column)
+    if bucket == TimeBucket.week:
+        # Move to the following Sunday (or stay on it), then back to its Monday
+        return func.date(column, "weekday 0", "-6 days")
+    return func.strftime("%Y-%m-01", column)
+
+
+def bucket_start(day: DateType, bucket: TimeBucket) -> DateType:
+    """Get the first day of the bucket containing `day`."""
+    if bucket == TimeBucket.week:
+        return day - timedelta(days=day.weekday())
+    if bucket == TimeBucket.month:
+        return day.replace(day=1)
+    return day
+
+
+def iter_bucket_starts(start: DateType, end: DateType, bucket: TimeBucket) -> Iterator[DateType]:
+    """Yield the start of every bucket overlapping [start, end)."""
+    current = bucket_start(start, bucket)
+    while current < end:
+        yield current
+        if bucket == TimeBucket.day:
+            current += timedelta(days=1)
+        elif bucket == TimeBucket.week:
+            current += timedelta(weeks=1)
+        elif current.month == 12:
+            current = current.replace(year=current.year + 1, month=1)
+        else:
+            current = current.replace(month=current.month + 1)
+
+
+def to_date(value) -> DateType:
+    """Normalize a bucket value returned by the database to a date."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, DateType):
+        return value
+    return DateType.fromisoformat(str(value)[:10])
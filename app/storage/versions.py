@@ -0,0 +1,106 @@
+"""Per-month data versions bumped by every spending write."""
+
+from datetime import date as DateType
+from datetime import datetime
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.data_version import DataVersion
+from app.models.rollup import SpendingMonthlyRollup
+
+
+class VersionStamp(NamedTuple):
+    """Data version of a date window: the sum of its months' counters and the latest write."""
+
+    version: int
+    updated_at: Optional[datetime]
+
+
+class VersionStorage:
+    """
+    Maintains one write counter per month of spending dates.
+
+    A window's version is the sum of its months' counters, so it only ever
+    grows and changes whenever a write touches one of those months.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def bump(self, months: Iterable[DateType]) -> Dict[DateType, int]:
+        """
+        Increment the counters of months (first days) in the current transaction (without committing).
+
+        Returns:
+            The new version of each month. Row locks make every version unique
+            to one transaction, so it tells whether a snapshot read at a given
+            version already includes this write.
+        """
+        now = datetime.now()
+        # Sorted so concurrent writers lock rows in the same order
+        rows = [{"month": month, "version": 1, "updated_at": now} for month in sorted(set(months))]
+        if not rows:
+            return {}
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            statement = dialect_insert(DataVersion).values(rows)
+            result = self.db.execute(statement.on_conflict_do_update(
+                index_elements=[DataVersion.month],
+                set_={"version": DataVersion.version + 1, "updated_at": statement.excluded.updated_at}
+            ).returning(DataVersion.month, DataVersion.version))
+            return dict(result.tuples().all())
+
+        # Portable fallback: update the existing row, insert if there is none
+        for row in rows:
+            result = self.db.execute(
+                update(DataVersion)
+                .where(DataVersion.month == row["month"])
+                .values(version=DataVersion.version + 1, updated_at=now)
+            )
+            if result.rowcount == 0:
+                self.db.execute(insert(DataVersion).values(row))
+        statement = select(DataVersion.month, DataVersion.version).where(
+            DataVersion.month.in_([row["month"] for row in rows])
+        )
+        return dict(self.db.execute(statement).tuples().all())
+
+    def bump_range(self, start: Optional[DateType] = None, end: Optional[DateType] = None) -> None:
+        """
+        Increment every month in [start, end) that has a counter or spendings.
+
+        For changes made outside the API; months with spendings are found in
+        the monthly rollups, so call this after rebuilding them.
+        """
+        months = set()
+        for column in (DataVersion.month, SpendingMonthlyRollup.month):
+            statement = select(column).distinct()
+            if start is not None:
+                statement = statement.where(column >= start.replace(day=1))
+            if end is not None:
+                statement = statement.where(column < end)
+            months.update(self.db.execute(statement).scalars())
+        self.bump(months)
+
+    def get(self, start: Optional[DateType] = None, end: Optional[DateType] = None) -> VersionStamp:
+        """Get the version of the spendings dated in [start, end) (unbounded sides cover everything)."""
+        statement = select(func.coalesce(func.sum(DataVersion.version), 0), func.max(DataVersion.updated_at))
+        if start is not None:
+            statement = statement.where(DataVersion.month >= start.replace(day=1))
+        if end is not None:
+            statement = statement.where(DataVersion.month < end)
+        version, updated_at = self.db.execute(statement).one()
+        return VersionStamp(int(version), updated_at)
+
+    def get_months(self, start: Optional[DateType] = None, end: Optional[DateType] = None) -> Dict[DateType, int]:
+        """Get the counter of every month in [start, end) that has one, keyed by first day."""
+        statement = select(DataVersion.month, DataVersion.version)
+        if start is not None:
+            statement = statement.where(DataVersion.month >= start.replace(day=1))
+        if end is not None:
+            statement = statement.where(DataVersion.month < end)
+        return dict(self.db.execute(statement).tuples().all())
@@ -0,0 +1 @@
+"""Data generator, load driver and microbenchmarks for the Budget Tracker API."""
@@ -0,0 +1,183 @@
+"""Benchmark commands.
+
+Run with: python -m benchmarks <command> [options]
+
+  seed     Fill a database with synthetic spendings (10k, 1M, 10M, ...)
+  run      Load-test every spending route in process and write JSON results
+  compare  Compare two result files and fail on regressions
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+def _use_database(args: argparse.Namespace) -> None:
+    """Point the app at --database-url; must run before any app module is imported."""
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+
+def seed(args: argparse.Namespace) -> None:
+    """Insert synthetic spendings through DatabaseStorage.bulk_create."""
+    _use_database(args)
+    from app.database import init_db
+    from app.database.base import SessionLocal
+    from app.storage.database import DatabaseStorage
+    from benchmarks.datagen import generate_spendings, iter_batches, parse_row_count
+
+    rows = parse_row_count(args.rows)
+    init_db()
+    db = SessionLocal()
+    started = time.perf_counter()
+    written = 0
+    try:
+        storage = DatabaseStorage(db)
+        for batch in iter_batches(generate_spendings(rows, days=args.days, seed=args.seed), args.batch_size):
+            storage.bulk_create(batch, batch_size=len(batch))
+            written += len(batch)
+            print(f"\r{written}/{rows} rows", end="", file=sys.stderr, flush=True)
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - started
+    print(f"\nSeeded {written} spendings in {elapsed:.1f}s ({written / elapsed:.0f} rows/s)", file=sys.stderr)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args: argparse.Namespace) -> None:
+    """Run the load driver and write the results as JSON."""
+    _use_database(args)
+    from sqlalchemy import func, select
+
+    from app.database.base import SessionLocal, engine
+    from app.models.spending import Spending
+    from benchmarks.load import SCENARIOS, run_load
+
+    scenarios = list(SCENARIOS)
+    if args.scenarios:
+        wanted = set(args.scenarios.split(","))
+        unknown = wanted - {scenario.name for scenario in SCENARIOS}
+        if unknown:
+            raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        scenarios = [scenario for scenario in SCENARIOS if scenario.name in wanted]
+    concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+
+    with SessionLocal() as db:
+        rows = db.execute(select(func.count()).select_from(Spending)).scalar_one()
+
+    def progress(result: Dict[str, Any]) -> None:
+        latency = result["latency_ms"]
+        print(
+            f"{result['scenario']:<14} c={result['concurrency']:<4} "
+            f"{result['throughput_rps']:>9.1f} req/s  p50={latency['p50']:.2f}ms "
+            f"p95={latency['p95']:.2f}ms p99={latency['p99']:.2f}ms  "
+            f"q/req={result['queries_per_request']}  errors={result['errors']}",
+            file=sys.stderr
+        )
+        if "warning" in result:
+            print(f"  warning: {result['warning']}, got {result['status_codes']}", file=sys.stderr)
+
+    results = asyncio.run(run_load(scenarios, concurrency_levels, args.requests, progress))
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "rows": rows,
+        "requests_per_scenario": args.requests,
+        "settings": {
+            name: os.getenv(name)
+            for name in (
+                "DB_ASYNC", "DB_POOL_SIZE", "STATS_USE_ROLLUPS", "STATS_CACHE_BACKEND", "GROUP_COMMIT_ENABLED"
+            )
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+    print(f"Wrote {args.output}", file=sys.stderr)
+
+
+def compare(args: argparse.Namespace) -> None:
+    """Print per-scenario changes between two runs; exit 1 on regressions."""
+    with open(args.baseline) as baseline_file, open(args.candidate) as candidate_file:
+        baseline = json.load(baseline_file)
+        candidate = json.load(candidate_file)
+
+    def by_key(report: Dict[str, Any]) -> Dict[tuple, Dict[str, Any]]:
+        return {(result["scenario"], result["concurrency"]): result for result in report["results"]}
+
+    old, new = by_key(baseline), by_key(candidate)
+    regressions: List[str] = []
+    print(f"{'scenario':<14} {'conc':>4} {'p95 ms':>17} {'req/s':>19} {'q/req':>11}")
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key], new[key]
+        p95_before, p95_after = before["latency_ms"]["p95"], after["latency_ms"]["p95"]
+        rps_before, rps_after = before["throughput_rps"], after["throughput_rps"]
+        p95_change = (p95_after - p95_before) / p95_before if p95_before else 0.0
+        rps_change = (rps_after - rps_before) / rps_before if rps_before else 0.0
+        print(
+            f"{key[0]:<14} {key[1]:>4} {p95_after:>9.2f} ({p95_change:+6.1%}) "
+            f"{rps_after:>10.1f} ({rps_change:+6.1%}) "
+            f"{before['queries_per_request']:>5}->{after['queries_per_request']:<5}"
+        )
+        if p95_change > args.threshold or -rps_change > args.threshold:
+            regressions.append(f"{key[0]} (concurrency {key[1]})")
+    if regressions:
+        print(f"Regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+        raise SystemExit(1)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parse arguments and run the selected command."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="Fill a database with synthetic spendings")
+    seed_parser.add_argument("--database-url", help="Database to seed (default: the app's DATABASE_URL)")
+    seed_parser.add_argument("--rows", default="10k", help="Number of rows, e.g. 10k, 1M, 10M (default: 10k)")
+    seed_parser.add_argument("--days", type=int, default=730, help="Days of history before today (default: 730)")
+    seed_parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    seed_parser.add_argument("--batch-size", type=int, default=10000, help="Rows per transaction (default: 10000)")
+    seed_parser.set_defaults(handler=seed)
+
+    run_parser = commands.add_parser("run", help="Load-test the spending routes")
+    run_parser.add_argument("--database-url", help="Database to test against (default: the app's DATABASE_URL)")
+    run_parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels (default: 1,8,32)")
+    run_parser.add_argument("--requests", type=int, default=200, help="Requests per scenario and level (default: 200)")
+    run_parser.add_argument("--scenarios", help="Comma-separated scenario names (default: all)")
+    run_parser.add_argument("--output", default="benchmark-results.json", help="Result file (default: benchmark-results.json)")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline", help="Result file of the reference run")
+    compare_parser.add_argument("candidate", help="Result file of the run to check")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.1,
+        help="Fail if p95 grows or throughput drops by more than this fraction (default: 0.1)"
+    )
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Synthetic spending data for benchmarks."""
+
+import random
+from datetime import date, datetime, timedelta
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from app.schemas.spending import SpendingResponse
+
+
+class CategoryProfile(NamedTuple):
+    """How often a category occurs and how its amounts are distributed."""
+
+    name: str
+    weight: float
+    median_amount: float
+    spread: float
+    descriptions: Tuple[str, ...]
+
+
+# Roughly the mix of a household budget: many small purchases, few large ones
+CATEGORIES = (
+    CategoryProfile("Groceries", 0.28, 42.0, 0.55, ("Weekly shop", "Supermarket", "Farmers market", "Bakery")),
+    CategoryProfile("Dining", 0.17, 24.0, 0.6, ("Lunch", "Dinner out", "Coffee", "Takeaway")),
+    CategoryProfile("Transport", 0.15, 11.0, 0.7, ("Bus ticket", "Fuel", "Taxi", "Parking")),
+    CategoryProfile("Shopping", 0.10, 55.0, 0.9, ("Clothes", "Electronics", "Household items", "Gift")),
+    CategoryProfile("Entertainment", 0.07, 28.0, 0.8, ("Cinema", "Concert", "Streaming", "Books")),
+    CategoryProfile("Health", 0.06, 38.0, 0.9, ("Pharmacy", "Doctor", "Gym membership")),
+    CategoryProfile("Utilities", 0.05, 85.0, 0.3, ("Electricity", "Water", "Internet", "Phone")),
+    CategoryProfile("Education", 0.05, 60.0, 0.8, ("Course", "Textbooks", "Workshop")),
+    CategoryProfile("Travel", 0.04, 280.0, 0.8, ("Flight", "Hotel", "Train", "Car rental")),
+    CategoryProfile("Rent", 0.03, 1150.0, 0.08, ("Monthly rent",)),
+)
+
+# Weekends see more spending than weekdays (Monday = 0)
+WEEKDAY_WEIGHTS = (0.9, 0.9, 0.95, 1.0, 1.15, 1.5, 1.3)
+
+# Share of spendings without a description
+NO_DESCRIPTION_RATE = 0.3
+
+
+def parse_row_count(value: str) -> int:
+    """Parse a row count such as 10000, 10k, 1M or 10m."""
+    multipliers = {"k": 1_000, "m": 1_000_000}
+    value = value.strip().lower()
+    if value and value[-1] in multipliers:
+        return int(float(value[:-1]) * multipliers[value[-1]])
+    return int(value)
+
+
+def generate_spendings(
+    rows: int,
+    days: int = 730,
+    end: Optional[date] = None,
+    seed: int = 42
+) -> Iterator[SpendingResponse]:
+    """
+    Yield `rows` synthetic spendings, reproducible for a given seed.
+
+    Categories follow CATEGORIES weights with log-normal amounts around each
+    median. Dates cover the `days` days before `end` (default: today), with
+    more spendings on weekends, and times cluster around midday.
+    """
+    rng = random.Random(seed)
+    end = end or date.today()
+    first_day = end - timedelta(days=days)
+    weights = [profile.weight for profile in CATEGORIES]
+    weekday_max = max(WEEKDAY_WEIGHTS)
+    created_at = datetime.now()
+
+    for _ in range(rows):
+        profile = rng.choices(CATEGORIES, weights)[0]
+        while True:
+            day = first_day + timedelta(days=rng.randrange(days))
+            if rng.random() * weekday_max < WEEKDAY_WEIGHTS[day.weekday()]:
+                break
+        seconds = int(min(max(rng.gauss(13 * 3600, 4 * 3600), 0), 86399))
+        description = None
+        if rng.random() >= NO_DESCRIPTION_RATE:
+            description = rng.choice(profile.descriptions)
+        yield SpendingResponse.model_construct(
+            id=UUID(int=rng.getrandbits(128), version=4),
+            amount=round(profile.median_amount * rng.lognormvariate(0, profile.spread), 2),
+            category=profile.name,
+            description=description,
+            date=datetime.combine(day, datetime.min.time()) + timedelta(seconds=seconds),
+            created_at=created_at
+        )
+
+
+def iter_batches(spendings: Iterator[SpendingResponse], size: int) -> Iterator[List[SpendingResponse]]:
+    """Group spendings into lists of at most `size`."""
+    batch: List[SpendingResponse] = []
+    for spending in spendings:
+        batch.append(spending)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,246 @@
+"""In-process load driver for the spending endpoints."""
+
+import asyncio
+import csv
+import io
+import itertools
+import math
+import resource
+import time
+from collections import Counter
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import httpx
+from sqlalchemy import event
+
+from app.database.base import async_engine, engine
+from app.main import app
+
+# (method, url, httpx request kwargs)
+Request = Tuple[str, str, Dict[str, Any]]
+
+
+class LoadContext(NamedTuple):
+    """Data shared by the request builders of one run."""
+
+    ids: List[str]
+    today: date
+    deletable: List[str]
+    # ETag of the 1000-row list page, for revalidation requests
+    list_etag: Optional[str] = None
+
+
+# Prepares the context of one scenario before its timed requests: (client, context, requests)
+Setup = Callable[[httpx.AsyncClient, LoadContext, int], Awaitable[LoadContext]]
+
+
+class Scenario(NamedTuple):
+    """One route exercised by the load driver."""
+
+    name: str
+    build: Callable[[LoadContext, int], Request]
+    # Run before the timed requests, untimed (e.g. to create the rows a route consumes)
+    setup: Optional[Setup] = None
+    # Status every request should get; the result carries a warning otherwise
+    expected_status: Optional[int] = None
+
+
+def _new_spending(i: int, today: date) -> Dict[str, Any]:
+    day = today - timedelta(days=i % 365)
+    return {
+        "amount": round(5 + (i * 7.31) % 200, 2),
+        "category": ("Groceries", "Dining", "Transport", "Shopping")[i % 4],
+        "description": f"benchmark {i}",
+        "date": f"{day.isoformat()}T12:00:00",
+    }
+
+
+def _import_file(i: int, today: date, rows: int = 100) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=["amount", "category", "description", "date"])
+    writer.writeheader()
+    writer.writerows(_new_spending(i * rows + n, today) for n in range(rows))
+    return buffer.getvalue().encode()
+
+
+async def _with_deletable(client: httpx.AsyncClient, context: LoadContext, requests: int) -> LoadContext:
+    """Create one spending per request for the delete scenario."""
+    ids: List[str] = []
+    for start in range(0, requests, 1000):
+        items = [_new_spending(n, context.today) for n in range(start, min(requests, start + 1000))]
+        response = await client.post("/spendings/bulk", json={"spendings": items, "return_rows": True})
+        response.raise_for_status()
+        ids.extend(spending["id"] for spending in response.json()["spendings"])
+    return context._replace(deletable=ids)
+
+
+async def _with_list_etag(client: httpx.AsyncClient, context: LoadContext, requests: int) -> LoadContext:
+    """Read the list page's current ETag; writes of earlier scenarios change it."""
+    response = await client.get("/spendings", params={"limit": 1000})
+    response.raise_for_status()
+    return context._replace(list_etag=response.headers.get("etag"))
+
+
+# Words from the seeded descriptions (benchmarks/datagen.py), common and rare
+SEARCH_TERMS = ("coffee", "ticket", "dinner", "hotel", "weekly shop", "gym membership")
+
+
+SCENARIOS = (
+    Scenario("create", lambda ctx, i: ("POST", "/spendings", {"json": _new_spending(i, ctx.today)})),
+    Scenario("bulk", lambda ctx, i: (
+        "POST", "/spendings/bulk",
+        {"json": {"spendings": [_new_spending(i * 100 + n, ctx.today) for n in range(100)]}}
+    )),
+    Scenario("import", lambda ctx, i: (
+        "POST", "/spendings/import", {"files": {"file": ("spendings.csv", _import_file(i, ctx.today), "text/csv")}}
+    )),
+    Scenario("list", lambda ctx, i: ("GET", "/spendings", {"params": {"limit": 100}})),
+    Scenario("list_category", lambda ctx, i: (
+        "GET", "/spendings", {"params": {"limit": 100, "category": "Groceries", "category_match": "exact"}}
+    )),
+    Scenario("list_revalidate", lambda ctx, i: (
+        "GET", "/spendings", {"params": {"limit": 1000}, "headers": {"If-None-Match": ctx.list_etag or ""}}
+    ), setup=_with_list_etag, expected_status=304),
+    Scenario("search", lambda ctx, i: (
+        "GET", "/spendings/search", {"params": {"q": SEARCH_TERMS[i % len(SEARCH_TERMS)], "limit": 50}}
+    )),
+    Scenario("export", lambda ctx, i: (
+        "GET", "/spendings/export", {"params": {"year": ctx.today.year, "month": ctx.today.month}}
+    )),
+    Scenario("get", lambda ctx, i: ("GET", f"/spendings/{ctx.ids[i % len(ctx.ids)]}", {})),
+    Scenario("update", lambda ctx, i: (
+        "PUT", f"/spendings/{ctx.ids[i % len(ctx.ids)]}", {"json": {"amount": round(1 + i % 100, 2)}}
+    )),
+    Scenario("delete", lambda ctx, i: ("DELETE", f"/spendings/{ctx.deletable[i]}", {}), setup=_with_deletable),
+    Scenario("summary", lambda ctx, i: (
+        "GET", "/spendings/stats/summary",
+        {"params": {"date": (ctx.today - timedelta(days=i % 30)).isoformat()}} if i % 2 else {}
+    )),
+    Scenario("visualization", lambda ctx, i: (
+        "GET", "/spendings/stats/visualization", {"params": {"year": ctx.today.year, "month": ctx.today.month}}
+    )),
+    Scenario("timeseries", lambda ctx, i: (
+        "GET", "/spendings/stats/timeseries",
+        {"params": {"from": (ctx.today - timedelta(days=90)).isoformat(), "to": ctx.today.isoformat(), "bucket": "week"}}
+    )),
+    Scenario("advanced", lambda ctx, i: (
+        "GET", "/spendings/stats/advanced", {"params": {"year": ctx.today.year}} if i % 2 else {}
+    )),
+    Scenario("cache", lambda ctx, i: ("GET", "/spendings/stats/cache", {})),
+)
+
+
+class QueryCounter:
+    """Counts SQL statements executed by the application engines."""
+
+    def __init__(self):
+        self.count = 0
+        self._engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+    def __enter__(self) -> "QueryCounter":
+        for target in self._engines:
+            event.listen(target, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for target in self._engines:
+            event.remove(target, "before_cursor_execute", self._on_execute)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values), max(1, math.ceil(fraction * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far (Linux reports KiB)."""
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+async def _prepare(client: httpx.AsyncClient) -> LoadContext:
+    response = await client.get("/spendings", params={"limit": 1000})
+    response.raise_for_status()
+    ids = [spending["id"] for spending in response.json()]
+    if not ids:
+        raise RuntimeError("The database is empty; seed it first (python -m benchmarks seed)")
+    return LoadContext(ids=ids, today=date.today(), deletable=[])
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    context: LoadContext,
+    concurrency: int,
+    requests: int
+) -> Dict[str, Any]:
+    """Send `requests` requests for a scenario from `concurrency` workers and summarize them."""
+    if scenario.setup is not None:
+        context = await scenario.setup(client, context, requests)
+
+    indexes = iter(range(requests))
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+
+    async def worker() -> None:
+        for i in indexes:
+            method, url, kwargs = scenario.build(context, i)
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+
+    with QueryCounter() as queries:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    result = {
+        "scenario": scenario.name,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": sum(count for status, count in statuses.items() if status >= 400),
+        "status_codes": {str(status): count for status, count in sorted(statuses.items())},
+        "duration_s": round(elapsed, 4),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+        "queries_per_request": round(queries.count / requests, 2) if requests else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if scenario.expected_status is not None and statuses[scenario.expected_status] != requests:
+        # e.g. a write between the setup and the requests: the numbers time another code path
+        result["warning"] = f"expected every response to be {scenario.expected_status}"
+    return result
+
+
+async def run_load(
+    scenarios: List[Scenario],
+    concurrency_levels: List[int],
+    requests: int,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> List[Dict[str, Any]]:
+    """Run every scenario at every concurrency level against the app, in process."""
+    results = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            context = await _prepare(client)
+            for scenario, concurrency in itertools.product(scenarios, concurrency_levels):
+                result = await run_scenario(client, scenario, context, concurrency, requests)
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+    return results
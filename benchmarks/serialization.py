@@ -0,0 +1,115 @@
+"""
+Microbenchmark of the GET /spendings serialization paths.
+
+Measures the per-row CPU cost of turning one page of spendings into response
+bytes, database fetch included:
+
+- model path: ORM Spending objects -> SpendingResponse -> FastAPI response
+  validation and serialization (the route's own response field) -> JSONResponse
+- fast path: column tuples -> encode_spending_rows
+
+and checks that both paths produce byte-identical output. The data lives in a
+private in-memory SQLite database, so the configured database is not touched.
+
+Usage:
+    python -m benchmarks.serialization --rows 1000 --repeat 50
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database.base import Base
+from app.main import app
+from app.schemas.spending import SpendingResponse
+from app.services.serialization import encode_spending_rows
+from app.storage.database import DatabaseStorage
+
+
+def seed(session: Session, rows: int) -> None:
+    """Insert `rows` random spendings."""
+    rng = random.Random(42)
+    storage = DatabaseStorage(session)
+    start = datetime(2024, 1, 1)
+    spendings = [
+        SpendingResponse(
+            id=uuid4(),
+            amount=round(rng.uniform(1, 500), 2),
+            category=rng.choice(["Groceries", "Transport", "Rent", "Café", "Fun"]),
+            description=rng.choice([None, "weekly shop", "taxi \"home\"", "ünïcode"]),
+            date=start + timedelta(minutes=rng.randrange(525600)),
+            created_at=start + timedelta(seconds=rng.randrange(10 ** 6), microseconds=rng.randrange(10 ** 6)),
+        )
+        for _ in range(rows)
+    ]
+    storage.bulk_create(spendings)
+
+
+def list_response_field():
+    """Get the response field FastAPI validates GET /spendings results against."""
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == "/spendings" and "GET" in route.methods:
+            return route.response_field
+    raise RuntimeError("GET /spendings route not found")
+
+
+def time_per_row(fn: Callable[[], bytes], rows: int, repeat: int) -> float:
+    """Run fn `repeat` times and return the best per-row time in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best / rows * 1e6
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per page (default: 1000)")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed runs per path (default: 50)")
+    args = parser.parse_args(argv)
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    seed(session, args.rows)
+
+    storage = DatabaseStorage(session)
+    field = list_response_field()
+    loop = asyncio.new_event_loop()
+
+    def model_path() -> bytes:
+        spendings = storage.get_page(limit=args.rows)
+        content = loop.run_until_complete(serialize_response(field=field, response_content=spendings))
+        return JSONResponse(content).body
+
+    def fast_path() -> bytes:
+        return encode_spending_rows(storage.get_page_rows(limit=args.rows))
+
+    if model_path() != fast_path():
+        raise SystemExit("Output mismatch between the model path and the fast path")
+
+    model = time_per_row(model_path, args.rows, args.repeat)
+    fast = time_per_row(fast_path, args.rows, args.repeat)
+    loop.close()
+    session.close()
+
+    print(f"rows per page: {args.rows}, best of {args.repeat} runs, output identical")
+    print(f"model path: {model:8.2f} us/row")
+    print(f"fast path:  {fast:8.2f} us/row  ({model / fast:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
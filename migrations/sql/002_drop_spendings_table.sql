@@ -1,6 +1,7 @@
 -- Migration: Drop spendings table
 -- Description: Drops the spendings table (use with caution - this will delete all data)
 -- Created: 2025-11-29
+-- Apply: manual
 
 -- Drop indexes first
 DROP INDEX IF EXISTS idx_spendings_date;
@@ -1,6 +1,7 @@
 -- Migration: Insert mock spending data
 -- Description: Inserts realistic mock data for testing and development
 -- Created: 2025-01-XX
+-- Apply: manual
 
 -- Insert mock spending data
 -- Note: id will be auto-generated by the database using uuid_generate_v4()
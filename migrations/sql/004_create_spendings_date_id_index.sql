@@ -0,0 +1,5 @@
+-- Migration: Create composite (date, id) index on spendings
+-- Description: Backs keyset pagination of GET /spendings ordered by (date DESC, id DESC)
+-- Created: 2026-10-17
+
+CREATE INDEX IF NOT EXISTS idx_spendings_date_id ON spendings(date, id);
@@ -0,0 +1,23 @@
+-- Migration: Create spending_daily_rollups table
+-- Description: Per-day, per-category totals maintained by every spending write and
+--              used to answer /spendings/stats/* without scanning spendings
+-- Created: 2026-10-17
+
+CREATE TABLE IF NOT EXISTS spending_daily_rollups (
+    day DATE NOT NULL,
+    category VARCHAR NOT NULL,
+    total_amount FLOAT NOT NULL DEFAULT 0,
+    spending_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, category)
+);
+
+-- Backfill from existing spendings
+INSERT INTO spending_daily_rollups (day, category, total_amount, spending_count)
+SELECT date(date), category, SUM(amount), COUNT(*)
+FROM spendings
+GROUP BY date(date), category
+ON CONFLICT (day, category) DO NOTHING;
+
+COMMENT ON TABLE spending_daily_rollups IS 'Per-day, per-category spending totals used by the stats endpoints';
+COMMENT ON COLUMN spending_daily_rollups.total_amount IS 'Sum of spendings.amount for the day and category';
+COMMENT ON COLUMN spending_daily_rollups.spending_count IS 'Number of spendings for the day and category';
@@ -0,0 +1,44 @@
+-- Migration: Normalize spending categories into a dictionary table
+-- Description: Moves spendings.category into a categories table referenced by
+--              spendings.category_id, with indexes for exact, prefix and substring search
+-- Created: 2026-10-17
+
+-- Trigram support for substring (ILIKE '%term%') search on category names
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE TABLE IF NOT EXISTS categories (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR NOT NULL UNIQUE
+);
+
+ALTER TABLE spendings ADD COLUMN IF NOT EXISTS category_id INTEGER REFERENCES categories(id);
+
+-- Move existing category names into the dictionary (skipped once the old column is gone)
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'spendings' AND column_name = 'category'
+    ) THEN
+        INSERT INTO categories (name)
+        SELECT DISTINCT category FROM spendings
+        ON CONFLICT (name) DO NOTHING;
+
+        UPDATE spendings s
+        SET category_id = c.id
+        FROM categories c
+        WHERE c.name = s.category AND s.category_id IS NULL;
+
+        DROP INDEX IF EXISTS idx_spendings_category;
+        ALTER TABLE spendings DROP COLUMN category;
+    END IF;
+END $$;
+
+ALTER TABLE spendings ALTER COLUMN category_id SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_spendings_category_id ON spendings(category_id);
+CREATE INDEX IF NOT EXISTS idx_categories_name_lower_prefix ON categories (lower(name) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_categories_name_trgm ON categories USING GIN (name gin_trgm_ops);
+
+COMMENT ON TABLE categories IS 'Dictionary of spending categories';
+COMMENT ON COLUMN spendings.category_id IS 'Category of the spending (references categories.id)';
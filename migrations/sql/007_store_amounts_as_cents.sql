@@ -0,0 +1,33 @@
+-- Migration: Store amounts as integer cents
+-- Description: Replaces the floating-point spendings.amount and
+--              spending_daily_rollups.total_amount columns with BIGINT cents
+--              (amount_cents, total_amount_cents) so sums are exact
+-- Created: 2026-10-17
+
+-- Rewrites both tables under an ACCESS EXCLUSIVE lock; schedule accordingly on large tables.
+-- Ids need no change here: PostgreSQL already stores them as native 16-byte UUIDs.
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'spendings' AND column_name = 'amount'
+    ) THEN
+        ALTER TABLE spendings
+            ALTER COLUMN amount TYPE BIGINT USING round(amount::numeric * 100)::bigint;
+        ALTER TABLE spendings RENAME COLUMN amount TO amount_cents;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'spending_daily_rollups' AND column_name = 'total_amount'
+    ) THEN
+        ALTER TABLE spending_daily_rollups ALTER COLUMN total_amount DROP DEFAULT;
+        ALTER TABLE spending_daily_rollups
+            ALTER COLUMN total_amount TYPE BIGINT USING round(total_amount::numeric * 100)::bigint;
+        ALTER TABLE spending_daily_rollups ALTER COLUMN total_amount SET DEFAULT 0;
+        ALTER TABLE spending_daily_rollups RENAME COLUMN total_amount TO total_amount_cents;
+    END IF;
+END $$;
+
+COMMENT ON COLUMN spendings.amount_cents IS 'Amount spent in cents (must be positive)';
+COMMENT ON COLUMN spending_daily_rollups.total_amount_cents IS 'Sum of the day''s spending amounts in cents';
@@ -0,0 +1,33 @@
+-- Migration: Create budgets and spending_monthly_rollups tables
+-- Description: Per-category monthly spending limits, checked on every write against
+--              running per-month, per-category totals instead of re-summing spendings
+-- Created: 2026-10-17
+
+CREATE TABLE IF NOT EXISTS spending_monthly_rollups (
+    month DATE NOT NULL,
+    category VARCHAR NOT NULL,
+    total_amount_cents BIGINT NOT NULL DEFAULT 0,
+    spending_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (month, category)
+);
+
+-- Backfill from the daily rollups (already one row per day and category)
+INSERT INTO spending_monthly_rollups (month, category, total_amount_cents, spending_count)
+SELECT date_trunc('month', day)::date, category, SUM(total_amount_cents), SUM(spending_count)
+FROM spending_daily_rollups
+GROUP BY date_trunc('month', day)::date, category
+ON CONFLICT (month, category) DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS budgets (
+    id SERIAL PRIMARY KEY,
+    category_id INTEGER NOT NULL UNIQUE REFERENCES categories(id),
+    monthly_limit_cents BIGINT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE spending_monthly_rollups IS 'Per-month, per-category spending totals used by budget checks';
+COMMENT ON COLUMN spending_monthly_rollups.month IS 'First day of the month';
+COMMENT ON COLUMN spending_monthly_rollups.total_amount_cents IS 'Sum of spendings.amount_cents for the month and category';
+COMMENT ON TABLE budgets IS 'Monthly spending limit of a category';
+COMMENT ON COLUMN budgets.monthly_limit_cents IS 'Monthly limit in cents';
@@ -0,0 +1,78 @@
+-- Migration: Partition spendings by month
+-- Description: Optionally converts spendings into a table range-partitioned by month
+--              on date (one partition per month plus a default partition) and moves
+--              the existing rows into it
+-- Created: 2026-10-17
+-- Apply: manual
+
+-- Run by hand, once, in a maintenance window; spendings is locked while its rows are copied:
+--   psql "$DATABASE_URL" -f migrations/sql/009_partition_spendings_by_month.sql
+-- The application then creates partitions for upcoming months itself
+-- (SPENDINGS_PARTITIONS_AHEAD), and `python -m app.cli detach-partitions` retires old ones.
+
+DO $$
+DECLARE
+    first_month DATE;
+    last_month DATE;
+    current_month DATE := date_trunc('month', now())::date;
+    month DATE;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('spendings')) THEN
+        RAISE NOTICE 'spendings is already partitioned';
+        RETURN;
+    END IF;
+
+    LOCK TABLE spendings IN ACCESS EXCLUSIVE MODE;
+    ALTER TABLE spendings RENAME TO spendings_unpartitioned;
+    -- Index names are unique per schema; the partitioned table recreates them below
+    ALTER TABLE spendings_unpartitioned DROP CONSTRAINT IF EXISTS spendings_pkey;
+    DROP INDEX IF EXISTS idx_spendings_id;
+    DROP INDEX IF EXISTS idx_spendings_date;
+    DROP INDEX IF EXISTS idx_spendings_date_id;
+    DROP INDEX IF EXISTS idx_spendings_category_id;
+    DROP INDEX IF EXISTS idx_spendings_updated_at_id;
+    DROP INDEX IF EXISTS idx_spendings_description_search;
+
+    -- Same columns, defaults and NOT NULLs; the partition key must be part of the primary key
+    CREATE TABLE spendings (LIKE spendings_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS)
+        PARTITION BY RANGE (date);
+    ALTER TABLE spendings ADD PRIMARY KEY (id, date);
+    ALTER TABLE spendings ADD FOREIGN KEY (category_id) REFERENCES categories(id);
+
+    -- One partition for every month with data, through three months from now
+    SELECT date_trunc('month', min(date))::date, date_trunc('month', max(date))::date
+    INTO first_month, last_month
+    FROM spendings_unpartitioned;
+    first_month := LEAST(COALESCE(first_month, current_month), current_month);
+    last_month := GREATEST(COALESCE(last_month, current_month), (current_month + interval '3 months')::date);
+    month := first_month;
+    WHILE month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF spendings FOR VALUES FROM (%L) TO (%L)',
+            'spendings_y' || to_char(month, 'YYYY') || 'm' || to_char(month, 'MM'),
+            month,
+            (month + interval '1 month')::date
+        );
+        month := (month + interval '1 month')::date;
+    END LOOP;
+    CREATE TABLE spendings_default PARTITION OF spendings DEFAULT;
+
+    INSERT INTO spendings SELECT * FROM spendings_unpartitioned;
+    DROP TABLE spendings_unpartitioned;
+
+    -- Created on the parent, so every partition (present and future) gets them
+    CREATE INDEX idx_spendings_date_id ON spendings(date, id);
+    CREATE INDEX idx_spendings_category_id ON spendings(category_id);
+    -- Change feed index from 011, which creates it itself if it runs after this file
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'spendings' AND column_name = 'updated_at'
+    ) THEN
+        CREATE INDEX idx_spendings_updated_at_id ON spendings(updated_at, id);
+    END IF;
+    -- Full-text search index from 012 (same expression as the queries); a no-op for 012 if it runs later
+    CREATE INDEX idx_spendings_description_search
+        ON spendings USING GIN (to_tsvector('english', coalesce(description, '')));
+END $$;
+
+COMMENT ON TABLE spendings IS 'Table for storing spending entries in the budget tracker, partitioned by month of date';
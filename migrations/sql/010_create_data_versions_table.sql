@@ -0,0 +1,20 @@
+-- Migration: Create data_versions table
+-- Description: Per-month write counters bumped by every spending write; read endpoints
+--              derive their ETags from them to answer If-None-Match with 304
+-- Created: 2026-10-17
+
+CREATE TABLE IF NOT EXISTS data_versions (
+    month DATE PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Start every month that already has spendings at version 1
+INSERT INTO data_versions (month, version, updated_at)
+SELECT DISTINCT month, 1, CURRENT_TIMESTAMP
+FROM spending_monthly_rollups
+ON CONFLICT (month) DO NOTHING;
+
+COMMENT ON TABLE data_versions IS 'Write counters per month of spending dates, used for ETags';
+COMMENT ON COLUMN data_versions.month IS 'First day of the month';
+COMMENT ON COLUMN data_versions.version IS 'Number of writes that touched spendings dated in the month';
@@ -0,0 +1,21 @@
+-- Migration: Add spendings.updated_at and the spending_tombstones table
+-- Description: Change feed for GET /spendings/changes: every insert and update stamps
+--              updated_at, every delete leaves a tombstone, both read in (time, id) order
+-- Created: 2026-10-17
+
+-- now() is stable, so existing rows share one default without a table rewrite
+ALTER TABLE spendings
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP NOT NULL DEFAULT timezone('utc', now());
+
+CREATE INDEX IF NOT EXISTS idx_spendings_updated_at_id ON spendings (updated_at, id);
+
+CREATE TABLE IF NOT EXISTS spending_tombstones (
+    id UUID PRIMARY KEY,
+    deleted_at TIMESTAMP NOT NULL DEFAULT timezone('utc', now())
+);
+
+CREATE INDEX IF NOT EXISTS idx_spending_tombstones_deleted_at_id ON spending_tombstones (deleted_at, id);
+
+COMMENT ON COLUMN spendings.updated_at IS 'Start of the transaction that last inserted or updated the row (UTC)';
+COMMENT ON TABLE spending_tombstones IS 'Ids of deleted spendings, kept SYNC_TOMBSTONE_RETENTION_DAYS for the change feed';
+COMMENT ON COLUMN spending_tombstones.deleted_at IS 'Start of the deleting transaction (UTC)';
@@ -0,0 +1,14 @@
+-- Migration: Create full-text search index on spending descriptions
+-- Description: GIN index over the English tsvector of spendings.description, used by
+--              GET /spendings/search (the query repeats the same expression)
+-- Created: 2026-10-17
+
+-- An expression index rather than a stored tsvector column: no table rewrite, and on a
+-- partitioned spendings table every partition (including future ones) gets it too.
+-- Partitioning with 009 after this migration replaces the table; 009 recreates the index.
+-- On a large unpartitioned table, consider creating it by hand with CREATE INDEX CONCURRENTLY
+-- first; IF NOT EXISTS then makes this a no-op.
+CREATE INDEX IF NOT EXISTS idx_spendings_description_search
+    ON spendings USING GIN (to_tsvector('english', coalesce(description, '')));
+
+COMMENT ON INDEX idx_spendings_description_search IS 'Full-text search of descriptions (GET /spendings/search)';
@@ -0,0 +1,86 @@
+"""The spending change feed (GET /spendings/changes) contract."""
+
+import os
+from datetime import datetime, timedelta
+
+# The app creates its engine at import time; keep it off PostgreSQL
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest  # noqa: E402
+from sqlalchemy import create_engine, update  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.database.migrations import migrate  # noqa: E402
+from app.models.spending import Spending  # noqa: E402
+from app.schemas.spending import SpendingCreate, SpendingUpdate  # noqa: E402
+from app.schemas.sync import ChangeAction  # noqa: E402
+from app.services.pagination import encode_cursor  # noqa: E402
+from app.services.spending_service import NIL_ID, ChangeTokenExpired, SpendingService  # noqa: E402
+from app.storage import changes as changes_module  # noqa: E402
+from app.storage.changes import SYNC_TOMBSTONE_RETENTION_DAYS  # noqa: E402
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """A spending service on a migrated SQLite database whose horizon is the database clock."""
+    # Each test commits before reading the feed, so there is nothing in flight to wait for
+    monkeypatch.setattr(changes_module, "SYNC_SETTLE_SECONDS", 0)
+    bind = create_engine(f"sqlite:///{tmp_path / 'spendings.db'}")
+    migrate(bind)
+    with Session(bind) as session:
+        yield SpendingService(session)
+    bind.dispose()
+
+
+def create(service, amount=10.0, category="Groceries"):
+    return service.create_spending(SpendingCreate(amount=amount, category=category))
+
+
+def test_update_after_token_is_returned_once(service):
+    spending = create(service)
+    initial = service.get_changes()
+    assert [change.id for change in initial.changes] == [spending.id]
+
+    service.update_spending(spending.id, SpendingUpdate(amount=25.0))
+    changes = service.get_changes(initial.next_token)
+
+    assert [(change.action, change.id) for change in changes.changes] == [(ChangeAction.upserted, spending.id)]
+    assert changes.changes[0].spending.amount == 25.0
+    assert changes.has_more is False
+    assert service.get_changes(changes.next_token).changes == []
+
+
+def test_delete_is_returned_as_tombstone(service):
+    spending = create(service)
+    initial = service.get_changes()
+
+    assert service.delete_spending(spending.id)
+    changes = service.get_changes(initial.next_token)
+
+    assert [(change.action, change.id) for change in changes.changes] == [(ChangeAction.deleted, spending.id)]
+    assert changes.changes[0].spending is None
+    assert service.get_changes(changes.next_token).changes == []
+
+
+def test_pages_through_changes_with_equal_timestamps(service):
+    spendings = [create(service, amount) for amount in (1.0, 2.0, 3.0)]
+    # Rows written by one transaction share their timestamp on PostgreSQL
+    service.storage.db.execute(update(Spending).values(updated_at=datetime(2026, 10, 1, 9, 30)))
+    service.storage.db.commit()
+
+    first = service.get_changes(limit=2)
+    second = service.get_changes(first.next_token, limit=2)
+
+    assert len(first.changes) == 2
+    assert first.has_more is True
+    assert len(second.changes) == 1
+    assert second.has_more is False
+    seen = [change.id for change in first.changes + second.changes]
+    assert sorted(seen) == sorted(spending.id for spending in spendings)
+
+
+def test_token_older_than_retention_is_rejected(service):
+    expired = datetime.utcnow() - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS + 1)
+
+    with pytest.raises(ChangeTokenExpired):
+        service.get_changes(encode_cursor(expired, NIL_ID))
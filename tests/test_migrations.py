@@ -0,0 +1,61 @@
+"""Upgrades of SQLite databases through the migration runner."""
+
+import os
+
+# The app creates its engine at import time; keep it off PostgreSQL
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from datetime import datetime  # noqa: E402
+from uuid import UUID  # noqa: E402
+
+from sqlalchemy import create_engine, select, text  # noqa: E402
+
+from app.database.migrations import discover_migrations, get_status, migrate  # noqa: E402
+from app.models.category import Category  # noqa: E402
+from app.models.spending import Spending  # noqa: E402
+
+# The spendings table as the first release created it from its models
+BASELINE_SCHEMA = (
+    "CREATE TABLE spendings ("
+    "id CHAR(36) NOT NULL PRIMARY KEY, "
+    "amount FLOAT NOT NULL, "
+    "category VARCHAR NOT NULL, "
+    "description VARCHAR, "
+    "date DATETIME NOT NULL, "
+    "created_at DATETIME NOT NULL)",
+    "CREATE INDEX ix_spendings_id ON spendings (id)",
+    "CREATE INDEX ix_spendings_category ON spendings (category)",
+    "CREATE INDEX ix_spendings_date ON spendings (date)",
+)
+
+SPENDING_ID = "3f2b8c1e-5d4a-4e6f-9a7b-1c2d3e4f5a6b"
+
+
+def test_migrate_upgrades_baseline_sqlite_database(tmp_path):
+    bind = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    with bind.begin() as connection:
+        for statement in BASELINE_SCHEMA:
+            connection.execute(text(statement))
+        connection.execute(
+            text(
+                "INSERT INTO spendings (id, amount, category, description, date, created_at) "
+                "VALUES (:id, 12.345, 'Groceries', 'Weekly shop', :date, :date)"
+            ),
+            {"id": SPENDING_ID, "date": datetime(2026, 10, 1, 9, 30)}
+        )
+
+    migrate(bind)
+
+    assert get_status(bind).current_version == discover_migrations()[-1].version
+    with bind.connect() as connection:
+        spending = connection.execute(
+            select(Spending.id, Spending.amount, Category.name, Spending.description, Spending.updated_at)
+            .join(Category, Category.id == Spending.category_id)
+        ).one()
+        matches = connection.execute(text("SELECT rowid FROM spendings_fts WHERE spendings_fts MATCH 'shop'")).all()
+    assert spending.id == UUID(SPENDING_ID)
+    assert spending.amount == 12.35
+    assert spending.name == "Groceries"
+    assert spending.description == "Weekly shop"
+    assert spending.updated_at is not None
+    assert len(matches) == 1
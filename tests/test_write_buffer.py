@@ -0,0 +1,140 @@
+"""Group commit of concurrently created spendings through GroupCommitBuffer."""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+# The app creates its engine at import time; keep it off PostgreSQL
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest  # noqa: E402
+from sqlalchemy import create_engine, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.database.migrations import migrate  # noqa: E402
+from app.models.spending import Spending  # noqa: E402
+from app.services import write_buffer as write_buffer_module  # noqa: E402
+from app.services.validation import validate_new_spending  # noqa: E402
+from app.services.write_buffer import GroupCommitBuffer, SpendingRejected, WriteBufferFull  # noqa: E402
+from app.storage.database import DatabaseStorage  # noqa: E402
+
+CREATED_AT = datetime(2026, 10, 1, 9, 30)
+
+
+@pytest.fixture
+def bind(tmp_path, monkeypatch):
+    """A migrated SQLite database that the buffer writes to."""
+    bind = create_engine(f"sqlite:///{tmp_path / 'spendings.db'}")
+    migrate(bind)
+
+    @asynccontextmanager
+    async def session_scope():
+        with Session(bind) as session:
+            yield session
+
+    monkeypatch.setattr(write_buffer_module, "session_scope", session_scope)
+    yield bind
+    bind.dispose()
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    """Sizes of the batches written, in order."""
+    sizes = []
+    create_grouped = DatabaseStorage.create_grouped
+
+    def spy(self, spendings):
+        sizes.append(len(spendings))
+        return create_grouped(self, spendings)
+
+    monkeypatch.setattr(DatabaseStorage, "create_grouped", spy)
+    return sizes
+
+
+def new_spending(amount=10.0, category="Groceries"):
+    return validate_new_spending({"amount": amount, "category": category}, CREATED_AT)
+
+
+async def submit_all(buffer, spendings):
+    await buffer.start()
+    try:
+        return await asyncio.gather(*(buffer.submit(s) for s in spendings), return_exceptions=True)
+    finally:
+        await buffer.stop()
+
+
+def stored_ids(bind):
+    with Session(bind) as session:
+        return set(session.scalars(select(Spending.id)))
+
+
+def test_flushes_when_batch_is_full(bind, batches):
+    buffer = GroupCommitBuffer(batch_size=3, max_wait_ms=60_000, queue_depth=10)
+    spendings = [new_spending() for _ in range(3)]
+
+    # With a minute to wait only a full batch can be written in time
+    results = asyncio.run(asyncio.wait_for(submit_all(buffer, spendings), timeout=5))
+
+    assert batches == [3]
+    assert [result.id for result in results] == [s.id for s in spendings]
+    assert stored_ids(bind) == {s.id for s in spendings}
+
+
+def test_flushes_after_max_wait(bind, batches):
+    buffer = GroupCommitBuffer(batch_size=100, max_wait_ms=10, queue_depth=10)
+    spending = new_spending()
+
+    results = asyncio.run(asyncio.wait_for(submit_all(buffer, [spending]), timeout=5))
+
+    assert batches == [1]
+    assert results[0].id == spending.id
+    assert stored_ids(bind) == {spending.id}
+
+
+def test_rejects_submissions_when_queue_is_full(bind, batches):
+    buffer = GroupCommitBuffer(batch_size=10, max_wait_ms=10, queue_depth=1)
+    first, second = new_spending(), new_spending()
+
+    # Both are queued before the flusher takes the first one off the queue
+    results = asyncio.run(submit_all(buffer, [first, second]))
+
+    assert results[0].id == first.id
+    assert isinstance(results[1], WriteBufferFull)
+    assert stored_ids(bind) == {first.id}
+
+
+def test_rejected_spending_does_not_fail_its_batch(bind, batches):
+    buffer = GroupCommitBuffer(batch_size=3, max_wait_ms=60_000, queue_depth=10)
+    first, third = new_spending(5.0), new_spending(20.0)
+    duplicate = first.model_copy(update={"amount": 7.0})
+
+    results = asyncio.run(submit_all(buffer, [first, duplicate, third]))
+
+    assert batches == [3]
+    assert results[0].id == first.id
+    assert isinstance(results[1], SpendingRejected)
+    assert results[2].id == third.id
+    assert stored_ids(bind) == {first.id, third.id}
+    with Session(bind) as session:
+        assert session.scalar(select(Spending.amount).where(Spending.id == first.id)) == 5.0
+
+
+def test_submitter_resumes_only_after_commit(bind, batches):
+    buffer = GroupCommitBuffer(batch_size=10, max_wait_ms=10, queue_depth=10)
+    spendings = [new_spending() for _ in range(2)]
+
+    async def submit_and_check(spending):
+        result = await buffer.submit(spending)
+        # Visible from another connection, so the batch was committed
+        return result.id in stored_ids(bind)
+
+    async def run():
+        await buffer.start()
+        try:
+            return await asyncio.gather(*(submit_and_check(s) for s in spendings))
+        finally:
+            await buffer.stop()
+
+    assert asyncio.run(run()) == [True, True]
+    assert batches == [2]